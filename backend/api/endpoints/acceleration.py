@@ -1,27 +1,45 @@
 """
 Acceleration endpoints - работа с акселерограммами
 """
-from fastapi import APIRouter, Body, Query, HTTPException
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Body, Depends, File, Form, Query, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 from api.dependencies import DbSessionDep
 from schemas.acceleration import (
     AccelData,
+    AccelBatchImportParams,
     FindReqAccelSetParams,
     FindReqAccelSetResult,
     ClearAccelSetParams,
     ClearAccelSetResult,
     SpectralDataResult,
+    SpectralDataBatchParams,
+    SpectralDataBatchResult,
     SetAccelProcedureParams,
     SetAccelProcedureResult
 )
+from services.accel_import import AccelImportService
 from services.acceleration import AccelerationService
+from services.damping_interpolation import DAMPING_METHODS
+from utils.json_response import FastJSONResponse
+from utils.plot_cache import plot_cache
+from .excel import get_parsed_workbook
+from utils.spectrum_memo import requirement_spectrum_memo
+from utils.upload_cache import upload_cache
 
 router = APIRouter(prefix="/api", tags=["acceleration"])
 acceleration_service = AccelerationService()
+accel_import_service = AccelImportService()
 
 
 @router.get("/available-damping-factors")
-async def get_available_damping_factors(
+def get_available_damping_factors(
     db: DbSessionDep,
     ek_id: int = Query(...),
     spectr_earthq_type: str = Query(...),
@@ -34,8 +52,8 @@ async def get_available_damping_factors(
     return {"damping_factors": damping_factors}
 
 
-@router.get("/spectral-data", response_model=SpectralDataResult)
-async def get_spectral_data(
+@router.get("/spectral-data", responses={200: {"model": SpectralDataResult}})
+def get_spectral_data(
     db: DbSessionDep,
     ek_id: int = Query(...),
     calc_type: str = Query(...),
@@ -43,25 +61,51 @@ async def get_spectral_data(
 ):
     """Get spectral characteristics data"""
     data = acceleration_service.get_spectral_data(db, ek_id, spectrum_type)
-    return SpectralDataResult(**data)
+    # Service output already has the SpectralDataResult shape; skip revalidation
+    content = dict.fromkeys(SpectralDataResult.model_fields)
+    content.update(data)
+    return FastJSONResponse(content)
+
+
+@router.post("/spectral-data/batch", responses={200: {"model": SpectralDataBatchResult}})
+def get_spectral_data_batch(
+    db: DbSessionDep,
+    params: SpectralDataBatchParams = Body(...)
+):
+    """Get spectral data and seismic requirements for many elements at once"""
+    try:
+        return FastJSONResponse(acceleration_service.get_spectral_data_batch(
+            db,
+            params.ek_ids,
+            params.spectrum_types,
+            calc_type=params.calc_type,
+            dempf=params.dempf
+        ))
+    except Exception as e:
+        print(f"Error getting batch spectral data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/seism-requirements")
-async def get_seism_requirements(
+def get_seism_requirements(
     db: DbSessionDep,
     ek_id: int = Query(...),
     dempf: float = Query(...),
     spectr_earthq_type: str = Query(...),
-    calc_type: str = Query(...)
+    calc_type: str = Query(...),
+    interpolate: bool = Query(False),
+    method: str = Query("log")
 ):
-    """Get seismic requirements for element"""
-    return acceleration_service.get_seism_requirements(
-        db, ek_id, dempf, spectr_earthq_type, calc_type
-    )
+    """Get seismic requirements for element (optionally interpolated between stored DEMPF sets)"""
+    if method not in DAMPING_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(DAMPING_METHODS)}")
+    return FastJSONResponse(acceleration_service.get_seism_requirements(
+        db, ek_id, dempf, spectr_earthq_type, calc_type, interpolate=interpolate, method=method
+    ))
 
 
 @router.post("/find-req-accel-set", response_model=FindReqAccelSetResult)
-async def find_req_accel_set(
+def find_req_accel_set(
     db: DbSessionDep,
     params: FindReqAccelSetParams = Body(...)
 ):
@@ -83,11 +127,19 @@ async def find_req_accel_set(
 
 
 @router.post("/save-accel-data")
-async def save_accel_data(
+def save_accel_data(
     db: DbSessionDep,
-    data: AccelData = Body(...)
+    data: AccelData = Body(...),
+    dry_run: bool = Query(False)
 ):
-    """Save acceleration data from Excel import"""
+    """Save acceleration data from Excel import (dry_run: validate only and return a report)"""
+    if dry_run:
+        try:
+            return acceleration_service.validate_accel_data(db, sheets=data.sheets, **data.model_dump(exclude={"sheets"}))
+        except Exception as e:
+            print(f"Error validating acceleration data: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     try:
         result = acceleration_service.save_accel_data(
             db=db,
@@ -116,8 +168,202 @@ async def save_accel_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def accel_import_form(
+    plant_id: int = Form(...),
+    unit_id: int = Form(...),
+    building: str = Form(...),
+    calc_type: str = Form(...),
+    set_type: str = Form("ВИМОГИ"),
+    room: Optional[str] = Form(None),
+    lev: Optional[float] = Form(None),
+    lev1: Optional[float] = Form(None),
+    lev2: Optional[float] = Form(None),
+    pga: Optional[float] = Form(None),
+    ek_id: Optional[int] = Form(None),
+    can_overwrite: int = Form(0)
+) -> Dict[str, Any]:
+    """Location / set form fields of a file import (save_accel_data keyword arguments)"""
+    return {
+        "plant_id": plant_id,
+        "unit_id": unit_id,
+        "building": building,
+        "room": room,
+        "lev": lev,
+        "lev1": lev1,
+        "lev2": lev2,
+        "pga": pga,
+        "calc_type": calc_type,
+        "set_type": set_type,
+        "ek_id": ek_id,
+        "can_overwrite": can_overwrite,
+    }
+
+
+@router.post("/import-accel-file")
+async def import_accel_file(
+    db: DbSessionDep,
+    location: Dict[str, Any] = Depends(accel_import_form),
+    sheet_names: Optional[List[str]] = Form(None),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None),
+    dry_run: bool = Form(False)
+):
+    """
+    Import acceleration data from an Excel file (or upload_token) in one request
+
+    The workbook is parsed on the server, so sheet data is not sent back as JSON.
+    sheet_names may be repeated to pick sheets ("1,2%" names contain commas); by
+    default all percentage sheets are imported for ВИМОГИ. With dry_run nothing is
+    written and a validation report is returned.
+    """
+    token, parsed = await get_parsed_workbook(file, upload_token)
+
+    def import_workbook() -> Dict[str, Any]:
+        result = acceleration_service.import_accel_workbook(db, parsed, sheet_names, dry_run=dry_run, **location)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+        return result
+
+    try:
+        # DB work runs in the worker thread pool, not on the event loop
+        result = await run_in_threadpool(import_workbook)
+
+        result["upload_token"] = token
+        return result
+
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        print(f"Error importing acceleration file: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/import-accel-file/batch")
+async def import_accel_file_batch(
+    db: DbSessionDep,
+    mapping: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None)
+):
+    """
+    Import several locations (BUILDING/ROOM/LEV/LEV1/LEV2) from one workbook in one transaction
+
+    `mapping` is an AccelBatchImportParams JSON document: every location names its
+    sheets and/or a column block (sheet header -> МРЗ_X ... ПЗ_Z).
+    """
+    try:
+        params = AccelBatchImportParams.model_validate_json(mapping)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    if not params.locations:
+        raise HTTPException(status_code=400, detail="At least one location is required")
+
+    token, parsed = await get_parsed_workbook(file, upload_token)
+
+    def import_batch() -> Dict[str, Any]:
+        result = acceleration_service.import_accel_batch(
+            db,
+            parsed,
+            plant_id=params.plant_id,
+            unit_id=params.unit_id,
+            calc_type=params.calc_type,
+            set_type=params.set_type,
+            locations=params.locations,
+            skip_existing=params.skip_existing
+        )
+        db.commit()
+        return result
+
+    try:
+        result = await run_in_threadpool(import_batch)
+
+        result["upload_token"] = token
+        return result
+
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        print(f"Error importing acceleration file batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/import-jobs")
+async def start_import_job(
+    location: Dict[str, Any] = Depends(accel_import_form),
+    sheet_names: Optional[List[str]] = Form(None),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None)
+):
+    """Start a background import of an Excel file (or upload_token); the workbook is parsed inside the job"""
+    parsed = upload_cache.get(upload_token) if upload_token else None
+    content = None
+    if parsed is None:
+        if file is None:
+            if upload_token:
+                raise HTTPException(status_code=410, detail="Upload token expired or unknown, upload the file again")
+            raise HTTPException(status_code=400, detail="file or upload_token is required")
+        content = await file.read()
+
+    try:
+        job = accel_import_service.start_job(location, content=content, parsed=parsed, sheet_names=sheet_names)
+        return job.to_dict()
+    except Exception as e:
+        print(f"Error starting import job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/save-accel-data/jobs")
+async def start_save_accel_data_job(data: AccelData = Body(...)):
+    """Start a background save of extracted sheet data (same body as /save-accel-data)"""
+    try:
+        location = data.model_dump(exclude={"sheets"})
+        job = accel_import_service.start_job(location, sheets=data.sheets)
+        return job.to_dict()
+    except Exception as e:
+        print(f"Error starting import job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/import-jobs/{job_id}")
+async def get_import_job_status(job_id: str):
+    """Get import job progress: sheets parsed, plots created, points inserted"""
+    job = accel_import_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+    return job.to_dict()
+
+
+@router.get("/import-jobs/{job_id}/events")
+async def stream_import_job_events(
+    job_id: str,
+    interval: float = Query(0.5, gt=0, le=10)
+):
+    """Server-sent events with import job progress; the stream ends when the job finishes"""
+    job = accel_import_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+
+    async def events():
+        last = None
+        while True:
+            state = job.to_dict()
+            payload = json.dumps(state, ensure_ascii=False, default=str)
+            if payload != last:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last = payload
+            if job.finished:
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.post("/clear-accel-set", response_model=ClearAccelSetResult)
-async def clear_accel_set(
+def clear_accel_set(
     db: DbSessionDep,
     params: ClearAccelSetParams = Body(...)
 ):
@@ -133,7 +379,7 @@ async def clear_accel_set(
 
 
 @router.post("/execute-set-all-ek-accel-set", response_model=SetAccelProcedureResult)
-async def execute_set_all_ek_accel_set(
+def execute_set_all_ek_accel_set(
     db: DbSessionDep,
     params: SetAccelProcedureParams = Body(...)
 ):
@@ -155,3 +401,16 @@ async def execute_set_all_ek_accel_set(
         print(f"Error executing set_all_ek_accel_set: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.get("/plot-cache/stats")
+async def get_plot_cache_stats():
+    """Get plot cache counters (hits, misses, evictions, size)"""
+    return {**plot_cache.stats(), "requirement_memo": requirement_spectrum_memo.stats()}
+
+
+@router.post("/plot-cache/clear")
+async def clear_plot_cache():
+    """Drop all cached plots (e.g. after editing spectra directly in the DB)"""
+    plot_cache.clear()
+    return {**plot_cache.stats(), "requirement_memo": requirement_spectrum_memo.stats()}
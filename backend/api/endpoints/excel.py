@@ -1,50 +1,87 @@
 """
 Excel file processing endpoints
 """
+from typing import Any, Dict, List, Optional, Tuple
+
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import Optional
-import openpyxl
-import io
-import re
+from fastapi.concurrency import run_in_threadpool
+
+from utils.excel import is_percentage_sheet
+from utils.parse_pool import ParsePoolBusy, ParsePoolUnavailable, parse_pool
+from utils.upload_cache import content_token, upload_cache
+
+# Seconds clients are asked to wait before retrying a rejected upload
+PARSE_RETRY_AFTER = 5
 
 router = APIRouter(prefix="/api", tags=["excel"])
 
 
+async def get_parsed_workbook(
+    file: Optional[UploadFile],
+    upload_token: Optional[str]
+) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """
+    Resolve (upload_token, parsed sheets) from a cached token or an uploaded file
+
+    The workbook is parsed only when its content hash is not cached yet, in the
+    parse process pool. A stale token without a file is answered with 410 so the
+    client uploads again; a saturated pool with 429, a failed one with 503.
+    """
+    if upload_token:
+        sheets = upload_cache.get(upload_token)
+        if sheets is not None:
+            return upload_token, sheets
+        if file is None:
+            raise HTTPException(
+                status_code=410,
+                detail="Upload token expired or unknown, upload the file again"
+            )
+
+    if file is None:
+        raise HTTPException(status_code=400, detail="file or upload_token is required")
+
+    content = await file.read()
+    token = await run_in_threadpool(content_token, content)
+    sheets = upload_cache.get(token)
+    if sheets is not None:
+        return token, sheets
+
+    try:
+        sheets = await parse_pool.parse(content)
+    except ParsePoolBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(PARSE_RETRY_AFTER)})
+    except ParsePoolUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(PARSE_RETRY_AFTER)})
+
+    upload_cache.put(token, sheets)
+    return token, sheets
+
+
 @router.post("/analyze-excel")
 async def analyze_excel(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None),
     filter_percentage_only: bool = False
 ):
-    """Analyze Excel file and return sheet information"""
+    """Analyze Excel file and return sheet information with an upload token for later requests"""
     try:
-        # Read file content
-        content = await file.read()
-        workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+        token, parsed = await get_parsed_workbook(file, upload_token)
 
         sheets = []
-        for sheet_name in workbook.sheetnames:
-            # If filter enabled, only include sheets with percentage names
-            if filter_percentage_only:
-                # Check if sheet name matches percentage format (4%, 0.2%, 1,2%, etc.)
-                if not re.match(r'^\d+([.,]\d+)?%$', sheet_name.strip()):
-                    continue
-
-            sheet = workbook[sheet_name]
-            # Count rows with data
-            row_count = 0
-            for row in sheet.iter_rows():
-                if any(cell.value is not None for cell in row):
-                    row_count += 1
+        for sheet_name, sheet in parsed.items():
+            # If filter enabled, only include sheets with percentage names (4%, 0.2%, 1,2%, etc.)
+            if filter_percentage_only and not is_percentage_sheet(sheet_name):
+                continue
 
             sheets.append({
                 "name": sheet_name,
-                "rows": row_count
+                "rows": sheet["rows"]
             })
 
-        workbook.close()
-
-        return {"sheets": sheets}
+        return {"sheets": sheets, "upload_token": token}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -54,91 +91,87 @@ async def analyze_excel(
 
 @router.post("/extract-sheet-data")
 async def extract_sheet_data(
-    file: UploadFile = File(...),
-    sheet_name: str = Form(...)
+    sheet_name: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None)
 ):
-    """Extract data from specific Excel sheet"""
+    """Extract data from specific Excel sheet (uploaded file or upload_token from analyze-excel)"""
     try:
-        # Read file content
-        content = await file.read()
-        workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+        _, parsed = await get_parsed_workbook(file, upload_token)
 
         # Check if sheet exists
-        if sheet_name not in workbook.sheetnames:
+        sheet = parsed.get(sheet_name)
+        if sheet is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Sheet '{sheet_name}' not found in Excel file"
             )
+        if sheet["error"]:
+            raise HTTPException(status_code=400, detail=sheet["error"])
 
-        sheet = workbook[sheet_name]
-
-        # Get headers from first row - skip empty leading columns
-        headers = []
-        header_indices = []  # Track which column indices have headers
-
-        # Read first 5 rows to find where headers are
-        first_rows = list(sheet.iter_rows(min_row=1, max_row=5, values_only=True))
-
-        if not first_rows:
-            raise HTTPException(
-                status_code=400,
-                detail="Sheet is empty"
-            )
-
-        # Try to find the header row (first non-empty row with text values)
-        header_row_idx = None
-        first_row = None
-
-        for i, row in enumerate(first_rows, start=1):
-            if row and any(cell is not None and not isinstance(cell, (int, float)) for cell in row):
-                # Found a row with text values
-                header_row_idx = i
-                first_row = row
-                break
-
-        if not first_row:
-            raise HTTPException(
-                status_code=400,
-                detail="No header row found in first 5 rows"
-            )
-
-        for idx, cell in enumerate(first_row):
-            if cell is not None and str(cell).strip():
-                headers.append(str(cell).strip())
-                header_indices.append(idx)
+        return sheet["data"]
 
-        if not headers:
-            raise HTTPException(
-                status_code=400,
-                detail="No valid column headers found in first row"
-            )
-
-        # Extract data only from columns that have headers
-        data = {header: [] for header in headers}
-
-        # Start reading data from the row after headers
-        data_start_row = header_row_idx + 1
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to extract data from sheet: {str(e)}"
+        )
 
-        for row in sheet.iter_rows(min_row=data_start_row, values_only=True):
-            for header_idx, col_idx in enumerate(header_indices):
-                if col_idx < len(row):
-                    cell = row[col_idx]
-                    # Convert to appropriate type
-                    if cell is None:
-                        data[headers[header_idx]].append(None)
-                    elif isinstance(cell, (int, float)):
-                        data[headers[header_idx]].append(float(cell))
-                    else:
-                        data[headers[header_idx]].append(str(cell))
 
-        workbook.close()
+@router.post("/extract-sheets-data")
+async def extract_sheets_data(
+    sheet_names: Optional[List[str]] = Form(None),
+    file: Optional[UploadFile] = File(None),
+    upload_token: Optional[str] = Form(None)
+):
+    """
+    Extract data from several sheets in one request
 
-        return data
+    sheet_names may be repeated; by default all percentage sheets are returned.
+    Sheets without a usable header are reported in "errors" instead of failing the request.
+    """
+    try:
+        token, parsed = await get_parsed_workbook(file, upload_token)
+
+        if sheet_names:
+            missing = [name for name in sheet_names if name not in parsed]
+            if missing:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Sheets not found in Excel file: {', '.join(missing)}"
+                )
+        else:
+            sheet_names = [name for name in parsed if is_percentage_sheet(name)]
+
+        sheets = {}
+        errors = {}
+        for sheet_name in sheet_names:
+            sheet = parsed[sheet_name]
+            if sheet["error"]:
+                errors[sheet_name] = sheet["error"]
+            else:
+                sheets[sheet_name] = sheet["data"]
+
+        return {"sheets": sheets, "errors": errors, "upload_token": token}
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=400,
-            detail=f"Failed to extract data from sheet: {str(e)}"
+            detail=f"Failed to extract data from sheets: {str(e)}"
         )
+
+
+@router.get("/upload-cache/stats")
+async def get_upload_cache_stats():
+    """Get parsed upload cache counters"""
+    return upload_cache.stats()
+
+
+@router.get("/parse-pool/stats")
+async def get_parse_pool_stats():
+    """Get workbook parse pool counters (active, queued, rejected)"""
+    return parse_pool.stats()
@@ -13,13 +13,13 @@ file_service = FileService()
 
 
 @router.get("/file_types", response_model=List[FileTypeData])
-async def get_file_types(db: DbSessionDep):
+def get_file_types(db: DbSessionDep):
     """Get all file types"""
     return file_service.get_all_file_types(db)
 
 
 @router.post("/file_types", status_code=201)
-async def create_file_type(db: DbSessionDep, request: CreateFileTypeRequest = Body(...)):
+def create_file_type(db: DbSessionDep, request: CreateFileTypeRequest = Body(...)):
     """Create new file type"""
     try:
         file_type_id = file_service.create_file_type(db, request)
@@ -34,7 +34,7 @@ async def create_file_type(db: DbSessionDep, request: CreateFileTypeRequest = Bo
 
 
 @router.delete("/file_types/{file_type_id}")
-async def delete_file_type(db: DbSessionDep, file_type_id: int):
+def delete_file_type(db: DbSessionDep, file_type_id: int):
     """Delete file type by ID"""
     try:
         file_service.delete_file_type(db, file_type_id)
@@ -49,7 +49,7 @@ async def delete_file_type(db: DbSessionDep, file_type_id: int):
 
 
 @router.get("/file_types/extensions/allowed")
-async def get_allowed_extensions_detailed(db: DbSessionDep):
+def get_allowed_extensions_detailed(db: DbSessionDep):
     """Get detailed list of allowed file extensions with metadata"""
     return file_service.get_allowed_extensions_detailed(db)
 
@@ -8,21 +8,33 @@ from fastapi import APIRouter, Query, HTTPException, Body
 from fastapi.responses import Response
 
 from api.dependencies import DbSessionDep
+from core.config import settings
 from schemas import FileData, CreateFileRequest
 from services import FileService
+from utils.streaming import ndjson_response
 
 router = APIRouter(prefix="/api", tags=["files"])
 file_service = FileService()
 
 
 @router.get("/files", response_model=List[FileData])
-async def get_files(db: DbSessionDep):
+def get_files(
+    db: DbSessionDep,
+    stream: bool = Query(False, description="Stream rows as NDJSON (one FileData per line)")
+):
     """Get all files"""
+    if stream:
+        return ndjson_response(
+            lambda session: (
+                {"data": row} for row in file_service.iter_files(session, batch_size=settings.stream_batch_rows)
+            ),
+            settings.stream_batch_rows
+        )
     return file_service.get_all_files(db)
 
 
 @router.get("/files/{file_id}/download")
-async def download_file(db: DbSessionDep, file_id: int):
+def download_file(db: DbSessionDep, file_id: int):
     """Download file by ID"""
     file_obj = file_service.get_file_by_id(db, file_id)
     
@@ -45,7 +57,7 @@ async def download_file(db: DbSessionDep, file_id: int):
 
 
 @router.post("/files", status_code=201)
-async def create_file(db: DbSessionDep, request: CreateFileRequest = Body(...)):
+def create_file(db: DbSessionDep, request: CreateFileRequest = Body(...)):
     """Create new file"""
     try:
         file_id = file_service.create_file(db, request)
@@ -60,7 +72,7 @@ async def create_file(db: DbSessionDep, request: CreateFileRequest = Body(...)):
 
 
 @router.delete("/files/{file_id}")
-async def delete_file(db: DbSessionDep, file_id: int):
+def delete_file(db: DbSessionDep, file_id: int):
     """Delete file by ID"""
     try:
         file_service.delete_file(db, file_id)
@@ -75,7 +87,7 @@ async def delete_file(db: DbSessionDep, file_id: int):
 
 
 @router.get("/files/extensions/allowed", response_model=List[str])
-async def get_allowed_extensions(db: DbSessionDep):
+def get_allowed_extensions(db: DbSessionDep):
     """Get list of allowed file extensions"""
     return file_service.get_allowed_extensions(db)
 
@@ -12,7 +12,7 @@ load_service = LoadAnalysisService()
 
 
 @router.post("/save-load-analysis-params")
-async def save_load_analysis_params(
+def save_load_analysis_params(
     db: DbSessionDep,
     params: LoadAnalysisParams = Body(...)
 ):
@@ -27,7 +27,7 @@ async def save_load_analysis_params(
 
 
 @router.get("/get-load-analysis-params/{ek_id}")
-async def get_load_analysis_params(
+def get_load_analysis_params(
     db: DbSessionDep,
     ek_id: int
 ):
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/api", tags=["locations"])
 
 
 @router.post("/check-location")
-async def check_location(db: DbSessionDep, location: LocationCheck = Body(...)):
+def check_location(db: DbSessionDep, location: LocationCheck = Body(...)):
     """Check if location exists"""
     count = db.query(EkSeismData).filter(
         EkSeismData.PLANT_ID == location.plant_id,
@@ -24,7 +24,7 @@ async def check_location(db: DbSessionDep, location: LocationCheck = Body(...)):
 
 
 @router.post("/check-building")
-async def check_building(db: DbSessionDep, data: BuildingCheck = Body(...)):
+def check_building(db: DbSessionDep, data: BuildingCheck = Body(...)):
     """Check if building exists"""
     count = db.query(EkSeismData).filter(
         EkSeismData.PLANT_ID == data.plant_id,
@@ -14,13 +14,13 @@ model_service = Model3DService()
 
 
 @router.get("/models_3d", response_model=List[Model3DData])
-async def get_all_models(db: DbSessionDep):
+def get_all_models(db: DbSessionDep):
     """Get all 3D models"""
     return model_service.get_all_models(db)
 
 
 @router.post("/models_3d", status_code=201)
-async def create_model(db: DbSessionDep, request: CreateModel3DRequest = Body(...)):
+def create_model(db: DbSessionDep, request: CreateModel3DRequest = Body(...)):
     """Create new 3D model"""
     try:
         model_id = model_service.create_model(db, request)
@@ -35,7 +35,7 @@ async def create_model(db: DbSessionDep, request: CreateModel3DRequest = Body(..
 
 
 @router.delete("/models_3d/{model_id}")
-async def delete_model(db: DbSessionDep, model_id: int):
+def delete_model(db: DbSessionDep, model_id: int):
     """Delete 3D model and all related files"""
     try:
         result = model_service.delete_model(db, model_id)
@@ -50,31 +50,31 @@ async def delete_model(db: DbSessionDep, model_id: int):
 
 
 @router.get("/ek_models/by_ek/{ek_id}", response_model=List[EkModel3DResponse])
-async def get_models_by_ek_id(ek_id: int, db: DbSessionDep):
+def get_models_by_ek_id(ek_id: int, db: DbSessionDep):
     """Get all 3D models linked to EK_ID"""
     return model_service.get_models_by_ek_id(db, ek_id)
 
 
 @router.get("/ek_models/check/{ek_id}")
-async def check_models_exist(ek_id: int, db: DbSessionDep):
+def check_models_exist(ek_id: int, db: DbSessionDep):
     """Check if any 3D models are linked to EK_ID"""
     return model_service.check_models_exist(db, ek_id)
 
 
 @router.post("/ek_models", response_model=EkModel3DResponse)
-async def create_ek_model_link(ek_model_data: EkModel3DCreate, db: DbSessionDep):
+def create_ek_model_link(ek_model_data: EkModel3DCreate, db: DbSessionDep):
     """Create link between EK and 3D Model"""
     return model_service.create_ek_model_link(db, ek_model_data)
 
 
 @router.delete("/ek_models/{ek_3d_id}")
-async def delete_ek_model_link(ek_3d_id: int, db: DbSessionDep):
+def delete_ek_model_link(ek_3d_id: int, db: DbSessionDep):
     """Delete link between EK and 3D Model"""
     return model_service.delete_ek_model_link(db, ek_3d_id)
 
 
 @router.get("/models_3d/{model_id}/download")
-async def download_model(
+def download_model(
     db: DbSessionDep,
     model_id: int,
     include_multimedia: bool = Query(False)
@@ -2,23 +2,36 @@
 Multimedia API endpoints
 """
 from typing import List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from api.dependencies import DbSessionDep
+from core.config import settings
 from services import Model3DService
+from utils.streaming import ndjson_response
 
 router = APIRouter(prefix="/api", tags=["multimedia"])
 model_3d_service = Model3DService()
 
 
 @router.get("/multimedia", response_model=List[dict])
-async def get_all_multimedia(db: DbSessionDep):
+def get_all_multimedia(
+    db: DbSessionDep,
+    stream: bool = Query(False, description="Stream rows as NDJSON (one item per line)")
+):
     """Get all multimedia files"""
+    if stream:
+        return ndjson_response(
+            lambda session: (
+                {"data": row}
+                for row in model_3d_service.iter_multimedia(session, batch_size=settings.stream_batch_rows)
+            ),
+            settings.stream_batch_rows
+        )
     return model_3d_service.get_all_multimedia(db)
 
 
 @router.delete("/multimedia/{multimed_id}")
-async def delete_multimedia(db: DbSessionDep, multimed_id: int):
+def delete_multimedia(db: DbSessionDep, multimed_id: int):
     """Delete multimedia file by ID"""
     try:
         result = model_3d_service.delete_multimedia(db, multimed_id)
@@ -33,13 +46,13 @@ async def delete_multimedia(db: DbSessionDep, multimed_id: int):
 
 
 @router.get("/multimedia/model/{model_id}")
-async def get_multimedia_by_model(db: DbSessionDep, model_id: int):
+def get_multimedia_by_model(db: DbSessionDep, model_id: int):
     """Get all multimedia files for a specific model"""
     return model_3d_service.get_multimedia_by_model(db, model_id)
 
 
 @router.get("/multimedia/model/{model_id}/check")
-async def check_multimedia(db: DbSessionDep, model_id: int):
+def check_multimedia(db: DbSessionDep, model_id: int):
     """Check if multimedia exists for model"""
     from sqlalchemy import text
 
@@ -13,13 +13,13 @@ plant_service = PlantService()
 
 
 @router.get("/plants", response_model=List[Plant])
-async def get_plants(db: DbSessionDep):
+def get_plants(db: DbSessionDep):
     """Get all plants"""
     return plant_service.get_all_plants(db)
 
 
 @router.get("/units", response_model=List[Unit])
-async def get_units(
+def get_units(
     db: DbSessionDep,
     plant_id: int = Query(..., description="ID of the plant to get units for"),
 ):
@@ -28,7 +28,7 @@ async def get_units(
 
 
 @router.get("/terms", response_model=List[Term])
-async def get_terms(
+def get_terms(
     db: DbSessionDep,
     plant_id: int = Query(..., description="ID of the plant"),
     unit_id: int = Query(..., description="ID of the unit"),
@@ -1,24 +1,79 @@
 """
 Search API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
 
 from api.dependencies import DbSessionDep
+from core.config import settings
 from schemas import SearchData
 from services import SearchService
+from utils.json_response import FastJSONResponse
+from utils.streaming import NDJSON_MEDIA_TYPE, ndjson_response
 
 router = APIRouter(prefix="/api", tags=["search"])
 search_service = SearchService()
 
+# Largest page for keyset pagination
+MAX_SEARCH_PAGE = 5000
 
-@router.get("/search", response_model=List[SearchData])
-async def search_data(
+
+@router.get(
+    "/search",
+    responses={200: {
+        "model": List[SearchData],
+        "description": "Rows (one page with `limit`), or NDJSON lines of SearchData with `stream`",
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "headers": {
+            "X-Next-Cursor": {
+                "description": "Cursor of the next page; absent on the last page and without `limit`",
+                "schema": {"type": "string"},
+            },
+        },
+    }},
+)
+def search_data(
     db: DbSessionDep,
     plant_id: int = Query(..., description="ID of the plant"),
     unit_id: int = Query(..., description="ID of the unit"),
     t_id: int = Query(..., description="Term ID (EKLIST_ID)"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (EK_ID is always included)"),
+    sort: Optional[str] = Query(None, description="Comma-separated sort columns, '-' prefix for descending"),
+    filter: Optional[List[str]] = Query(None, description="Repeatable COLUMN:op:value (eq, ne, lt, le, gt, ge, like, null, notnull)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_SEARCH_PAGE, description="Page size (all rows by default)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    stream: bool = Query(False, description="Stream all rows as NDJSON (one SearchData per line)"),
 ):
-    """Search seismic data by plant, unit and term"""
-    return search_service.search_data(db, plant_id, unit_id, t_id)
+    """
+    Search seismic data by plant, unit and term
+
+    With `limit` the response is one page; the X-Next-Cursor header holds the
+    cursor of the next page and is absent on the last one. With `stream` all rows
+    are sent as NDJSON while they are fetched.
+    """
+    if stream:
+        if limit is not None or cursor:
+            raise HTTPException(status_code=400, detail="stream returns all rows, limit/cursor are not supported")
+        try:
+            search_service.validate_search(fields, sort, filter)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return ndjson_response(
+            lambda session: search_service.iter_search(
+                session, plant_id, unit_id, t_id,
+                fields=fields, sort=sort, filters=filter, batch_size=settings.stream_batch_rows
+            ),
+            settings.stream_batch_rows
+        )
+
+    try:
+        results, next_cursor = search_service.search_page(
+            db, plant_id, unit_id, t_id,
+            fields=fields, sort=sort, filters=filter, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    # Rows are plain column dicts in the SearchData shape; skip revalidation
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return FastJSONResponse(results, headers=headers)
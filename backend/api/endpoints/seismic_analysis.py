@@ -7,19 +7,27 @@ from api.dependencies import DbSessionDep
 from schemas.analysis import (
     SaveAnalysisResultParams,
     SaveAnalysisResultResponse,
+    CalculateM1Params,
+    RecalculationParams,
+    SigmaAltBulkParams,
+    KBatchParams,
     SaveStressInputsParams,
     SaveStressInputsResponse,
     SaveKResultsParams,
     SaveKResultsResponse
 )
-from services import SeismicAnalysisService
+from services import SeismicAnalysisService, RecalculationService, RecalculationBusy
+
+# Seconds clients are asked to wait before retrying a rejected recalculation
+RECALC_RETRY_AFTER = 30
 
 router = APIRouter(prefix="/api", tags=["seismic-analysis"])
 seismic_service = SeismicAnalysisService()
+recalculation_service = RecalculationService()
 
 
 @router.post("/save-analysis-result", response_model=SaveAnalysisResultResponse)
-async def save_analysis_result(
+def save_analysis_result(
     db: DbSessionDep,
     params: SaveAnalysisResultParams = Body(...)
 ):
@@ -40,8 +48,67 @@ async def save_analysis_result(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/calculate-m1")
+def calculate_m1(
+    db: DbSessionDep,
+    params: CalculateM1Params = Body(...)
+):
+    """Calculate M1/M2 on the server for one or many elements and save them"""
+    try:
+        result = seismic_service.calculate_m1(
+            db,
+            params.ek_ids,
+            params.calc_type,
+            params.dempf,
+            params.spectrum_types,
+            natural_frequencies=params.natural_frequencies,
+            save=params.save
+        )
+        db.commit()
+        return result
+    except Exception as e:
+        db.rollback()
+        print(f"Error calculating M1: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recalculate")
+async def start_recalculation(params: RecalculationParams = Body(...)):
+    """Start background recalculation of M1 → SIGMA_S_ALT → K for all elements of a plant/unit/eklist"""
+    if params.plant_id is None and params.unit_id is None and params.eklist_id is None:
+        raise HTTPException(status_code=400, detail="plant_id, unit_id or eklist_id is required")
+    try:
+        job = recalculation_service.start_job(
+            params.calc_type,
+            params.dempf,
+            params.spectrum_types,
+            plant_id=params.plant_id,
+            unit_id=params.unit_id,
+            eklist_id=params.eklist_id,
+            workers=params.workers
+        )
+        return job.to_dict()
+    except RecalculationBusy as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(RECALC_RETRY_AFTER)})
+    except Exception as e:
+        print(f"Error starting recalculation: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/recalculate/{job_id}")
+async def get_recalculation_status(
+    job_id: str,
+    include_errors: bool = Query(True)
+):
+    """Get recalculation job progress and per-element errors"""
+    job = recalculation_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Recalculation job {job_id} not found")
+    return job.to_dict(include_errors=include_errors)
+
+
 @router.post("/save-stress-inputs", response_model=SaveStressInputsResponse)
-async def save_stress_inputs(
+def save_stress_inputs(
     db: DbSessionDep,
     params: SaveStressInputsParams = Body(...)
 ):
@@ -68,7 +135,7 @@ async def save_stress_inputs(
 
 
 @router.post("/save-k-results", response_model=SaveKResultsResponse)
-async def save_k_results(
+def save_k_results(
     db: DbSessionDep,
     params: SaveKResultsParams = Body(...)
 ):
@@ -93,8 +160,36 @@ async def save_k_results(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/calculate-k/batch")
+def calculate_k_batch(
+    db: DbSessionDep,
+    params: KBatchParams = Body(...)
+):
+    """Calculate and save K1/K3/N/K2 for a list of elements and/or a plant/unit/eklist filter"""
+    if not params.ek_ids and params.plant_id is None and params.unit_id is None and params.eklist_id is None:
+        raise HTTPException(status_code=400, detail="ek_ids, plant_id, unit_id or eklist_id is required")
+    try:
+        result = seismic_service.calculate_k_bulk(
+            db,
+            ek_ids=params.ek_ids or None,
+            plant_id=params.plant_id,
+            unit_id=params.unit_id,
+            eklist_id=params.eklist_id,
+            calc_type=params.calc_type,
+            dempf=params.dempf,
+            pga=params.pga,
+            save=params.save
+        )
+        db.commit()
+        return result
+    except Exception as e:
+        db.rollback()
+        print(f"Error calculating K (batch): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/get-k-results/{ek_id}")
-async def get_k_results(
+def get_k_results(
     db: DbSessionDep,
     ek_id: int
 ):
@@ -109,7 +204,7 @@ async def get_k_results(
 
 
 @router.get("/get-calculation-results")
-async def get_calculation_results(
+def get_calculation_results(
     db: DbSessionDep,
     ek_id: int = Query(...)
 ):
@@ -124,7 +219,7 @@ async def get_calculation_results(
 
 
 @router.get("/get-stress-inputs")
-async def get_stress_inputs(
+def get_stress_inputs(
     db: DbSessionDep,
     ek_id: int = Query(...)
 ):
@@ -139,7 +234,7 @@ async def get_stress_inputs(
 
 
 @router.get("/check-calculation-requirements")
-async def check_calculation_requirements(
+def check_calculation_requirements(
     db: DbSessionDep,
     ek_id: int = Query(...)
 ):
@@ -154,7 +249,7 @@ async def check_calculation_requirements(
 
 
 @router.post("/calculate-sigma-alt")
-async def calculate_sigma_alt(
+def calculate_sigma_alt(
     db: DbSessionDep,
     params: dict = Body(...)
 ):
@@ -266,3 +361,28 @@ async def calculate_sigma_alt(
         print(f"Error calculating sigma alt: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.post("/calculate-sigma-alt/bulk")
+def calculate_sigma_alt_bulk(
+    db: DbSessionDep,
+    params: SigmaAltBulkParams = Body(...)
+):
+    """Calculate sigma alternative values for a list of elements and/or a plant/unit/eklist filter"""
+    if not params.ek_ids and params.plant_id is None and params.unit_id is None and params.eklist_id is None:
+        raise HTTPException(status_code=400, detail="ek_ids, plant_id, unit_id or eklist_id is required")
+    try:
+        result = seismic_service.calculate_sigma_alt_bulk(
+            db,
+            ek_ids=params.ek_ids or None,
+            plant_id=params.plant_id,
+            unit_id=params.unit_id,
+            eklist_id=params.eklist_id,
+            save=params.save
+        )
+        db.commit()
+        return result
+    except Exception as e:
+        db.rollback()
+        print(f"Error calculating sigma alt (bulk): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
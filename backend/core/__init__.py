@@ -2,7 +2,7 @@
 Core module - основные компоненты приложения
 """
 from .config import settings
-from .database import DbSessionManager, DbSessionDep, DbSessionContext, DbException
+from .database import DbSessionManager, DbSessionDep, DbSessionContext, DbException, pool_metrics, configure_request_threads
 from .exceptions import (
     AppException,
     NotFoundException,
@@ -16,6 +16,8 @@ __all__ = [
     "DbSessionDep",
     "DbSessionContext",
     "DbException",
+    "pool_metrics",
+    "configure_request_threads",
     "AppException",
     "NotFoundException",
     "ValidationException",
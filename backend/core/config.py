@@ -20,6 +20,71 @@ class Settings(BaseSettings):
     db_name: str = "APEX222"
     echo_sql: bool = True
 
+    # Connection pool (QueuePool): persistent connections, extra connections under load,
+    # seconds to wait for a free connection, connection max age in seconds (-1 = never
+    # recycle), liveness check on checkout, oracledb statement cache size per connection
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_stmt_cache_size: int = 20
+    # Connections opened at startup so first requests do not pay for connecting (0 = off)
+    db_pool_warmup: int = 0
+    # AnyIO worker threads (0 = keep the AnyIO default of 40). The same threads run
+    # sync endpoints, response serialization, sync dependencies, UploadFile reads,
+    # run_in_threadpool calls and streaming chunks, so this is not tied to the DB pool;
+    # requests, NDJSON streams and background jobs beyond db_pool_size + db_max_overflow
+    # open sessions wait for a free one (requests and streams on the event loop)
+    request_threads: int = 0
+
+    # Acceleration plot storage: "points" (row per point in SRTN_ACCEL_POINT)
+    # or "packed" (float64 vectors in SRTN_ACCEL_PLOT_PACKED)
+    accel_plot_storage: str = "points"
+
+    # Store identical plots once (SRTN_ACCEL_PLOT_HASH) and share them between sets/axes.
+    # Keep off while DB procedures delete plot points of a cleared set, since shared
+    # plots would disappear from the other sets as well
+    accel_plot_dedup: bool = False
+
+    # In-process LRU cache of plot vectors (0 disables the cache). Clears and imports
+    # invalidate only the cache of the worker that ran them, so with several API
+    # workers the others may serve stale plots (and requirement memo entries) for up
+    # to plot_cache_ttl_seconds; 0 = no expiry, only safe with a single worker
+    plot_cache_max_mb: int = 64
+    plot_cache_max_entries: int = 20000
+    plot_cache_ttl_seconds: int = 60
+
+    # Parsed upload workbooks by content hash (parse once, reuse by upload_token)
+    upload_cache_max_mb: int = 256
+    upload_cache_max_entries: int = 16
+    upload_cache_ttl_seconds: int = 1800
+
+    # Worker processes parsing uploaded workbooks (0 = CPU count); books with fewer
+    # sheets than excel_parse_parallel_min_sheets are parsed by a single worker.
+    # Uploads beyond the workers plus excel_parse_queue waiting workbooks get 429
+    excel_parse_workers: int = 0
+    excel_parse_parallel_min_sheets: int = 4
+    excel_parse_queue: int = 8
+
+    # Background import jobs running at the same time (further jobs wait in the queue)
+    import_job_workers: int = 2
+
+    # Rows fetched per DB round-trip and per NDJSON chunk in streaming responses (?stream=true)
+    stream_batch_rows: int = 500
+
+    # Memoized damping-interpolated requirement spectra (0 disables memoization)
+    requirement_memo_max_entries: int = 2000
+
+    # Fleet-wide recalculation jobs: worker processes (0 = CPU count, 1 = in-process)
+    # and elements per process-pool task
+    recalc_workers: int = 0
+    recalc_chunk_size: int = 200
+    # Recalculation jobs running at the same time and waiting in the queue; further
+    # requests get 429. All running jobs share the recalc_workers process pool
+    recalc_jobs: int = 1
+    recalc_job_queue: int = 4
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -1,15 +1,21 @@
 """
 Database session management
 """
+import asyncio
 import logging
-from contextlib import contextmanager
-from typing import Annotated
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Annotated, Any, AsyncIterator, Callable, Deque, Dict
 
 import oracledb
+from anyio import CapacityLimiter, to_thread
 from fastapi import Depends
 from sqlalchemy import URL, create_engine, Engine
-from sqlalchemy.exc import DatabaseError
+from sqlalchemy.exc import DatabaseError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from .config import settings
 
@@ -24,16 +30,167 @@ class DbException(Exception):
     pass
 
 
+class PoolMetrics:
+    """Counters of connection checkouts: time to get a connection, new connections, timeouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.timeouts = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class SessionSlots:
+    """
+    Counting semaphore over DB sessions, shared by the event loop and other threads
+
+    Requests and NDJSON streams wait for a slot on the event loop (acquire), so a
+    waiting request holds no worker thread; background jobs and scripts block their
+    own thread (acquire_blocking). Freed slots are handed to waiters in FIFO order.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self._free = total
+        self._lock = threading.Lock()
+        # Callbacks handing a slot to a waiter; False if the waiter is gone
+        self._waiters: Deque[Callable[[], bool]] = deque()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def grant() -> bool:
+            try:
+                loop.call_soon_threadsafe(self._grant_future, future)
+            except RuntimeError:
+                # Event loop closed
+                return False
+            return True
+
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            self._waiters.append(grant)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiting = grant in self._waiters
+                if waiting:
+                    self._waiters.remove(grant)
+            # Granted just before the cancellation: pass the slot on
+            if not waiting and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def acquire_blocking(self):
+        event = threading.Event()
+
+        def grant() -> bool:
+            event.set()
+            return True
+
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            self._waiters.append(grant)
+        event.wait()
+
+    def release(self):
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._free += 1
+                    return
+                grant = self._waiters.popleft()
+            if grant():
+                return
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"total": self.total, "in_use": self.total - self._free, "waiting": len(self._waiters)}
+
+    def _grant_future(self, future: "asyncio.Future[None]"):
+        # Runs on the waiter's event loop; a cancelled waiter passes the slot on
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+# Closes sessions of finished requests; its own limiter so closing never waits for
+# the worker threads that queued requests may occupy (like FastAPI's sync dependency exit)
+_session_close_limiter = CapacityLimiter(max(1, settings.db_pool_size + settings.db_max_overflow))
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits (queue wait plus connecting)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - started)
+
+    def _create_connection(self):
+        pool_metrics.record_connect()
+        return super()._create_connection()
+
+
 class DbSessionManager:
     """Database session manager - singleton для управления подключением к БД"""
     
     _engine: Engine | None = None
     _session_maker: sessionmaker[Session] | None = None
+    _slots: SessionSlots | None = None
+    _slots_lock = threading.Lock()
 
-    @classmethod
-    def initialize(cls):
-        """Initialize database connection"""
-        url_object = URL.create(
+    @staticmethod
+    def url() -> URL:
+        """Database URL from settings (also used by Alembic migrations)"""
+        return URL.create(
             drivername=settings.db_drivername,
             username=settings.db_username,
             password=settings.db_password,
@@ -42,18 +199,67 @@ class DbSessionManager:
             database=settings.db_name,
         )
 
+    @classmethod
+    def initialize(cls):
+        """Initialize database connection"""
         oracledb.init_oracle_client(lib_dir=settings.db_libdir)
-        cls._engine = create_engine(url_object, echo=False)
+        cls._engine = create_engine(
+            cls.url(),
+            echo=False,
+            poolclass=MeteredQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            connect_args={"stmtcachesize": settings.db_stmt_cache_size},
+        )
         cls._session_maker = sessionmaker(bind=cls._engine, expire_on_commit=False)
 
         # Checking whether a connection could be made successfully
         try:
-            next(cls.get_session()).connection().close()
+            next(cls.get_session(slot=False)).connection().close()
         except DatabaseError as e:
             raise DbException(f"Failed to connect DB: {e}") from None
 
         logger.info("DB connected")
 
+    @classmethod
+    def warm_up(cls, connections: int) -> int:
+        """Open up to `connections` pooled connections at once and return them to the pool"""
+        if cls._engine is None:
+            raise DbException("DB not initialized")
+
+        target = min(connections, cls._engine.pool.size())
+        opened = []
+        try:
+            for _ in range(target):
+                opened.append(cls._engine.raw_connection())
+        finally:
+            for connection in opened:
+                connection.close()
+
+        if opened:
+            logger.info(f"DB pool warmed up: {len(opened)} connection(s)")
+        return len(opened)
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        """Get pool state (size, checked out, overflow) and checkout counters"""
+        if cls._engine is None:
+            raise DbException("DB not initialized")
+
+        pool = cls._engine.pool
+        state = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": settings.db_max_overflow,
+            "timeout_seconds": settings.db_pool_timeout,
+        } if isinstance(pool, QueuePool) else {"pool": pool.status()}
+        return {**state, **pool_metrics.stats(), "session_slots": cls.session_slots().stats()}
+
     @classmethod
     def dispose(cls):
         """Dispose database connection"""
@@ -63,23 +269,99 @@ class DbSessionManager:
         cls._engine.dispose()
         cls._engine = None
         cls._session_maker = None
+        cls._slots = None
         logger.info("DB disconnected")
 
     @classmethod
-    def get_session(cls):
-        """Get database session (generator for dependency injection)"""
+    def session_slots(cls) -> SessionSlots:
+        """
+        Session slots shared by requests, NDJSON streams and background jobs
+
+        At most db_pool_size + db_max_overflow sessions are open at a time, so a
+        checkout never waits for the pool (and never hits db_pool_timeout).
+        """
+        with cls._slots_lock:
+            if cls._slots is None:
+                cls._slots = SessionSlots(max(1, settings.db_pool_size + settings.db_max_overflow))
+            return cls._slots
+
+    @classmethod
+    @asynccontextmanager
+    async def session_slot(cls) -> AsyncIterator[None]:
+        """Hold a session slot, waiting for it on the event loop"""
+        slots = cls.session_slots()
+        await slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    @classmethod
+    def get_session(cls, slot: bool = True):
+        """
+        Get database session (generator for dependency injection)
+
+        Blocks the calling thread until a session slot is free; slot=False is for
+        callers already holding one (see session_slot) and for start-up checks.
+        """
         if cls._session_maker is None:
             raise DbException("DB not initialized")
 
-        session = cls._session_maker()
+        slots = cls.session_slots() if slot else None
+        if slots is not None:
+            slots.acquire_blocking()
         try:
-            yield session
+            session = cls._session_maker()
+            try:
+                yield session
+            finally:
+                session.close()
         finally:
-            session.close()
+            if slots is not None:
+                slots.release()
+
+    @classmethod
+    async def get_request_session(cls) -> AsyncIterator[Session]:
+        """
+        Get database session for a request (async dependency)
+
+        A sync route keeps its connection until FastAPI has serialized the response,
+        which again needs a worker thread. If every worker thread waited for a
+        connection, nothing could return one until db_pool_timeout. So requests
+        wait for a session slot here on the event loop without taking a thread.
+        """
+        if cls._session_maker is None:
+            raise DbException("DB not initialized")
+
+        async with cls.session_slot():
+            session = cls._session_maker()
+            try:
+                yield session
+            finally:
+                # Closing may roll back on the server
+                await to_thread.run_sync(session.close, limiter=_session_close_limiter)
+
+
+def configure_request_threads() -> int:
+    """
+    Size the AnyIO thread pool running sync endpoints and run_in_threadpool calls
+
+    DB endpoints are plain `def` routes, so FastAPI runs them in this pool and the
+    event loop stays free during Oracle round-trips. The same limiter runs response
+    serialization, UploadFile reads, sync dependencies and streaming response
+    chunks, so it is not tied to the DB pool: requests, NDJSON streams and
+    background jobs are kept within the pool by DbSessionManager.session_slots,
+    and the AnyIO default (40) is only changed when settings.request_threads is
+    set. Returns the limit in effect. Must be called from the event loop (lifespan).
+    """
+    limiter = to_thread.current_default_thread_limiter()
+    if settings.request_threads > 0:
+        limiter.total_tokens = settings.request_threads
+    return int(limiter.total_tokens)
 
 
 # FastAPI dependency for database session
-DbSessionDep = Annotated[Session, Depends(DbSessionManager.get_session)]
+DbSessionDep = Annotated[Session, Depends(DbSessionManager.get_request_session)]
 
 # Context manager for database session
 DbSessionContext = contextmanager(DbSessionManager.get_session)
@@ -3,8 +3,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from core import DbSessionManager, settings
+from core import DbSessionManager, configure_request_threads, settings
 from api.router import api_router
+from services import shutdown_import_jobs, shutdown_recalculation_pool
+from utils.json_response import FastJSONResponse
+from utils.parse_pool import parse_pool
 
 
 
@@ -12,10 +15,17 @@ from api.router import api_router
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """Application lifespan - initialization and cleanup"""
+    configure_request_threads()
     DbSessionManager.initialize()
+    if settings.db_pool_warmup > 0:
+        DbSessionManager.warm_up(settings.db_pool_warmup)
     try:
         yield
     finally:
+        # Parse pool first: imports waiting on it fail fast instead of being waited for
+        parse_pool.shutdown()
+        shutdown_import_jobs()
+        shutdown_recalculation_pool()
         DbSessionManager.dispose()
 
 
@@ -24,7 +34,8 @@ app = FastAPI(
     title="SOEK API",
     description="Seismic analysis API for nuclear power plants",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -34,7 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"],
+    expose_headers=["Content-Disposition", "X-Next-Cursor"],
 )
 
 # Include API router
@@ -58,6 +69,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    """Connection pool state and checkout counters (wait time includes connecting)"""
+    return DbSessionManager.pool_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     
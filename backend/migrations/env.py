@@ -0,0 +1,45 @@
+"""
+Alembic environment - migrations run against the database from core.config settings
+"""
+from logging.config import fileConfig
+
+import oracledb
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from core import DbSessionManager, settings
+from models import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout (alembic upgrade head --sql)"""
+    context.configure(
+        url=DbSessionManager.url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations on a live connection"""
+    oracledb.init_oracle_client(lib_dir=settings.db_libdir)
+    engine = create_engine(DbSessionManager.url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,53 @@
+"""
+Acceleration plot side tables: packed vectors and content hashes
+
+SRTN_ACCEL_PLOT_PACKED and SRTN_ACCEL_PLOT_HASH may already exist (created by
+scripts.migrate_packed_plots / scripts.dedup_accel_plots), so they are only
+created when missing. Both reference SRTN_ACCEL_PLOT with ON DELETE CASCADE, so
+procedures deleting plots also remove their side rows.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _missing(table_name: str) -> bool:
+    if op.get_context().as_sql:
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade():
+    if _missing("SRTN_ACCEL_PLOT_PACKED"):
+        op.create_table(
+            "SRTN_ACCEL_PLOT_PACKED",
+            sa.Column(
+                "PLOT_ID", sa.Integer, sa.ForeignKey("SRTN_ACCEL_PLOT.PLOT_ID", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("POINT_COUNT", sa.Integer),
+            sa.Column("FREQ_DATA", sa.LargeBinary),
+            sa.Column("ACCEL_DATA", sa.LargeBinary),
+        )
+    if _missing("SRTN_ACCEL_PLOT_HASH"):
+        op.create_table(
+            "SRTN_ACCEL_PLOT_HASH",
+            sa.Column(
+                "PLOT_ID", sa.Integer, sa.ForeignKey("SRTN_ACCEL_PLOT.PLOT_ID", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("CONTENT_HASH", sa.String(64)),
+            sa.Column("POINT_COUNT", sa.Integer),
+        )
+        op.create_index("IX_ACCEL_PLOT_HASH_HASH", "SRTN_ACCEL_PLOT_HASH", ["CONTENT_HASH"])
+
+
+def downgrade():
+    op.drop_table("SRTN_ACCEL_PLOT_HASH")
+    op.drop_table("SRTN_ACCEL_PLOT_PACKED")
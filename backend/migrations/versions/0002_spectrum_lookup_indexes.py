@@ -0,0 +1,56 @@
+"""
+Covering indexes for the spectrum lookup paths
+
+- IX_ACCEL_SET_LOOKUP: requirement set by location / DEMPF / spectrum type,
+  with the selected set columns so the lookup does not visit the table
+- IX_ACCEL_POINT_PLOT_FREQ: points of a plot ordered by frequency
+- IX_EK_SEISM_EKLIST / IX_EK_SEISM_BUILDING: element list and building filters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns); names fit the 30 character Oracle limit
+INDEXES = [
+    (
+        "IX_ACCEL_SET_LOOKUP",
+        "SRTN_ACCEL_SET",
+        [
+            "PLANT_ID", "UNIT_ID", "BUILDING", "SET_TYPE", "CALC_TYPE", "ROOM", "SPECTR_EARTHQ_TYPE", "DEMPF",
+            "ACCEL_SET_ID", "X_PLOT_ID", "Y_PLOT_ID", "Z_PLOT_ID", "PGA_",
+        ],
+    ),
+    ("IX_ACCEL_POINT_PLOT_FREQ", "SRTN_ACCEL_POINT", ["PLOT_ID", "FREQ", "ACCEL"]),
+    ("IX_EK_SEISM_EKLIST", "SRTN_EK_SEISM_DATA", ["PLANT_ID", "UNIT_ID", "EKLIST_ID", "EK_ID"]),
+    ("IX_EK_SEISM_BUILDING", "SRTN_EK_SEISM_DATA", ["PLANT_ID", "UNIT_ID", "BUILDING", "ROOM"]),
+]
+
+
+def _existing_indexes(table_name: str) -> set:
+    if op.get_context().as_sql:
+        return set()
+    return {
+        index["name"].upper()
+        for index in sa.inspect(op.get_bind()).get_indexes(table_name)
+        if index.get("name")
+    }
+
+
+def upgrade():
+    for name, table_name, columns in INDEXES:
+        if name not in _existing_indexes(table_name):
+            op.create_index(name, table_name, columns)
+
+
+def downgrade():
+    for name, table_name, _ in reversed(INDEXES):
+        if name in _existing_indexes(table_name):
+            op.drop_index(name, table_name=table_name)
@@ -0,0 +1,57 @@
+"""
+ON DELETE CASCADE for the acceleration plot side tables
+
+Side tables created before 0001 set the cascade (by scripts.migrate_packed_plots /
+scripts.dedup_accel_plots) reference SRTN_ACCEL_PLOT with a plain foreign key,
+so deleting a plot fails with ORA-02292. Such keys are replaced with named
+cascading ones.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (table, foreign key name); names fit the 30 character Oracle limit
+FOREIGN_KEYS = [
+    ("SRTN_ACCEL_PLOT_PACKED", "FK_ACCEL_PLOT_PACKED_PLOT"),
+    ("SRTN_ACCEL_PLOT_HASH", "FK_ACCEL_PLOT_HASH_PLOT"),
+]
+
+
+def _plot_foreign_keys(table_name: str) -> list:
+    """Foreign keys of table_name referencing SRTN_ACCEL_PLOT (empty in offline mode)"""
+    if op.get_context().as_sql:
+        return []
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return []
+    return [
+        foreign_key
+        for foreign_key in inspector.get_foreign_keys(table_name)
+        if foreign_key["referred_table"].upper() == "SRTN_ACCEL_PLOT"
+    ]
+
+
+def upgrade():
+    for table_name, name in FOREIGN_KEYS:
+        foreign_keys = _plot_foreign_keys(table_name)
+        if not foreign_keys or all(
+            (foreign_key.get("options") or {}).get("ondelete", "").upper() == "CASCADE"
+            for foreign_key in foreign_keys
+        ):
+            continue
+        for foreign_key in foreign_keys:
+            op.drop_constraint(foreign_key["name"], table_name, type_="foreignkey")
+        op.create_foreign_key(name, table_name, "SRTN_ACCEL_PLOT", ["PLOT_ID"], ["PLOT_ID"], ondelete="CASCADE")
+
+
+def downgrade():
+    # The cascading keys are kept: without them deleting plots fails again
+    pass
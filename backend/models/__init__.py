@@ -5,7 +5,7 @@ from .base import Base
 from .plant import Plant, Unit
 from .file import File, FileType
 from .model_3d import Model3D, MultimediaModel, EkModel3D
-from .acceleration import AccelSet, AccelPlot, AccelPoint
+from .acceleration import AccelSet, AccelPlot, AccelPoint, AccelPlotPacked, AccelPlotHash
 from .seismic import EkSeismData
 from .location import TermLocation
 
@@ -21,6 +21,8 @@ __all__ = [
     "AccelSet",
     "AccelPlot",
     "AccelPoint",
+    "AccelPlotPacked",
+    "AccelPlotHash",
     "EkSeismData",
     "TermLocation",
 ]
@@ -1,7 +1,7 @@
 """
 Acceleration data ORM models
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, LargeBinary, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -34,6 +34,15 @@ class AccelSet(Base):
     plant = relationship("Plant")
     unit = relationship("Unit")
 
+    # Requirement set lookup (equality columns first, then the selected columns)
+    __table_args__ = (
+        Index(
+            'IX_ACCEL_SET_LOOKUP',
+            'PLANT_ID', 'UNIT_ID', 'BUILDING', 'SET_TYPE', 'CALC_TYPE', 'ROOM', 'SPECTR_EARTHQ_TYPE', 'DEMPF',
+            'ACCEL_SET_ID', 'X_PLOT_ID', 'Y_PLOT_ID', 'Z_PLOT_ID', 'PGA_',
+        ),
+    )
+
 
 class AccelPlot(Base):
     """Acceleration plot (график акселерограммы)"""
@@ -55,3 +64,35 @@ class AccelPoint(Base):
     
     plot = relationship("AccelPlot")
 
+    # Points of a plot in frequency order without touching the table
+    __table_args__ = (
+        Index('IX_ACCEL_POINT_PLOT_FREQ', 'PLOT_ID', 'FREQ', 'ACCEL'),
+    )
+
+
+class AccelPlotPacked(Base):
+    """Packed acceleration plot (графік акселерограми у вигляді упакованих масивів float64)"""
+    __tablename__ = 'SRTN_ACCEL_PLOT_PACKED'
+    
+    PLOT_ID = Column(Integer, ForeignKey('SRTN_ACCEL_PLOT.PLOT_ID', ondelete='CASCADE'), primary_key=True)
+    POINT_COUNT = Column(Integer)
+    FREQ_DATA = Column(LargeBinary)  # little-endian float64, sorted by frequency
+    ACCEL_DATA = Column(LargeBinary)  # little-endian float64, aligned with FREQ_DATA
+    
+    plot = relationship("AccelPlot")
+
+
+class AccelPlotHash(Base):
+    """Content hash of an acceleration plot (хеш точок графіку для спільного використання)"""
+    __tablename__ = 'SRTN_ACCEL_PLOT_HASH'
+    
+    PLOT_ID = Column(Integer, ForeignKey('SRTN_ACCEL_PLOT.PLOT_ID', ondelete='CASCADE'), primary_key=True)
+    CONTENT_HASH = Column(String(64))  # SHA-256 of sorted (FREQ, ACCEL) float64 vectors
+    POINT_COUNT = Column(Integer)
+    
+    plot = relationship("AccelPlot")
+
+    # Explicit name: the generated one is mixed-case and longer than Oracle's 30 chars
+    __table_args__ = (
+        Index('IX_ACCEL_PLOT_HASH_HASH', 'CONTENT_HASH'),
+    )
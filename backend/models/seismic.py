@@ -1,7 +1,7 @@
 """
 Seismic data ORM models
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -131,3 +131,9 @@ class EkSeismData(Base):
     plant = relationship("Plant")
     unit = relationship("Unit")
 
+    # Element list and building lookups
+    __table_args__ = (
+        Index('IX_EK_SEISM_EKLIST', 'PLANT_ID', 'UNIT_ID', 'EKLIST_ID', 'EK_ID'),
+        Index('IX_EK_SEISM_BUILDING', 'PLANT_ID', 'UNIT_ID', 'BUILDING', 'ROOM'),
+    )
+
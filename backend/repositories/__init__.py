@@ -5,7 +5,13 @@ from .base import BaseRepository
 from .plant import PlantRepository, UnitRepository, TermLocationRepository
 from .file import FileRepository, FileTypeRepository
 from .model_3d import Model3DRepository, MultimediaModelRepository, EkModel3DRepository
-from .acceleration import AccelSetRepository, AccelPlotRepository, AccelPointRepository
+from .acceleration import (
+    AccelSetRepository,
+    AccelPlotRepository,
+    AccelPointRepository,
+    AccelPlotPackedRepository,
+    AccelPlotHashRepository,
+)
 from .seismic import SeismicRepository
 
 __all__ = [
@@ -21,6 +27,8 @@ __all__ = [
     "AccelSetRepository",
     "AccelPlotRepository",
     "AccelPointRepository",
+    "AccelPlotPackedRepository",
+    "AccelPlotHashRepository",
     "SeismicRepository",
 ]
 
@@ -1,12 +1,18 @@
 """
 Acceleration data repositories
 """
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import exists, or_, text
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from models import AccelSet, AccelPlot, AccelPoint
-from .base import BaseRepository
+from models import AccelSet, AccelPlot, AccelPoint, AccelPlotPacked, AccelPlotHash
+from utils.helpers import pack_vector, packed_plots_available, unpack_vector
+from .base import BaseRepository, chunked
+
+# Rows per executemany call when inserting points in bulk
+BULK_INSERT_BATCH = 5000
 
 
 class AccelSetRepository(BaseRepository[AccelSet]):
@@ -36,6 +42,146 @@ class AccelSetRepository(BaseRepository[AccelSet]):
                 setattr(accel_set, key, value)
 
 
+    def get_by_ids(self, db: Session, set_ids: Iterable[int]) -> List[AccelSet]:
+        """Get acceleration sets by IDs using chunked IN queries"""
+        result = []
+        for chunk in chunked(set_ids):
+            result.extend(db.query(AccelSet).filter(AccelSet.ACCEL_SET_ID.in_(chunk)).all())
+        return result
+    
+    def find_requirement_sets(
+        self,
+        db: Session,
+        buildings: Iterable[Tuple[int, int, str]],
+        dempf: float,
+        spectr_earthq_types: Iterable[str],
+        calc_type: str
+    ) -> List[AccelSet]:
+        """Get ВИМОГИ sets with given DEMPF for several (PLANT_ID, UNIT_ID, BUILDING) locations"""
+        buildings = set(buildings)
+        if not buildings:
+            return []
+        
+        query = db.query(AccelSet).filter(
+            AccelSet.SET_TYPE == "ВИМОГИ",
+            AccelSet.DEMPF == dempf,
+            AccelSet.CALC_TYPE == calc_type,
+            AccelSet.SPECTR_EARTHQ_TYPE.in_(list(spectr_earthq_types)),
+        )
+        
+        result = []
+        for chunk in chunked({b[2] for b in buildings}):
+            rows = query.filter(
+                AccelSet.PLANT_ID.in_(sorted({b[0] for b in buildings})),
+                AccelSet.UNIT_ID.in_(sorted({b[1] for b in buildings})),
+                AccelSet.BUILDING.in_(chunk),
+            ).order_by(AccelSet.ACCEL_SET_ID).all()
+            result.extend(r for r in rows if (r.PLANT_ID, r.UNIT_ID, r.BUILDING) in buildings)
+        return result
+    
+    def find_location_requirement_sets(
+        self,
+        db: Session,
+        plant_id: int,
+        unit_id: int,
+        building: str,
+        room: Optional[str],
+        spectr_earthq_type: str,
+        calc_type: str
+    ) -> List[AccelSet]:
+        """Get ВИМОГИ sets of a location for all DEMPF values, ordered by DEMPF (lowest ID first)"""
+        query = db.query(AccelSet).filter(
+            AccelSet.SET_TYPE == "ВИМОГИ",
+            AccelSet.PLANT_ID == plant_id,
+            AccelSet.UNIT_ID == unit_id,
+            AccelSet.BUILDING == building,
+            AccelSet.SPECTR_EARTHQ_TYPE == spectr_earthq_type,
+            AccelSet.CALC_TYPE == calc_type,
+            AccelSet.DEMPF.isnot(None),
+        )
+        query = query.filter(AccelSet.ROOM.is_(None) if not room else AccelSet.ROOM == room)
+        return query.order_by(AccelSet.DEMPF, AccelSet.ACCEL_SET_ID).all()
+    
+    def get_element_spectra(
+        self,
+        db: Session,
+        ek_id: int,
+        spectrum_type: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get element's МРЗ/ПЗ sets with all X/Y/Z points in a single statement
+
+        Returns {spectrum_type: {ACCEL_SET_ID, SET_TYPE, PGA_, F_MU, plot_ids: {axis: PLOT_ID},
+        plots: {axis: (freq, accel)}}};
+        only spectrum types with an assigned set are present. Axes without a plot are omitted from
+        `plots`. Packed plots take precedence over point rows of the same PLOT_ID.
+        """
+        # The packed side table is optional in "points" storage mode
+        packed_branch = """
+                UNION ALL
+                SELECT PLOT_ID, NULL AS FREQ, NULL AS ACCEL, FREQ_DATA, ACCEL_DATA
+                FROM SRTN_ACCEL_PLOT_PACKED""" if packed_plots_available(db) else ""
+        query = text(f"""
+            WITH ek_sets AS (
+                SELECT 'МРЗ' AS SPECTR, ACCEL_SET_ID_MRZ AS SET_ID, F_MU
+                FROM SRTN_EK_SEISM_DATA WHERE EK_ID = :ek_id
+                UNION ALL
+                SELECT 'ПЗ' AS SPECTR, ACCEL_SET_ID_PZ AS SET_ID, F_MU
+                FROM SRTN_EK_SEISM_DATA WHERE EK_ID = :ek_id
+            )
+            SELECT es.SPECTR, s.ACCEL_SET_ID, s.SET_TYPE, s.PGA_, es.F_MU,
+                   s.X_PLOT_ID, s.Y_PLOT_ID, s.Z_PLOT_ID,
+                   v.PLOT_ID, v.FREQ, v.ACCEL, v.FREQ_DATA, v.ACCEL_DATA
+            FROM ek_sets es
+            JOIN SRTN_ACCEL_SET s ON s.ACCEL_SET_ID = es.SET_ID
+            LEFT JOIN (
+                SELECT PLOT_ID, FREQ, ACCEL, CAST(NULL AS BLOB) AS FREQ_DATA, CAST(NULL AS BLOB) AS ACCEL_DATA
+                FROM SRTN_ACCEL_POINT{packed_branch}
+            ) v ON v.PLOT_ID IN (s.X_PLOT_ID, s.Y_PLOT_ID, s.Z_PLOT_ID)
+            WHERE (:spectrum_type IS NULL OR es.SPECTR = :spectrum_type)
+            ORDER BY es.SPECTR, v.PLOT_ID, v.FREQ
+        """)
+        rows = db.execute(query, {"ek_id": ek_id, "spectrum_type": spectrum_type}).fetchall()
+        
+        sets: Dict[str, Dict[str, Any]] = {}
+        point_rows: Dict[Tuple[str, int], List[Tuple[float, float]]] = {}
+        packed_rows: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray]] = {}
+        
+        for (spectr, set_id, set_type, pga, f_mu, x_plot_id, y_plot_id, z_plot_id,
+             plot_id, freq, accel, freq_data, accel_data) in rows:
+            if spectr not in sets:
+                sets[spectr] = {
+                    "ACCEL_SET_ID": set_id,
+                    "SET_TYPE": set_type,
+                    "PGA_": pga,
+                    "F_MU": f_mu,
+                    "plot_ids": {"X": x_plot_id, "Y": y_plot_id, "Z": z_plot_id},
+                }
+            if plot_id is None:
+                continue
+            if freq_data is not None:
+                packed_rows[(spectr, plot_id)] = (unpack_vector(freq_data), unpack_vector(accel_data))
+            elif freq is not None and accel is not None:
+                point_rows.setdefault((spectr, plot_id), []).append((freq, accel))
+        
+        # Pivot rows into per-axis arrays (several axes may reference the same plot)
+        for spectr, set_data in sets.items():
+            plots = {}
+            for axis, plot_id in set_data["plot_ids"].items():
+                if not plot_id:
+                    continue
+                if (spectr, plot_id) in packed_rows:
+                    plots[axis] = packed_rows[(spectr, plot_id)]
+                elif (spectr, plot_id) in point_rows:
+                    points = np.array(point_rows[(spectr, plot_id)], dtype=np.float64)
+                    plots[axis] = (points[:, 0], points[:, 1])
+                else:
+                    plots[axis] = (np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+            set_data["plots"] = plots
+        
+        return sets
+
+
 class AccelPlotRepository(BaseRepository[AccelPlot]):
     """Acceleration plot repository"""
     
@@ -67,9 +213,158 @@ class AccelPointRepository(BaseRepository[AccelPoint]):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Помилка створення точки: {str(e)}")
     
+    def create_points_bulk(
+        self,
+        db: Session,
+        plot_id: int,
+        frequencies: Sequence[float],
+        accelerations: Sequence[float]
+    ) -> int:
+        """Insert all points of a plot with array-bound executemany, return inserted count"""
+        rows = [
+            {"FREQ": float(freq), "ACCEL": float(accel), "PLOT_ID": plot_id}
+            for freq, accel in zip(frequencies, accelerations)
+        ]
+        try:
+            statement = AccelPoint.__table__.insert()
+            for start in range(0, len(rows), BULK_INSERT_BATCH):
+                db.execute(statement, rows[start:start + BULK_INSERT_BATCH])
+            return len(rows)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Помилка створення точок: {str(e)}")
+    
     def get_by_plot_id(self, db: Session, plot_id: int) -> List[AccelPoint]:
         """Get all points for a plot"""
         return db.query(AccelPoint).filter(
             AccelPoint.PLOT_ID == plot_id
         ).order_by(AccelPoint.FREQ).all()
+    
+    def get_arrays_by_plot_id(self, db: Session, plot_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (FREQ, ACCEL) arrays for a plot without hydrating ORM objects"""
+        rows = db.query(AccelPoint.FREQ, AccelPoint.ACCEL).filter(
+            AccelPoint.PLOT_ID == plot_id
+        ).order_by(AccelPoint.FREQ).all()
+        if not rows:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+        
+        points = np.array(rows, dtype=np.float64)
+        return points[:, 0], points[:, 1]
 
+
+    def get_arrays_many(
+        self,
+        db: Session,
+        plot_ids: Iterable[int]
+    ) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Get (FREQ, ACCEL) arrays for several plots with chunked IN queries"""
+        result = {}
+        for chunk in chunked(plot_ids):
+            rows = db.query(AccelPoint.PLOT_ID, AccelPoint.FREQ, AccelPoint.ACCEL).filter(
+                AccelPoint.PLOT_ID.in_(chunk)
+            ).order_by(AccelPoint.PLOT_ID, AccelPoint.FREQ).all()
+            if not rows:
+                continue
+            
+            points = np.array(rows, dtype=np.float64)
+            # Rows are ordered by PLOT_ID, so each plot is a contiguous slice
+            boundaries = np.flatnonzero(np.diff(points[:, 0])) + 1
+            for plot_points in np.split(points, boundaries):
+                result[int(plot_points[0, 0])] = (plot_points[:, 1], plot_points[:, 2])
+        return result
+
+
+class AccelPlotPackedRepository(BaseRepository[AccelPlotPacked]):
+    """Packed acceleration plot repository (one row per plot with float64 vectors)"""
+    
+    def __init__(self):
+        super().__init__(AccelPlotPacked)
+    
+    def save_arrays(
+        self,
+        db: Session,
+        plot_id: int,
+        frequencies: Sequence[float],
+        accelerations: Sequence[float]
+    ):
+        """Create or replace packed vectors for a plot (points are stored sorted by FREQ)"""
+        try:
+            freq = np.asarray(frequencies, dtype=np.float64)
+            accel = np.asarray(accelerations, dtype=np.float64)
+            if freq.shape != accel.shape:
+                raise ValueError(f"FREQ/ACCEL length mismatch: {freq.size} != {accel.size}")
+            
+            order = np.argsort(freq, kind="stable")
+            db.merge(AccelPlotPacked(
+                PLOT_ID=plot_id,
+                POINT_COUNT=int(freq.size),
+                FREQ_DATA=pack_vector(freq[order]),
+                ACCEL_DATA=pack_vector(accel[order]),
+            ))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Помилка збереження упакованого графіку: {str(e)}")
+    
+    def get_arrays(self, db: Session, plot_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get (FREQ, ACCEL) arrays for a plot, or None if the plot is not packed"""
+        if not packed_plots_available(db):
+            return None
+        row = db.query(AccelPlotPacked.FREQ_DATA, AccelPlotPacked.ACCEL_DATA).filter(
+            AccelPlotPacked.PLOT_ID == plot_id
+        ).first()
+        if row is None:
+            return None
+        return unpack_vector(row[0]), unpack_vector(row[1])
+    
+    def get_arrays_many(
+        self,
+        db: Session,
+        plot_ids: Iterable[int]
+    ) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Get packed arrays for several plots in one query (missing plots are omitted)"""
+        result = {}
+        if not packed_plots_available(db):
+            return result
+        for chunk in chunked(plot_ids):
+            rows = db.query(
+                AccelPlotPacked.PLOT_ID, AccelPlotPacked.FREQ_DATA, AccelPlotPacked.ACCEL_DATA
+            ).filter(AccelPlotPacked.PLOT_ID.in_(chunk)).all()
+            for plot_id, freq_data, accel_data in rows:
+                result[plot_id] = (unpack_vector(freq_data), unpack_vector(accel_data))
+        return result
+
+
+class AccelPlotHashRepository(BaseRepository[AccelPlotHash]):
+    """Plot content hash repository (identical spectra are stored once and shared by sets)"""
+    
+    def __init__(self):
+        super().__init__(AccelPlotHash)
+    
+    def find_plot_id(self, db: Session, content_hash: str) -> Optional[int]:
+        """
+        Get the lowest PLOT_ID stored with this content hash
+
+        Only plots that still exist and still have points (or a packed row) are
+        returned, so a hash row left behind by a cleared plot is never reused.
+        """
+        has_data = exists().where(AccelPoint.PLOT_ID == AccelPlotHash.PLOT_ID)
+        if packed_plots_available(db):
+            has_data = or_(has_data, exists().where(AccelPlotPacked.PLOT_ID == AccelPlotHash.PLOT_ID))
+        row = db.query(AccelPlotHash.PLOT_ID).join(
+            AccelPlot, AccelPlot.PLOT_ID == AccelPlotHash.PLOT_ID
+        ).filter(
+            AccelPlotHash.CONTENT_HASH == content_hash,
+            has_data
+        ).order_by(AccelPlotHash.PLOT_ID).first()
+        return row[0] if row else None
+    
+    def save_hash(self, db: Session, plot_id: int, content_hash: str, point_count: int):
+        """Create or replace the content hash of a plot"""
+        try:
+            db.merge(AccelPlotHash(PLOT_ID=plot_id, CONTENT_HASH=content_hash, POINT_COUNT=point_count))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Помилка збереження хешу графіку: {str(e)}")
+    
+    def get_hashes(self, db: Session) -> Dict[int, str]:
+        """Get {PLOT_ID: CONTENT_HASH} for all hashed plots"""
+        return {plot_id: content_hash for plot_id, content_hash in db.query(
+            AccelPlotHash.PLOT_ID, AccelPlotHash.CONTENT_HASH
+        ).all()}
@@ -1,7 +1,7 @@
 """
 Base repository with generic CRUD operations
 """
-from typing import Generic, TypeVar, Type, Optional, List, Any
+from typing import Generic, TypeVar, Type, Optional, List, Any, Iterable, Iterator
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -9,6 +9,26 @@ from core.exceptions import DatabaseException, NotFoundException
 
 ModelType = TypeVar("ModelType")
 
+# Oracle rejects IN lists longer than 1000 expressions (ORA-01795)
+ORACLE_IN_LIMIT = 1000
+
+
+def chunked(values: Iterable[Any], size: int = ORACLE_IN_LIMIT) -> Iterator[List[Any]]:
+    """Split distinct non-empty values into sorted chunks that fit into an Oracle IN list"""
+    items = sorted({value for value in values if value is not None})
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def room_condition(room: Optional[str], column: str = "ROOM") -> str:
+    """
+    ROOM predicate for text() queries: `ROOM IS NULL` or `ROOM = :room`
+
+    Replaces `(:room IS NULL AND ROOM IS NULL) OR ROOM = :room`, which Oracle
+    cannot match against an index. Empty strings are NULL in Oracle.
+    """
+    return f"{column} IS NULL" if not room else f"{column} = :room"
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with generic CRUD operations"""
@@ -1,12 +1,13 @@
 """
 Seismic data repository
 """
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from models import EkSeismData
-from .base import BaseRepository
+from .base import BaseRepository, chunked
 
 
 class SeismicRepository(BaseRepository[EkSeismData]):
@@ -19,6 +20,45 @@ class SeismicRepository(BaseRepository[EkSeismData]):
         """Get seismic data by EK_ID"""
         return db.query(EkSeismData).filter(EkSeismData.EK_ID == ek_id).first()
     
+    def get_by_ek_ids(self, db: Session, ek_ids: Iterable[int]) -> List[EkSeismData]:
+        """Get seismic data for several elements using chunked IN queries"""
+        result = []
+        for chunk in chunked(ek_ids):
+            result.extend(db.query(EkSeismData).filter(EkSeismData.EK_ID.in_(chunk)).all())
+        return result
+    
+    def get_columns(
+        self,
+        db: Session,
+        columns: Sequence[str],
+        ek_ids: Optional[Iterable[int]] = None,
+        plant_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        eklist_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get EK_ID and the given columns for elements selected by IDs and/or filters
+
+        Only the requested columns are fetched; IDs are sent in chunked IN lists.
+        """
+        statement = select(EkSeismData.EK_ID, *(getattr(EkSeismData, c) for c in columns))
+        if plant_id is not None:
+            statement = statement.where(EkSeismData.PLANT_ID == plant_id)
+        if unit_id is not None:
+            statement = statement.where(EkSeismData.UNIT_ID == unit_id)
+        if eklist_id is not None:
+            statement = statement.where(EkSeismData.EKLIST_ID == eklist_id)
+
+        if ek_ids is None:
+            statements = [statement.order_by(EkSeismData.EK_ID)]
+        else:
+            statements = [statement.where(EkSeismData.EK_ID.in_(chunk)) for chunk in chunked(ek_ids)]
+
+        result = []
+        for chunk_statement in statements:
+            result.extend(dict(row._mapping) for row in db.execute(chunk_statement))
+        return result
+    
     def update_fields(self, db: Session, ek_id: int, **kwargs):
         """Update seismic data fields"""
         ek_data = db.query(EkSeismData).filter(EkSeismData.EK_ID == ek_id).first()
@@ -29,6 +69,18 @@ class SeismicRepository(BaseRepository[EkSeismData]):
             if hasattr(ek_data, key):
                 setattr(ek_data, key, value)
     
+    def bulk_update(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Update many elements by primary key with executemany
+
+        Each row is a dict with EK_ID and the columns to set; rows with the same
+        column set are sent in one array-bound statement.
+        """
+        if not rows:
+            return 0
+        db.execute(update(EkSeismData), rows)
+        return len(rows)
+    
     def search(
         self,
         db: Session,
@@ -62,3 +114,32 @@ class SeismicRepository(BaseRepository[EkSeismData]):
         
         return query.all()
 
+    def search_rows(
+        self,
+        db: Session,
+        columns: Sequence[str],
+        conditions: Sequence[Any] = (),
+        order_by: Sequence[Any] = (),
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get only the given columns of elements matching SQL conditions, as dicts"""
+        return list(self.iter_search_rows(db, columns, conditions, order_by, limit))
+
+    def iter_search_rows(
+        self,
+        db: Session,
+        columns: Sequence[str],
+        conditions: Sequence[Any] = (),
+        order_by: Sequence[Any] = (),
+        limit: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the given columns of matching elements, fetching batch_size rows at a time"""
+        statement = select(*(getattr(EkSeismData, c) for c in columns)).where(*conditions).order_by(*order_by)
+        if limit is not None:
+            statement = statement.limit(limit)
+        if batch_size:
+            statement = statement.execution_options(yield_per=batch_size)
+        for row in db.execute(statement):
+            yield dict(row._mapping)
+
@@ -13,6 +13,8 @@ from .model_3d import (
 from .acceleration import (
     AccelData,
     AccelDataItem,
+    AccelBatchLocation,
+    AccelBatchImportParams,
     SetAccelProcedureParams,
     SetAccelProcedureResult,
     FindReqAccelSetParams,
@@ -20,12 +22,21 @@ from .acceleration import (
     ClearAccelSetParams,
     ClearAccelSetResult,
     SpectralDataResult,
+    SpectralDataBatchParams,
+    SpectralDataBatchResult,
+    SpectrumSetRef,
+    ElementSpectraBatchItem,
+    PlotVectors,
     LocationCheck,
     BuildingCheck,
 )
 from .analysis import (
     SaveAnalysisResultParams,
     SaveAnalysisResultResponse,
+    CalculateM1Params,
+    RecalculationParams,
+    SigmaAltBulkParams,
+    KBatchParams,
     SaveStressInputsParams,
     SaveStressInputsResponse,
     SaveKResultsParams,
@@ -53,6 +64,8 @@ __all__ = [
     # Acceleration schemas
     "AccelData",
     "AccelDataItem",
+    "AccelBatchLocation",
+    "AccelBatchImportParams",
     "SetAccelProcedureParams",
     "SetAccelProcedureResult",
     "FindReqAccelSetParams",
@@ -60,11 +73,20 @@ __all__ = [
     "ClearAccelSetParams",
     "ClearAccelSetResult",
     "SpectralDataResult",
+    "SpectralDataBatchParams",
+    "SpectralDataBatchResult",
+    "SpectrumSetRef",
+    "ElementSpectraBatchItem",
+    "PlotVectors",
     "LocationCheck",
     "BuildingCheck",
     # Analysis schemas
     "SaveAnalysisResultParams",
     "SaveAnalysisResultResponse",
+    "CalculateM1Params",
+    "RecalculationParams",
+    "SigmaAltBulkParams",
+    "KBatchParams",
     "SaveStressInputsParams",
     "SaveStressInputsResponse",
     "SaveKResultsParams",
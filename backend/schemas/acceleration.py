@@ -28,6 +28,28 @@ class AccelData(BaseModel):
     can_overwrite: int = 0  # Allow overwriting existing sets
 
 
+class AccelBatchLocation(BaseModel):
+    """One location of a multi-location workbook import"""
+    building: str
+    room: Optional[str] = None
+    lev: Optional[float] = None
+    lev1: Optional[float] = None
+    lev2: Optional[float] = None
+    pga: Optional[float] = None
+    sheets: Optional[List[str]] = None  # Sheets of this location (default: all percentage sheets)
+    columns: Optional[Dict[str, str]] = None  # Column block: sheet header -> МРЗ_X ... ПЗ_Z
+
+
+class AccelBatchImportParams(BaseModel):
+    """Multi-location workbook import parameters schema"""
+    plant_id: int
+    unit_id: int
+    calc_type: str
+    set_type: str = "ВИМОГИ"
+    locations: List[AccelBatchLocation]
+    skip_existing: bool = False  # Skip locations that already have sets of this type
+
+
 class SetAccelProcedureParams(BaseModel):
     """Set acceleration procedure parameters schema"""
     ek_id: int
@@ -90,6 +112,46 @@ class SpectralDataResult(BaseModel):
     pz_z: Optional[List[float]] = None
 
 
+class SpectralDataBatchParams(BaseModel):
+    """Batch spectral data request schema"""
+    ek_ids: List[int]
+    spectrum_types: List[str] = ["МРЗ", "ПЗ"]
+    calc_type: Optional[str] = None  # Required together with dempf for requirement sets
+    dempf: Optional[float] = None
+
+
+class SpectrumSetRef(BaseModel):
+    """Acceleration set with references to shared plots"""
+    set_id: int
+    set_type: Optional[str] = None
+    dempf: Optional[float] = None
+    pga: Optional[float] = None
+    x_plot_id: Optional[int] = None
+    y_plot_id: Optional[int] = None
+    z_plot_id: Optional[int] = None
+
+
+class ElementSpectraBatchItem(BaseModel):
+    """Spectra of one element, keyed by spectrum type (МРЗ/ПЗ)"""
+    natural_frequency: Optional[float] = None
+    first_natural_frequencies: Dict[str, Optional[float]] = {}
+    spectral_sets: Dict[str, SpectrumSetRef] = {}
+    requirement_sets: Dict[str, SpectrumSetRef] = {}
+
+
+class PlotVectors(BaseModel):
+    """Plot points sorted by frequency"""
+    frequency: List[float]
+    accel: List[float]
+
+
+class SpectralDataBatchResult(BaseModel):
+    """Batch spectral data result schema - every plot is sent once"""
+    elements: Dict[int, ElementSpectraBatchItem]
+    plots: Dict[int, PlotVectors]
+    missing_ek_ids: List[int] = []
+
+
 class LocationCheck(BaseModel):
     """Location check schema"""
     plant_id: int
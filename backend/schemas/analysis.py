@@ -1,7 +1,7 @@
 """
 Analysis Pydantic schemas
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 
@@ -20,6 +20,51 @@ class SaveAnalysisResultResponse(BaseModel):
     updated_fields: Dict[str, Any]
 
 
+class CalculateM1Params(BaseModel):
+    """Server-side M1 calculation parameters schema"""
+    ek_ids: List[int]
+    calc_type: str
+    dempf: float
+    spectrum_types: List[str] = ["МРЗ", "ПЗ"]
+    # Lower frequency bound per axis ("x", "y", "z"); defaults to FIRST_NAT_FREQ_* of each element
+    natural_frequencies: Optional[Dict[str, Optional[float]]] = None
+    save: bool = True
+
+
+class RecalculationParams(BaseModel):
+    """Fleet-wide recalculation job parameters schema (at least one filter is required)"""
+    plant_id: Optional[int] = None
+    unit_id: Optional[int] = None
+    eklist_id: Optional[int] = None
+    calc_type: str
+    dempf: float
+    spectrum_types: List[str] = ["МРЗ", "ПЗ"]
+    # Chunks in flight in the shared process pool (1 = in-process); defaults to settings.recalc_workers
+    workers: Optional[int] = None
+
+
+class SigmaAltBulkParams(BaseModel):
+    """Bulk sigma alt calculation parameters schema (ek_ids and/or filters)"""
+    ek_ids: Optional[List[int]] = None
+    plant_id: Optional[int] = None
+    unit_id: Optional[int] = None
+    eklist_id: Optional[int] = None
+    save: bool = True
+
+
+class KBatchParams(BaseModel):
+    """Batch K calculation parameters schema (ek_ids and/or filters)"""
+    ek_ids: Optional[List[int]] = None
+    plant_id: Optional[int] = None
+    unit_id: Optional[int] = None
+    eklist_id: Optional[int] = None
+    # ВИМОГИ set used for PGA in k2; `pga` overrides it for all elements
+    calc_type: Optional[str] = None
+    dempf: Optional[float] = None
+    pga: Optional[float] = None
+    save: bool = True
+
+
 class SaveStressInputsParams(BaseModel):
     """Save stress inputs parameters schema"""
     ek_id: int
@@ -0,0 +1,3 @@
+"""
+Maintenance scripts - запускаются из каталога backend: python -m scripts.<name>
+"""
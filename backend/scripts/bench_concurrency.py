@@ -0,0 +1,128 @@
+"""
+Benchmark: requests per second of a DB endpoint under N parallel clients
+
+Usage (from backend directory):
+    python -m scripts.bench_concurrency [--url DB_URL] [--latency-ms 20] [--clients 1,4,16] [--requests 200]
+
+Compares the previous route style (`async def` calling the sync session, so every
+round-trip blocks the event loop) with the current one (`def` route run in the
+AnyIO worker thread pool, see configure_request_threads). Both serve
+GET /api/plants through the real app in-process. By default runs against a
+temporary SQLite file with --latency-ms added to every statement to stand in for
+the Oracle round-trip; pass --url and --latency-ms 0 to measure a real database.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+import httpx
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core import DbSessionContext, DbSessionManager, configure_request_threads, settings
+from main import app
+from models import Base, Plant
+from schemas import Plant as PlantSchema
+from services import PlantService
+
+BLOCKING_PATH = "/bench/blocking/plants"
+THREADPOOL_PATH = "/api/plants"
+
+plant_service = PlantService()
+
+
+@app.get(BLOCKING_PATH, response_model=List[PlantSchema], include_in_schema=False)
+async def get_plants_blocking():
+    """
+    Previous route style: sync DB call inside an async route
+
+    The session is closed inside the route: with DbSessionDep it would only be
+    returned by the dependency teardown, which needs the event loop this route
+    blocks, so more clients than pool connections would deadlock. For the same
+    reason it takes no session slot (waiting for one would block the event loop).
+    """
+    with DbSessionContext(slot=False) as db:
+        return plant_service.get_all_plants(db)
+
+
+def setup_database(url: str, latency_ms: float):
+    """Bind DbSessionManager to the benchmark engine; returns the engine"""
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(
+        url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        connect_args=connect_args,
+    )
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            if not connection.execute(Plant.__table__.select()).first():
+                connection.execute(Plant.__table__.insert(), [{"NAME": f"Plant {i}"} for i in range(1, 6)])
+
+    if latency_ms > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def simulate_round_trip(*_):
+            time.sleep(latency_ms / 1000)
+
+    DbSessionManager._engine = engine
+    DbSessionManager._session_maker = sessionmaker(bind=engine, expire_on_commit=False)
+    return engine
+
+
+async def run_load(client: httpx.AsyncClient, path: str, clients: int, requests: int) -> float:
+    """Send `requests` GETs from `clients` concurrent tasks; return requests per second"""
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(args) -> None:
+    threads = configure_request_threads()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both routes (connections, statement compilation)
+        await run_load(client, BLOCKING_PATH, 1, 5)
+        await run_load(client, THREADPOOL_PATH, 1, 5)
+
+        print(f"Worker threads: {threads}, pool: {settings.db_pool_size}+{settings.db_max_overflow}, "
+              f"latency: {args.latency_ms:g} ms, requests per run: {args.requests}")
+        print(f"{'clients':<10}{'async route, rps':>18}{'threadpool, rps':>18}{'speedup':>10}")
+        for clients in args.clients:
+            blocking = await run_load(client, BLOCKING_PATH, clients, args.requests)
+            threadpool = await run_load(client, THREADPOOL_PATH, clients, args.requests)
+            print(f"{clients:<10}{blocking:>18.1f}{threadpool:>18.1f}{threadpool / blocking:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests per second of a DB endpoint under parallel clients")
+    parser.add_argument("--url", default=None, help="SQLAlchemy database URL (default: temporary SQLite file)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Simulated round-trip per statement")
+    parser.add_argument("--clients", default="1,4,16", help="Comma-separated parallel client counts")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per measurement")
+    args = parser.parse_args()
+    args.clients = [int(value) for value in args.clients.split(",") if value.strip()]
+
+    temp_dir = tempfile.TemporaryDirectory() if args.url is None else None
+    url = args.url or f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+    engine = setup_database(url, args.latency_ms)
+    try:
+        asyncio.run(run(args))
+    finally:
+        engine.dispose()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
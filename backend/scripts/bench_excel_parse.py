@@ -0,0 +1,167 @@
+"""
+Benchmark: full-mode openpyxl parsing vs streaming read-only parsing of import workbooks
+
+Usage (from backend directory):
+    python -m scripts.bench_excel_parse [--workbook PATH] [--repeat 5] [--copies 0] [--row-scale 1] [--workers 0]
+
+Measures what /api/analyze-excel and /api/extract-sheet-data do for every percentage sheet.
+--copies N appends N synthetic copies of each percentage sheet (rows repeated --row-scale
+times) to stress larger books; the bundled Додаток Б workbook is used by default.
+The whole-book parse is also timed in-process and with --workers processes (0 = CPU count).
+"""
+import argparse
+import glob
+import io
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import openpyxl
+
+from utils.excel import extract_sheet_columns, is_percentage_sheet, open_workbook, parse_workbook, sheet_row_count
+
+DEFAULT_WORKBOOK_PATTERN = os.path.join(os.path.dirname(__file__), "..", "..", "*Додаток Б*.xlsm")
+
+
+def legacy_analyze(content: bytes) -> List[Dict[str, Any]]:
+    """Previous /analyze-excel: full load, count non-empty rows over Cell objects"""
+    workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+    sheets = []
+    for sheet_name in workbook.sheetnames:
+        row_count = sum(1 for row in workbook[sheet_name].iter_rows() if any(c.value is not None for c in row))
+        sheets.append({"name": sheet_name, "rows": row_count})
+    workbook.close()
+    return sheets
+
+
+def legacy_extract(content: bytes, sheet_name: str) -> Dict[str, List[Any]]:
+    """Previous /extract-sheet-data: full load per request, then values_only iteration"""
+    workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+    sheet = workbook[sheet_name]
+    first_rows = list(sheet.iter_rows(min_row=1, max_row=5, values_only=True))
+    header_row_idx, first_row = next(
+        (i, row) for i, row in enumerate(first_rows, start=1)
+        if row and any(c is not None and not isinstance(c, (int, float)) for c in row)
+    )
+    headers = [(idx, str(c).strip()) for idx, c in enumerate(first_row) if c is not None and str(c).strip()]
+    data = {header: [] for _, header in headers}
+    for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
+        for col_idx, header in headers:
+            if col_idx < len(row):
+                cell = row[col_idx]
+                data[header].append(
+                    None if cell is None else float(cell) if isinstance(cell, (int, float)) else str(cell)
+                )
+    workbook.close()
+    return data
+
+
+def streaming_analyze(content: bytes) -> List[Dict[str, Any]]:
+    workbook = open_workbook(content)
+    try:
+        return [{"name": name, "rows": sheet_row_count(workbook[name])} for name in workbook.sheetnames]
+    finally:
+        workbook.close()
+
+
+def streaming_extract(content: bytes, sheet_name: str) -> Dict[str, List[Any]]:
+    workbook = open_workbook(content)
+    try:
+        return extract_sheet_columns(workbook[sheet_name])
+    finally:
+        workbook.close()
+
+
+def build_synthetic(content: bytes, copies: int, row_scale: int) -> bytes:
+    """Append copies of percentage sheets (rows repeated row_scale times) to a new .xlsx"""
+    source = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+    target = openpyxl.Workbook()
+    target.remove(target.active)
+    for sheet_name in source.sheetnames:
+        rows = list(source[sheet_name].iter_rows(values_only=True))
+        names = [sheet_name]
+        if is_percentage_sheet(sheet_name):
+            names += [f"{i + 10}%" for i in range(copies)]
+        for name in names:
+            sheet = target.create_sheet(name)
+            sheet.append(rows[0])
+            for _ in range(row_scale):
+                for row in rows[1:]:
+                    sheet.append(row)
+    output = io.BytesIO()
+    target.save(output)
+    return output.getvalue()
+
+
+def measure(fn: Callable[[], Any], repeat: int):
+    """Best wall time over `repeat` runs and peak traced memory of one run"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and streaming Excel parsing")
+    parser.add_argument("--workbook", default=None, help="Path to .xlsx/.xlsm workbook (default: bundled Додаток Б)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--copies", type=int, default=0, help="Extra synthetic copies of each percentage sheet")
+    parser.add_argument("--row-scale", type=int, default=1, help="Repeat data rows of synthetic sheets")
+    parser.add_argument("--workers", type=int, default=0, help="Processes for the parallel parse (0 = CPU count)")
+    args = parser.parse_args()
+
+    workbook_path = args.workbook or glob.glob(DEFAULT_WORKBOOK_PATTERN)[0]
+    with open(workbook_path, "rb") as f:
+        content = f.read()
+    if args.copies or args.row_scale > 1:
+        content = build_synthetic(content, args.copies, args.row_scale)
+
+    probe = open_workbook(content)
+    sheet_names = [name for name in probe.sheetnames if is_percentage_sheet(name)]
+    probe.close()
+
+    # Same data both ways (row counts may differ only by empty rows inside the declared dimension)
+    for sheet_name in sheet_names:
+        assert legacy_extract(content, sheet_name) == streaming_extract(content, sheet_name), sheet_name
+    assert parse_workbook(content, workers=1) == parse_workbook(content, workers=args.workers)
+
+    def import_legacy():
+        legacy_analyze(content)
+        for sheet_name in sheet_names:
+            legacy_extract(content, sheet_name)
+
+    def import_streaming():
+        streaming_analyze(content)
+        for sheet_name in sheet_names:
+            streaming_extract(content, sheet_name)
+
+    print(f"Workbook: {os.path.basename(workbook_path)}, {len(content) / 1024:.0f} KiB, "
+          f"{len(sheet_names)} percentage sheet(s)")
+    print(f"{'step':<22}{'best, ms':>12}{'peak, KiB':>12}")
+    results = {}
+    for label, fn in (
+        ("analyze legacy", lambda: legacy_analyze(content)),
+        ("analyze streaming", lambda: streaming_analyze(content)),
+        ("import legacy", import_legacy),
+        ("import streaming", import_streaming),
+        ("parse in-process", lambda: parse_workbook(content, workers=1)),
+        ("parse parallel", lambda: parse_workbook(content, workers=args.workers)),
+    ):
+        best, peak = measure(fn, args.repeat)
+        results[label] = best
+        print(f"{label:<22}{best * 1000:>12.2f}{peak / 1024:>12.0f}")
+
+    print(f"analyze speedup: {results['analyze legacy'] / results['analyze streaming']:.1f}x")
+    print(f"import speedup: {results['import legacy'] / results['import streaming']:.1f}x")
+    print(f"parallel parse speedup: {results['parse in-process'] / results['parse parallel']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: response serialization of spectra and search payloads
+
+Usage (from backend directory):
+    python -m scripts.bench_json_response [--points 300] [--elements 200] [--rows 2000] [--repeat 20]
+
+Serves the same prebuilt payloads through in-process FastAPI apps:
+  stdlib   - default JSONResponse with response_model validation
+  orjson   - FastJSONResponse as default response class (as in main.py), still validated
+  bypass   - route returns FastJSONResponse(payload), no revalidation
+Payloads mimic /spectral-data (one element, both spectra), /spectral-data/batch,
+/seism-requirements (dict without response_model) and /search (EkSeismData rows).
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models import EkSeismData
+from schemas import SearchData, SpectralDataBatchResult, SpectralDataResult
+from utils.json_response import FastJSONResponse
+
+
+def spectrum(points: int) -> List[float]:
+    return [round(random.uniform(0.01, 3.0), 6) for _ in range(points)]
+
+
+def build_payloads(points: int, elements: int, rows: int) -> Dict[str, Any]:
+    """Representative service outputs (plain dicts/lists, as the services return them)"""
+    frequency = sorted(round(random.uniform(0.1, 100.0), 4) for _ in range(points))
+    spectral = {
+        "frequency": frequency,
+        "mrz_x": spectrum(points), "mrz_y": spectrum(points), "mrz_z": spectrum(points),
+        "pz_x": spectrum(points), "pz_y": spectrum(points), "pz_z": spectrum(points),
+    }
+
+    plot_count = max(3, elements // 2)
+    plots = {plot_id: {"frequency": frequency, "accel": spectrum(points)} for plot_id in range(1, plot_count + 1)}
+
+    def set_ref(set_id: int) -> Dict[str, Any]:
+        plot_ids = random.sample(range(1, plot_count + 1), 3)
+        return {"set_id": set_id, "set_type": "ВИМОГИ", "dempf": 5.0, "pga": 0.12,
+                "x_plot_id": plot_ids[0], "y_plot_id": plot_ids[1], "z_plot_id": plot_ids[2]}
+
+    batch = {
+        "elements": {
+            ek_id: {
+                "natural_frequency": 12.5,
+                "first_natural_frequencies": {"x": 10.1, "y": 11.2, "z": 25.0},
+                "spectral_sets": {"МРЗ": set_ref(ek_id * 2), "ПЗ": set_ref(ek_id * 2 + 1)},
+                "requirement_sets": {"МРЗ": set_ref(ek_id * 3)},
+            }
+            for ek_id in range(1, elements + 1)
+        },
+        "plots": plots,
+        "missing_ek_ids": [],
+    }
+
+    requirements = {
+        "frequency": frequency,
+        "mrz_x": spectrum(points), "mrz_y": spectrum(points), "mrz_z": spectrum(points),
+        "pga": 0.12, "set_id": 1, "dempf": 5.0,
+    }
+
+    columns = EkSeismData.__table__.columns
+    search = []
+    for ek_id in range(1, rows + 1):
+        row = {}
+        for column in columns:
+            python_type = column.type.python_type
+            if python_type is int:
+                row[column.name] = ek_id
+            elif python_type is float:
+                row[column.name] = round(random.uniform(0, 500), 4) if random.random() > 0.3 else None
+            else:
+                row[column.name] = f"{column.name.lower()} {ek_id}" if random.random() > 0.3 else None
+        search.append({"data": row})
+
+    return {"spectral": spectral, "batch": batch, "requirements": requirements, "search": search}
+
+
+ROUTE_MODELS = {
+    "spectral": SpectralDataResult,
+    "batch": SpectralDataBatchResult,
+    "requirements": None,
+    "search": List[SearchData],
+}
+
+
+def build_app(payloads: Dict[str, Any], default_response_class=None, bypass: bool = False) -> FastAPI:
+    app = FastAPI() if default_response_class is None else FastAPI(default_response_class=default_response_class)
+
+    def add_route(name: str, response_model: Optional[Any]):
+        payload = payloads[name]
+
+        def endpoint():
+            return FastJSONResponse(payload) if bypass else payload
+
+        app.add_api_route(f"/{name}", endpoint, methods=["GET"], response_model=response_model)
+
+    for name, response_model in ROUTE_MODELS.items():
+        add_route(name, response_model)
+    return app
+
+
+def measure(client: TestClient, path: str, repeat: int) -> Dict[str, float]:
+    """Median request time in ms and response size"""
+    response = client.get(path)
+    response.raise_for_status()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(path).raise_for_status()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"ms": statistics.median(times), "kib": len(response.content) / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON response serialization paths")
+    parser.add_argument("--points", type=int, default=300, help="Points per spectrum")
+    parser.add_argument("--elements", type=int, default=200, help="Elements in the batch payload")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows in the search payload")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = build_payloads(args.points, args.elements, args.rows)
+    apps: Dict[str, Callable[[], FastAPI]] = {
+        "stdlib": lambda: build_app(payloads),
+        "orjson": lambda: build_app(payloads, default_response_class=FastJSONResponse),
+        "bypass": lambda: build_app(payloads, bypass=True),
+    }
+
+    results = {}
+    for mode, factory in apps.items():
+        with TestClient(factory()) as client:
+            results[mode] = {name: measure(client, f"/{name}", args.repeat) for name in ROUTE_MODELS}
+
+    print(f"{'payload':<14}{'size, KiB':>11}{'stdlib, ms':>12}{'orjson, ms':>12}{'bypass, ms':>12}{'speedup':>9}")
+    for name in ROUTE_MODELS:
+        stdlib, orjson_ms, bypass = (results[mode][name]["ms"] for mode in apps)
+        print(f"{name:<14}{results['bypass'][name]['kib']:>11.0f}{stdlib:>12.2f}{orjson_ms:>12.2f}"
+              f"{bypass:>12.2f}{stdlib / bypass:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
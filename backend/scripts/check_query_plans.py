@@ -0,0 +1,168 @@
+"""
+Check Oracle execution plans of the hot spectrum lookup statements
+
+Usage (from backend directory):
+    python -m scripts.check_query_plans [--statement NAME ...] [--quiet]
+
+Runs EXPLAIN PLAN for every statement (binds stay unbound), prints DBMS_XPLAN
+output and fails when a statement does a full scan of its table or does not use
+the index created by the Alembic migrations (alembic upgrade head). On nearly
+empty tables the optimizer may still prefer a full scan - gather statistics first.
+Exit code is 1 when any check fails.
+"""
+import argparse
+import sys
+from typing import Dict, List, NamedTuple, Tuple
+
+from core import DbSessionManager
+from repositories.base import room_condition
+
+
+class HotStatement(NamedTuple):
+    table: str
+    index: str
+    sql: str
+
+
+def _requirement_set_sql(room_filter: str) -> str:
+    return f"""
+        SELECT ACCEL_SET_ID, X_PLOT_ID, Y_PLOT_ID, Z_PLOT_ID, PGA_
+        FROM SRTN_ACCEL_SET
+        WHERE PLANT_ID = :plant_id
+        AND UNIT_ID = :unit_id
+        AND BUILDING = :building
+        AND {room_filter}
+        AND DEMPF = :dempf
+        AND SPECTR_EARTHQ_TYPE = :spectr_earthq_type
+        AND CALC_TYPE = :calc_type
+        AND SET_TYPE = 'ВИМОГИ'
+        AND ROWNUM = 1
+    """
+
+
+# Same statements as AccelerationService / repositories issue
+HOT_STATEMENTS: Dict[str, HotStatement] = {
+    "requirement_set": HotStatement(
+        "SRTN_ACCEL_SET", "IX_ACCEL_SET_LOOKUP", _requirement_set_sql(room_condition("room"))
+    ),
+    "requirement_set_no_room": HotStatement(
+        "SRTN_ACCEL_SET", "IX_ACCEL_SET_LOOKUP", _requirement_set_sql(room_condition(None))
+    ),
+    "find_req_accel_set": HotStatement("SRTN_ACCEL_SET", "IX_ACCEL_SET_LOOKUP", f"""
+        SELECT ACCEL_SET_ID
+        FROM SRTN_ACCEL_SET
+        WHERE PLANT_ID = :plant_id
+        AND UNIT_ID = :unit_id
+        AND BUILDING = :building
+        AND {room_condition("room")}
+        AND CALC_TYPE = :calc_type
+        AND SET_TYPE = :set_type
+        AND ROWNUM = 1
+    """),
+    "location_requirement_sets": HotStatement("SRTN_ACCEL_SET", "IX_ACCEL_SET_LOOKUP", f"""
+        SELECT ACCEL_SET_ID, X_PLOT_ID, Y_PLOT_ID, Z_PLOT_ID, DEMPF, PGA_
+        FROM SRTN_ACCEL_SET
+        WHERE SET_TYPE = 'ВИМОГИ'
+        AND PLANT_ID = :plant_id
+        AND UNIT_ID = :unit_id
+        AND BUILDING = :building
+        AND SPECTR_EARTHQ_TYPE = :spectr_earthq_type
+        AND CALC_TYPE = :calc_type
+        AND DEMPF IS NOT NULL
+        AND {room_condition("room")}
+        ORDER BY DEMPF, ACCEL_SET_ID
+    """),
+    "plot_points": HotStatement("SRTN_ACCEL_POINT", "IX_ACCEL_POINT_PLOT_FREQ", """
+        SELECT FREQ, ACCEL
+        FROM SRTN_ACCEL_POINT
+        WHERE PLOT_ID = :plot_id
+        ORDER BY FREQ
+    """),
+    "ek_by_eklist": HotStatement("SRTN_EK_SEISM_DATA", "IX_EK_SEISM_EKLIST", """
+        SELECT EK_ID
+        FROM SRTN_EK_SEISM_DATA
+        WHERE PLANT_ID = :plant_id
+        AND UNIT_ID = :unit_id
+        AND EKLIST_ID = :eklist_id
+        ORDER BY EK_ID
+    """),
+    "ek_count_by_building": HotStatement("SRTN_EK_SEISM_DATA", "IX_EK_SEISM_BUILDING", """
+        SELECT COUNT(*)
+        FROM SRTN_EK_SEISM_DATA
+        WHERE PLANT_ID = :plant_id
+        AND UNIT_ID = :unit_id
+        AND BUILDING = :building
+    """),
+}
+
+
+def explain(cursor, name: str, statement: HotStatement) -> Tuple[List[str], str]:
+    """EXPLAIN PLAN one statement; return (problems found, DBMS_XPLAN text)"""
+    statement_id = f"SOEK_{name}"[:30]
+    cursor.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :statement_id", statement_id=statement_id)
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {statement.sql}")
+
+    cursor.execute(
+        "SELECT PLAN_TABLE_OUTPUT FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', :statement_id, 'TYPICAL'))",
+        statement_id=statement_id
+    )
+    plan_text = "\n".join(row[0] for row in cursor.fetchall())
+
+    cursor.execute(
+        "SELECT OPERATION, OPTIONS, OBJECT_NAME FROM PLAN_TABLE WHERE STATEMENT_ID = :statement_id",
+        statement_id=statement_id
+    )
+    steps = cursor.fetchall()
+    cursor.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :statement_id", statement_id=statement_id)
+
+    problems = []
+    if any(operation == "TABLE ACCESS" and options == "FULL" and obj == statement.table
+           for operation, options, obj in steps):
+        problems.append(f"full scan of {statement.table}")
+    if not any(operation == "INDEX" and obj == statement.index for operation, _, obj in steps):
+        problems.append(f"{statement.index} not used")
+    return problems, plan_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check execution plans of the spectrum lookup statements")
+    parser.add_argument(
+        "--statement",
+        action="append",
+        choices=sorted(HOT_STATEMENTS),
+        help="Check only this statement (repeatable)"
+    )
+    parser.add_argument("--quiet", action="store_true", help="Print only the check results, not the plans")
+    args = parser.parse_args()
+
+    names = args.statement or list(HOT_STATEMENTS)
+    failed = 0
+
+    DbSessionManager.initialize()
+    try:
+        engine = DbSessionManager._engine
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for name in names:
+                problems, plan_text = explain(cursor, name, HOT_STATEMENTS[name])
+                if not args.quiet:
+                    print(plan_text)
+                if problems:
+                    failed += 1
+                    print(f"FAIL {name}: {'; '.join(problems)}")
+                else:
+                    print(f"OK   {name}")
+            connection.rollback()
+        finally:
+            connection.close()
+    finally:
+        DbSessionManager.dispose()
+
+    print(f"Checked {len(names)} statement(s), {failed} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
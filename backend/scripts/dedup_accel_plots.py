@@ -0,0 +1,168 @@
+"""
+Deduplicate acceleration plots by content hash (SRTN_ACCEL_PLOT_HASH)
+
+Usage (from backend directory):
+    python -m scripts.dedup_accel_plots [--batch-size 200] [--delete-duplicates] [--dry-run]
+                                        [--procedures-safe]
+
+Hashes every plot that has no hash row yet, then points X/Y/Z_PLOT_ID of all sets
+at the lowest PLOT_ID of each group of identical plots. With --delete-duplicates
+the now unreferenced copies (points, packed row, hash row, plot) are removed.
+
+Relinking shares plots between sets, and DB procedures (CLEAR_ACCEL_CET_ARRAYS,
+SET_ALL_EK_ACCEL_SET with clear_sets) delete the plot points of a cleared set
+without checking other references. So sets are only relinked when
+settings.accel_plot_dedup is on, or with --procedures-safe once the procedures
+no longer delete shared plots; otherwise only hashing and the report are done.
+"""
+import argparse
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import text
+
+from core import DbSessionManager, DbSessionContext
+from core.config import settings
+from models import AccelPlotHash
+from repositories import AccelPlotHashRepository, AccelPlotPackedRepository, AccelPointRepository
+from repositories.base import ORACLE_IN_LIMIT
+from utils.helpers import packed_plots_available
+from utils.helpers import plot_content_hash
+
+
+def get_unhashed_plot_ids(db) -> List[int]:
+    """Get IDs of plots without a content hash row"""
+    query = text("""
+        SELECT p.PLOT_ID
+        FROM SRTN_ACCEL_PLOT p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM SRTN_ACCEL_PLOT_HASH h WHERE h.PLOT_ID = p.PLOT_ID
+        )
+        ORDER BY p.PLOT_ID
+    """)
+    return [row[0] for row in db.execute(query).fetchall()]
+
+
+def hash_batch(db, plot_ids: List[int]) -> int:
+    """Store content hashes for a batch of plots (packed vectors first, then point rows)"""
+    packed_repo = AccelPlotPackedRepository()
+    point_repo = AccelPointRepository()
+    hash_repo = AccelPlotHashRepository()
+
+    arrays = packed_repo.get_arrays_many(db, plot_ids)
+    arrays.update(point_repo.get_arrays_many(db, set(plot_ids) - arrays.keys()))
+    for plot_id in plot_ids:
+        frequencies, accelerations = arrays.get(plot_id, ([], []))
+        hash_repo.save_hash(db, plot_id, plot_content_hash(frequencies, accelerations), len(frequencies))
+    return len(plot_ids)
+
+
+def duplicate_groups(db) -> Dict[int, List[int]]:
+    """Get {canonical PLOT_ID: [duplicate PLOT_IDs]} for hashes shared by several plots"""
+    groups = defaultdict(list)
+    for plot_id, content_hash in sorted(AccelPlotHashRepository().get_hashes(db).items()):
+        groups[content_hash].append(plot_id)
+    return {ids[0]: ids[1:] for ids in groups.values() if len(ids) > 1}
+
+
+def relink_allowed(procedures_safe: bool) -> bool:
+    """Whether sets may share plots: accel_plot_dedup is on or the caller vouches for the procedures"""
+    if settings.accel_plot_dedup:
+        return True
+    if procedures_safe:
+        print(
+            "WARNING: accel_plot_dedup is off. Relinking anyway (--procedures-safe): if "
+            "CLEAR_ACCEL_CET_ARRAYS or SET_ALL_EK_ACCEL_SET still delete plot points of a "
+            "cleared set, spectra of every set sharing those plots are lost"
+        )
+        return True
+    print(
+        "Not relinking: accel_plot_dedup is off, and DB procedures that clear a set would "
+        "delete plots shared with other sets. Enable accel_plot_dedup or pass "
+        "--procedures-safe once the procedures keep shared plots"
+    )
+    return False
+
+
+def relink_batch(db, canonical: Dict[int, int], delete_duplicates: bool) -> int:
+    """Point sets at canonical plots for a batch of {duplicate: canonical}; return relinked references"""
+    relinked = 0
+    for column in ("X_PLOT_ID", "Y_PLOT_ID", "Z_PLOT_ID"):
+        result = db.execute(
+            text(f"UPDATE SRTN_ACCEL_SET SET {column} = :canonical WHERE {column} = :duplicate"),
+            [{"canonical": target, "duplicate": duplicate} for duplicate, target in canonical.items()]
+        )
+        relinked += result.rowcount or 0
+
+    if delete_duplicates:
+        params = {f"id{i}": plot_id for i, plot_id in enumerate(canonical)}
+        in_clause = ", ".join(f":{name}" for name in params)
+        tables = ["SRTN_ACCEL_POINT", "SRTN_ACCEL_PLOT_HASH", "SRTN_ACCEL_PLOT"]
+        if packed_plots_available(db):
+            tables.insert(1, "SRTN_ACCEL_PLOT_PACKED")
+        for table in tables:
+            db.execute(text(f"DELETE FROM {table} WHERE PLOT_ID IN ({in_clause})"), params)
+
+    return relinked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share identical acceleration plots between sets")
+    parser.add_argument("--batch-size", type=int, default=200, help="Plots per transaction (max 1000)")
+    parser.add_argument(
+        "--delete-duplicates",
+        action="store_true",
+        help="Delete duplicate plots and their points after relinking the sets"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only hash plots and report duplicates")
+    parser.add_argument(
+        "--procedures-safe",
+        action="store_true",
+        help="Relink even with accel_plot_dedup off (DB procedures must not delete shared plots)"
+    )
+    args = parser.parse_args()
+
+    batch_size = max(1, min(args.batch_size, ORACLE_IN_LIMIT))
+
+    DbSessionManager.initialize()
+    try:
+        with DbSessionContext() as db:
+            AccelPlotHash.__table__.create(bind=db.get_bind(), checkfirst=True)
+
+            plot_ids = get_unhashed_plot_ids(db)
+            print(f"Plots to hash: {len(plot_ids)}")
+            for start in range(0, len(plot_ids), batch_size):
+                try:
+                    hash_batch(db, plot_ids[start:start + batch_size])
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                print(f"Hashed {min(start + batch_size, len(plot_ids))}/{len(plot_ids)} plots")
+
+            groups = duplicate_groups(db)
+            canonical = {duplicate: target for target, duplicates in groups.items() for duplicate in duplicates}
+            print(f"Duplicate plots: {len(canonical)} in {len(groups)} group(s)")
+            if args.dry_run or not canonical or not relink_allowed(args.procedures_safe):
+                return
+
+            duplicates = list(canonical)
+            relinked = 0
+            for start in range(0, len(duplicates), batch_size):
+                batch = {duplicate: canonical[duplicate] for duplicate in duplicates[start:start + batch_size]}
+                try:
+                    relinked += relink_batch(db, batch, args.delete_duplicates)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                print(f"Relinked {min(start + batch_size, len(duplicates))}/{len(duplicates)} duplicate plots")
+
+            action = "deleted" if args.delete_duplicates else "kept"
+            print(f"Done: {relinked} set reference(s) relinked, {len(duplicates)} duplicate plot(s) {action}")
+    finally:
+        DbSessionManager.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Convert acceleration plots from SRTN_ACCEL_POINT rows into packed vectors (SRTN_ACCEL_PLOT_PACKED)
+
+Usage (from backend directory):
+    python -m scripts.migrate_packed_plots [--batch-size 200] [--delete-points] [--dry-run]
+"""
+import argparse
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+
+from core import DbSessionManager, DbSessionContext
+from models import AccelPlotPacked
+from repositories import AccelPlotPackedRepository
+from repositories.base import ORACLE_IN_LIMIT
+
+
+def get_unpacked_plot_ids(db) -> List[int]:
+    """Get IDs of plots that have point rows but no packed row yet"""
+    query = text("""
+        SELECT DISTINCT p.PLOT_ID
+        FROM SRTN_ACCEL_POINT p
+        WHERE p.PLOT_ID IS NOT NULL
+        AND NOT EXISTS (
+            SELECT 1 FROM SRTN_ACCEL_PLOT_PACKED k WHERE k.PLOT_ID = p.PLOT_ID
+        )
+        ORDER BY p.PLOT_ID
+    """)
+    return [row[0] for row in db.execute(query).fetchall()]
+
+
+def migrate_batch(db, packed_repo: AccelPlotPackedRepository, plot_ids: List[int], delete_points: bool) -> int:
+    """Pack points of the given plots, return number of converted points"""
+    params = {f"id{i}": plot_id for i, plot_id in enumerate(plot_ids)}
+    in_clause = ", ".join(f":{name}" for name in params)
+
+    rows = db.execute(text(f"""
+        SELECT PLOT_ID, FREQ, ACCEL
+        FROM SRTN_ACCEL_POINT
+        WHERE PLOT_ID IN ({in_clause})
+        AND FREQ IS NOT NULL AND ACCEL IS NOT NULL
+        ORDER BY PLOT_ID, FREQ
+    """), params).fetchall()
+
+    if rows:
+        points = np.array(rows, dtype=np.float64)
+        ids = points[:, 0].astype(np.int64)
+        # Rows are ordered by PLOT_ID, so each plot is a contiguous slice
+        boundaries = np.flatnonzero(np.diff(ids)) + 1
+        for chunk in np.split(points, boundaries):
+            packed_repo.save_arrays(db, int(chunk[0, 0]), chunk[:, 1], chunk[:, 2])
+
+    if delete_points:
+        db.execute(text(f"DELETE FROM SRTN_ACCEL_POINT WHERE PLOT_ID IN ({in_clause})"), params)
+
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert SRTN_ACCEL_POINT rows into packed plot vectors")
+    parser.add_argument("--batch-size", type=int, default=200, help="Plots per transaction (max 1000)")
+    parser.add_argument(
+        "--delete-points",
+        action="store_true",
+        help="Delete converted rows from SRTN_ACCEL_POINT (only when no DB procedure reads them)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many plots would be converted")
+    args = parser.parse_args()
+
+    batch_size = max(1, min(args.batch_size, ORACLE_IN_LIMIT))
+
+    DbSessionManager.initialize()
+    try:
+        with DbSessionContext() as db:
+            AccelPlotPacked.__table__.create(bind=db.get_bind(), checkfirst=True)
+
+            plot_ids = get_unpacked_plot_ids(db)
+            print(f"Plots to convert: {len(plot_ids)}")
+            if args.dry_run or not plot_ids:
+                return
+
+            packed_repo = AccelPlotPackedRepository()
+            total_points = 0
+            for start in range(0, len(plot_ids), batch_size):
+                batch = plot_ids[start:start + batch_size]
+                try:
+                    total_points += migrate_batch(db, packed_repo, batch, args.delete_points)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                print(f"Converted {min(start + batch_size, len(plot_ids))}/{len(plot_ids)} plots")
+
+            print(f"Done: {len(plot_ids)} plots, {total_points} points packed")
+    finally:
+        DbSessionManager.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Validate acceleration workbooks offline (dry run without a database)
+
+Usage (from backend directory):
+    python -m scripts.validate_accel_files PATH [PATH ...] [--set-type ВИМОГИ] [--workers 0] [--verbose]
+
+Every workbook is parsed and its sheets are checked exactly like a dry-run import
+(frequency detection, auto-fill, spectrum_validation); checks against stored sets
+need the database and are done by the dry_run flag of /api/import-accel-file.
+Exits with status 1 if any workbook has errors.
+"""
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+
+from services.acceleration import AccelerationService
+from utils.excel import parse_workbook
+
+
+def validate_file(path: str, set_type: str) -> Dict[str, Any]:
+    """Validation report for one workbook (errors while reading the file are reported too)"""
+    service = AccelerationService()
+    try:
+        with open(path, "rb") as f:
+            parsed = parse_workbook(f.read())
+        sheets = service.workbook_sheets(parsed, None, set_type)
+        report = service.validate_accel_data(
+            None, plant_id=0, unit_id=0, building="", room=None, calc_type="", set_type=set_type, sheets=sheets
+        )
+    except Exception as e:
+        report = {"valid": False, "error_count": 1, "warning_count": 0, "sheets": {}, "errors": [str(e)]}
+    report["path"] = path
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate acceleration workbooks without importing them")
+    parser.add_argument("paths", nargs="+", help="Workbook files or glob patterns")
+    parser.add_argument("--set-type", default="ВИМОГИ", choices=("ВИМОГИ", "ХАРАКТЕРИСТИКИ"))
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = CPU count, 1 = in-process)")
+    parser.add_argument("--verbose", action="store_true", help="Print warnings as well as errors")
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.paths for path in (glob.glob(pattern) or [pattern])})
+    workers = min(args.workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        reports = [validate_file(path, args.set_type) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(validate_file, paths, [args.set_type] * len(paths)))
+
+    invalid = 0
+    for report in reports:
+        status = "OK" if report["valid"] else "FAILED"
+        print(f"{status:<7}{report['path']}: {report['error_count']} error(s), {report['warning_count']} warning(s)")
+        for message in report.get("errors", []):
+            print(f"    error: {message}")
+        for sheet_name, sheet in report["sheets"].items():
+            for message in sheet["errors"]:
+                print(f"    [{sheet_name}] error: {message}")
+            if args.verbose:
+                for message in sheet["warnings"]:
+                    print(f"    [{sheet_name}] warning: {message}")
+        invalid += not report["valid"]
+
+    print(f"Checked {len(reports)} workbook(s), {invalid} with errors")
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ from .search import SearchService
 from .acceleration import AccelerationService
 from .seismic_analysis import SeismicAnalysisService
 from .load_analysis import LoadAnalysisService
+from .recalculation import RecalculationService, RecalculationBusy, shutdown_recalculation_pool
+from .accel_import import AccelImportService, shutdown_import_jobs
 
 __all__ = [
     "PlantService",
@@ -17,5 +19,10 @@ __all__ = [
     "AccelerationService",
     "SeismicAnalysisService",
     "LoadAnalysisService",
+    "RecalculationService",
+    "RecalculationBusy",
+    "shutdown_recalculation_pool",
+    "AccelImportService",
+    "shutdown_import_jobs",
 ]
 
@@ -0,0 +1,137 @@
+"""
+Accel import service - фоновый импорт спектров из книг Excel с прогрессом
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core import DbSessionContext, settings
+from schemas.acceleration import AccelDataItem
+from utils import Job, job_registry, upload_cache
+from utils.parse_pool import parse_pool
+from .acceleration import AccelerationService
+
+# Location / set fields recorded in the job params (save_accel_data keyword arguments)
+JOB_PARAM_FIELDS = ("plant_id", "unit_id", "building", "room", "lev1", "lev2", "calc_type", "set_type", "ek_id")
+
+# Bounded pool: at most settings.import_job_workers imports hold a DB session at a time
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.import_job_workers), thread_name_prefix="accel-import"
+            )
+        return _executor
+
+
+def shutdown_import_jobs():
+    """
+    Stop the import pool before the DB engine is disposed
+
+    Queued jobs are cancelled and marked failed; running ones are waited for,
+    so none of them holds a session past DbSessionManager.dispose().
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AccelImportService:
+    """Background acceleration imports wrapping AccelerationService.save_accel_data"""
+
+    JOB_KIND = "accel_import"
+
+    def __init__(self):
+        self.acceleration_service = AccelerationService()
+
+    def start_job(
+        self,
+        location: Dict[str, Any],
+        content: Optional[bytes] = None,
+        parsed: Optional[Dict[str, Dict[str, Any]]] = None,
+        sheet_names: Optional[List[str]] = None,
+        sheets: Optional[Dict[str, AccelDataItem]] = None
+    ) -> Job:
+        """
+        Register an import job and queue it on the import pool
+
+        The source is raw workbook content (parsed inside the job), an already parsed
+        workbook, or ready save_accel_data sheets. `location` holds the remaining
+        save_accel_data keyword arguments.
+        """
+        job = job_registry.create(self.JOB_KIND, {field: location.get(field) for field in JOB_PARAM_FIELDS})
+        job.set_message("Queued")
+        future = _get_executor().submit(self._run, job, location, content, parsed, sheet_names, sheets)
+
+        def on_done(done: Future):
+            if done.cancelled():
+                job.fail("Import cancelled: the server is shutting down")
+
+        future.add_done_callback(on_done)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get import job by ID"""
+        job = job_registry.get(job_id)
+        return job if job is not None and job.kind == self.JOB_KIND else None
+
+    def _run(self, job: Job, location, content, parsed, sheet_names, sheets):
+        try:
+            with DbSessionContext() as db:
+                self.run_import(db, job, location, content, parsed, sheet_names, sheets)
+        except Exception as e:
+            print(f"Error in import job {job.id}: {e}")
+            job.fail(str(e))
+
+    def run_import(
+        self,
+        db: Session,
+        job: Job,
+        location: Dict[str, Any],
+        content: Optional[bytes] = None,
+        parsed: Optional[Dict[str, Dict[str, Any]]] = None,
+        sheet_names: Optional[List[str]] = None,
+        sheets: Optional[Dict[str, AccelDataItem]] = None
+    ):
+        """
+        Parse (if needed) and save all sheets in one transaction
+
+        Progress is reported per saved sheet; counters are sheets_parsed,
+        plots_created, plots_reused (settings.accel_plot_dedup) and points_inserted.
+        Nothing is committed if any sheet fails.
+        """
+        if sheets is None:
+            if parsed is None:
+                job.start(message="Parsing workbook")
+                _, parsed = upload_cache.get_or_parse(content, parse_pool.parse_blocking)
+            sheets = self.acceleration_service.workbook_sheets(parsed, sheet_names, location.get("set_type"))
+
+        job.start(total=len(sheets), message=f"Saving {len(sheets)} sheet(s)")
+        job.advance(sheets_parsed=len(sheets))
+
+        def progress(sheet_name: str, stats: Dict[str, int]):
+            job.advance(1, **stats)
+            job.set_message(f"Saved sheet {sheet_name}")
+
+        try:
+            result = self.acceleration_service.save_accel_data(db, sheets=sheets, progress=progress, **location)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        result["sheets"] = list(sheets)
+        job.finish(
+            f"Imported {len(sheets)} sheet(s): {result['plots_created']} plot(s), "
+            f"{result['points_inserted']} point(s)",
+            result
+        )
@@ -1,13 +1,36 @@
 """
 Acceleration service - бизнес-логика для работы с акселерограммами
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import text, Integer
 import oracledb
 
-from repositories import AccelSetRepository, AccelPlotRepository, AccelPointRepository, SeismicRepository
+from core.config import settings
+from repositories import (
+    AccelSetRepository,
+    AccelPlotRepository,
+    AccelPointRepository,
+    AccelPlotPackedRepository,
+    AccelPlotHashRepository,
+    SeismicRepository,
+)
 from repositories.plant import PlantRepository
+from repositories.base import room_condition
+from schemas.acceleration import AccelBatchLocation, AccelDataItem
+from utils.excel import is_frequency_column, is_percentage_sheet, sheet_dempf
+from utils.helpers import plot_content_hash
+from utils.plot_cache import plot_cache
+from utils.spectrum_memo import requirement_spectrum_memo
+from .damping_interpolation import (
+    available_dempfs,
+    bracket_damping,
+    damping_weight,
+    interpolate_damping_spectra,
+    interpolate_pga,
+)
+from .spectrum_validation import range_warnings, validate_spectrum_sheet
 
 
 class AccelerationService:
@@ -17,6 +40,8 @@ class AccelerationService:
         self.accel_set_repo = AccelSetRepository()
         self.accel_plot_repo = AccelPlotRepository()
         self.accel_point_repo = AccelPointRepository()
+        self.accel_plot_packed_repo = AccelPlotPackedRepository()
+        self.accel_plot_hash_repo = AccelPlotHashRepository()
         self.seismic_repo = SeismicRepository()
         self.plant_repo = PlantRepository()
     
@@ -52,52 +77,76 @@ class AccelerationService:
             print(f"Error getting damping factors: {e}")
             return []
     
+    def get_plot_arrays(self, db: Session, plot_id: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get (FREQ, ACCEL) arrays for a plot sorted by frequency
+
+        Served from the plot cache when possible. Packed plots are read with a
+        single row fetch; plots that were not converted yet fall back to
+        SRTN_ACCEL_POINT.
+        """
+        if not plot_id:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+
+        cached = plot_cache.get(plot_id)
+        if cached is not None:
+            return cached
+
+        arrays = self.accel_plot_packed_repo.get_arrays(db, plot_id)
+        if arrays is None:
+            arrays = self.accel_point_repo.get_arrays_by_plot_id(db, plot_id)
+        plot_cache.put(plot_id, *arrays)
+        return arrays
+
+    def get_plot_arrays_many(
+        self,
+        db: Session,
+        plot_ids: Iterable[int]
+    ) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Get (FREQ, ACCEL) arrays for several plots: cache first, then packed rows, then point rows"""
+        plot_ids = {plot_id for plot_id in plot_ids if plot_id}
+        result = plot_cache.get_many(plot_ids)
+
+        fetched = self.accel_plot_packed_repo.get_arrays_many(db, plot_ids - result.keys())
+        fetched.update(self.accel_point_repo.get_arrays_many(db, plot_ids - result.keys() - fetched.keys()))
+        for plot_id, arrays in fetched.items():
+            plot_cache.put(plot_id, *arrays)
+
+        result.update(fetched)
+        return result
+
     def get_spectral_data(
         self,
         db: Session,
         ek_id: int,
         spectrum_type: str
     ) -> Dict[str, Any]:
-        """Get spectral characteristics data"""
+        """Get spectral characteristics data (element, set and all axes in one query)"""
         try:
-            # Get element data
-            ek_data = self.seismic_repo.get_by_ek_id(db, ek_id)
-            if not ek_data:
-                return {"frequency": []}
-
-            # Get acceleration set ID
-            accel_set_id = None
-            if spectrum_type == 'МРЗ':
-                accel_set_id = ek_data.ACCEL_SET_ID_MRZ
-            elif spectrum_type == 'ПЗ':
-                accel_set_id = ek_data.ACCEL_SET_ID_PZ
-
-            if not accel_set_id:
-                return {"frequency": []}
-
-            # Get acceleration set
-            accel_set = self.accel_set_repo.get_by_id(db, accel_set_id)
-            if not accel_set:
+            set_data = self.accel_set_repo.get_element_spectra(db, ek_id, spectrum_type).get(spectrum_type)
+            if not set_data:
                 return {"frequency": []}
 
             # Check if this is characteristics or requirements
-            is_characteristics = accel_set.SET_TYPE == "ХАРАКТЕРИСТИКИ"
+            is_characteristics = set_data["SET_TYPE"] == "ХАРАКТЕРИСТИКИ"
+            plots = set_data["plots"]
+            for axis, plot_id in set_data["plot_ids"].items():
+                if axis in plots:
+                    plot_cache.put(plot_id, *plots[axis])
 
             prefix = 'mrz' if spectrum_type == 'МРЗ' else 'pz'
 
             if is_characteristics:
                 # For characteristics: return ALL points from the plot
-                def get_all_plot_points(plot_id: int) -> Tuple[List[float], List[float]]:
-                    if not plot_id:
+                def get_all_plot_points(axis: str) -> Tuple[List[float], List[float]]:
+                    if axis not in plots:
                         return [], []
-                    points = self.accel_point_repo.get_by_plot_id(db, plot_id)
-                    frequencies = [float(p.FREQ) for p in points]
-                    accelerations = [float(p.ACCEL) for p in points]
-                    return frequencies, accelerations
+                    frequencies, accelerations = plots[axis]
+                    return frequencies.tolist(), accelerations.tolist()
 
-                x_freq, x_accel = get_all_plot_points(accel_set.X_PLOT_ID)
-                y_freq, y_accel = get_all_plot_points(accel_set.Y_PLOT_ID)
-                z_freq, z_accel = get_all_plot_points(accel_set.Z_PLOT_ID)
+                x_freq, x_accel = get_all_plot_points("X")
+                y_freq, y_accel = get_all_plot_points("Y")
+                z_freq, z_accel = get_all_plot_points("Z")
 
                 # Use the longest frequency array as base
                 base_freq = max([x_freq, y_freq, z_freq], key=len) if any([x_freq, y_freq, z_freq]) else []
@@ -110,28 +159,22 @@ class AccelerationService:
                 }
             else:
                 # For requirements: return single point at natural frequency
-                natural_frequency = ek_data.F_MU
+                natural_frequency = set_data["F_MU"]
                 if not natural_frequency:
                     return {"frequency": []}
 
-                def get_spectral_value(plot_id: int, freq: float) -> Optional[float]:
-                    if not plot_id:
+                def get_spectral_value(axis: str) -> Optional[List[Optional[float]]]:
+                    if axis not in plots:
                         return None
-                    point_query = text("""
-                        SELECT ACCEL FROM SRTN_ACCEL_POINT
-                        WHERE PLOT_ID = :plot_id AND FREQ = :freq
-                    """)
-                    result = db.execute(point_query, {"plot_id": plot_id, "freq": freq})
-                    row = result.fetchone()
-                    return float(row[0]) if row else None
-
-                frequency = [natural_frequency]
+                    frequencies, accelerations = plots[axis]
+                    matches = np.flatnonzero(frequencies == natural_frequency)
+                    return [float(accelerations[matches[0]]) if matches.size else None]
 
                 return {
-                    "frequency": frequency,
-                    f"{prefix}_x": [get_spectral_value(accel_set.X_PLOT_ID, natural_frequency)] if accel_set.X_PLOT_ID else None,
-                    f"{prefix}_y": [get_spectral_value(accel_set.Y_PLOT_ID, natural_frequency)] if accel_set.Y_PLOT_ID else None,
-                    f"{prefix}_z": [get_spectral_value(accel_set.Z_PLOT_ID, natural_frequency)] if accel_set.Z_PLOT_ID else None,
+                    "frequency": [natural_frequency],
+                    f"{prefix}_x": get_spectral_value("X"),
+                    f"{prefix}_y": get_spectral_value("Y"),
+                    f"{prefix}_z": get_spectral_value("Z"),
                 }
         except Exception as e:
             print(f"Error getting spectral data: {e}")
@@ -143,9 +186,16 @@ class AccelerationService:
         ek_id: int,
         dempf: float,
         spectr_earthq_type: str,
-        calc_type: str
+        calc_type: str,
+        interpolate: bool = False,
+        method: str = "log"
     ) -> Dict[str, Any]:
-        """Get seismic requirements for element"""
+        """
+        Get seismic requirements for element
+
+        With `interpolate`, a DEMPF without a stored set is interpolated between
+        the bracketing sets (see get_interpolated_requirements).
+        """
         try:
             # Get element data
             ek_data = self.seismic_repo.get_by_ek_id(db, ek_id)
@@ -153,13 +203,13 @@ class AccelerationService:
                 return {"frequency": []}
             
             # Find acceleration set
-            query = text("""
+            query = text(f"""
                 SELECT ACCEL_SET_ID, X_PLOT_ID, Y_PLOT_ID, Z_PLOT_ID, PGA_
                 FROM SRTN_ACCEL_SET
                 WHERE PLANT_ID = :plant_id
                 AND UNIT_ID = :unit_id  
                 AND BUILDING = :building
-                AND ((:room IS NULL AND ROOM IS NULL) OR ROOM = :room)
+                AND {room_condition(ek_data.ROOM)}
                 AND DEMPF = :dempf
                 AND SPECTR_EARTHQ_TYPE = :spectr_earthq_type
                 AND CALC_TYPE = :calc_type
@@ -179,18 +229,18 @@ class AccelerationService:
             set_data = result.fetchone()
             
             if not set_data:
+                if interpolate:
+                    return self.get_interpolated_requirements(
+                        db, ek_data, dempf, spectr_earthq_type, calc_type, method
+                    )
                 return {"frequency": []}
             
             set_id, x_plot_id, y_plot_id, z_plot_id, pga = set_data
             
             # Get plot data
             def get_plot_data(plot_id: int) -> Tuple[List[float], List[float]]:
-                if not plot_id:
-                    return [], []
-                points = self.accel_point_repo.get_by_plot_id(db, plot_id)
-                frequencies = [float(p.FREQ) for p in points]
-                accelerations = [float(p.ACCEL) for p in points]
-                return frequencies, accelerations
+                frequencies, accelerations = self.get_plot_arrays(db, plot_id)
+                return frequencies.tolist(), accelerations.tolist()
             
             x_freq, x_accel = get_plot_data(x_plot_id)
             y_freq, y_accel = get_plot_data(y_plot_id)
@@ -210,6 +260,188 @@ class AccelerationService:
             print(f"Error getting seism requirements: {e}")
             return {"frequency": []}
     
+    def get_interpolated_requirements(
+        self,
+        db: Session,
+        ek_data,
+        dempf: float,
+        spectr_earthq_type: str,
+        calc_type: str,
+        method: str = "log"
+    ) -> Dict[str, Any]:
+        """
+        Requirement spectrum at an arbitrary DEMPF from the bracketing ВИМОГИ sets of the element location
+
+        Results are memoized per (location, calc_type, type, dempf, method, source plots) and
+        dropped when any source plot is invalidated. Outside the stored DEMPF range only
+        the available values are returned.
+        """
+        accel_sets = self.accel_set_repo.find_location_requirement_sets(
+            db, ek_data.PLANT_ID, ek_data.UNIT_ID, ek_data.BUILDING, ek_data.ROOM,
+            spectr_earthq_type, calc_type
+        )
+        # Sets without DEMPF cannot bracket anything
+        dempfs = available_dempfs([accel_set.DEMPF for accel_set in accel_sets])
+        by_dempf = {}
+        for accel_set in accel_sets:
+            if accel_set.DEMPF is not None:
+                by_dempf.setdefault(float(accel_set.DEMPF), accel_set)
+        
+        bounds = bracket_damping(dempfs, dempf)
+        if bounds is None:
+            return {"frequency": [], "available_dempfs": dempfs}
+        
+        lower, upper = by_dempf[bounds[0]], by_dempf[bounds[1]]
+        source_plot_ids = (
+            lower.X_PLOT_ID, lower.Y_PLOT_ID, lower.Z_PLOT_ID,
+            upper.X_PLOT_ID, upper.Y_PLOT_ID, upper.Z_PLOT_ID,
+        )
+        key = (
+            ek_data.PLANT_ID, ek_data.UNIT_ID, ek_data.BUILDING, ek_data.ROOM,
+            calc_type, spectr_earthq_type, float(dempf), method, source_plot_ids,
+        )
+        cached = requirement_spectrum_memo.get(key)
+        if cached is not None:
+            return cached
+        
+        plots = self.get_plot_arrays_many(db, source_plot_ids)
+        
+        def axis_plots(accel_set) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+            plot_ids = {"x": accel_set.X_PLOT_ID, "y": accel_set.Y_PLOT_ID, "z": accel_set.Z_PLOT_ID}
+            return {axis: plots[plot_id] for axis, plot_id in plot_ids.items() if plot_id in plots}
+        
+        weight = damping_weight(dempf, bounds[0], bounds[1], method)
+        grid, accelerations = interpolate_damping_spectra(axis_plots(lower), axis_plots(upper), weight)
+        prefix = 'mrz' if spectr_earthq_type == 'МРЗ' else 'pz'
+        
+        result = {
+            "frequency": grid.tolist(),
+            **{
+                f"{prefix}_{axis}": values.tolist() if values is not None else None
+                for axis, values in accelerations.items()
+            },
+            "pga": interpolate_pga(
+                float(lower.PGA_) if lower.PGA_ else None,
+                float(upper.PGA_) if upper.PGA_ else None,
+                weight
+            ),
+            "interpolated": bounds[0] != bounds[1],
+            "dempf_bounds": list(bounds),
+            "method": method,
+        }
+        requirement_spectrum_memo.put(key, result, source_plot_ids)
+        return result
+    
+    def get_spectral_data_batch(
+        self,
+        db: Session,
+        ek_ids: List[int],
+        spectrum_types: List[str],
+        calc_type: Optional[str] = None,
+        dempf: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Get spectral sets (and requirement sets when dempf and calc_type are given) for many elements
+
+        Plots are returned once in `plots` and referenced by ID from every element that uses them.
+        """
+        result_elements, plot_ids, missing_ek_ids = self.resolve_spectral_sets(
+            db, ek_ids, spectrum_types, calc_type, dempf
+        )
+        plots = {
+            plot_id: {"frequency": freq.tolist(), "accel": accel.tolist()}
+            for plot_id, (freq, accel) in self.get_plot_arrays_many(db, plot_ids).items()
+        }
+
+        return {"elements": result_elements, "plots": plots, "missing_ek_ids": missing_ek_ids}
+
+    def resolve_spectral_sets(
+        self,
+        db: Session,
+        ek_ids: List[int],
+        spectrum_types: List[str],
+        calc_type: Optional[str] = None,
+        dempf: Optional[float] = None
+    ) -> Tuple[Dict[int, Dict[str, Any]], set, List[int]]:
+        """
+        Resolve assigned and requirement sets for many elements with set-based IN queries
+
+        Returns (elements, plot_ids, missing_ek_ids) where elements maps EK_ID to
+        {natural_frequency, first_natural_frequencies, spectral_sets, requirement_sets}.
+        """
+        elements = {e.EK_ID: e for e in self.seismic_repo.get_by_ek_ids(db, ek_ids)}
+
+        # Sets assigned to elements (ACCEL_SET_ID_MRZ / ACCEL_SET_ID_PZ)
+        set_columns = {"МРЗ": "ACCEL_SET_ID_MRZ", "ПЗ": "ACCEL_SET_ID_PZ"}
+        assigned_ids = {
+            getattr(e, set_columns[st])
+            for e in elements.values()
+            for st in spectrum_types
+            if st in set_columns
+        }
+        sets_by_id = {s.ACCEL_SET_ID: s for s in self.accel_set_repo.get_by_ids(db, assigned_ids)}
+
+        # Requirement sets by element location; the lowest ACCEL_SET_ID wins like ROWNUM = 1 did
+        requirement_sets = {}
+        if dempf is not None and calc_type:
+            buildings = {(e.PLANT_ID, e.UNIT_ID, e.BUILDING) for e in elements.values() if e.BUILDING is not None}
+            for accel_set in self.accel_set_repo.find_requirement_sets(
+                db, buildings, dempf, spectrum_types, calc_type
+            ):
+                key = (accel_set.PLANT_ID, accel_set.UNIT_ID, accel_set.BUILDING,
+                       accel_set.ROOM, accel_set.SPECTR_EARTHQ_TYPE)
+                requirement_sets.setdefault(key, accel_set)
+
+        def set_ref(accel_set) -> Dict[str, Any]:
+            return {
+                "set_id": accel_set.ACCEL_SET_ID,
+                "set_type": accel_set.SET_TYPE,
+                "dempf": accel_set.DEMPF,
+                "pga": float(accel_set.PGA_) if accel_set.PGA_ else None,
+                "x_plot_id": accel_set.X_PLOT_ID,
+                "y_plot_id": accel_set.Y_PLOT_ID,
+                "z_plot_id": accel_set.Z_PLOT_ID,
+            }
+
+        result_elements = {}
+        missing_ek_ids = []
+        plot_ids = set()
+        for ek_id in dict.fromkeys(ek_ids):
+            ek_data = elements.get(ek_id)
+            if ek_data is None:
+                missing_ek_ids.append(ek_id)
+                continue
+
+            item = {
+                "natural_frequency": ek_data.F_MU,
+                "first_natural_frequencies": {
+                    "x": ek_data.FIRST_NAT_FREQ_X,
+                    "y": ek_data.FIRST_NAT_FREQ_Y,
+                    "z": ek_data.FIRST_NAT_FREQ_Z,
+                },
+                "spectral_sets": {},
+                "requirement_sets": {},
+            }
+            for spectrum_type in spectrum_types:
+                set_column = set_columns.get(spectrum_type)
+                accel_set = sets_by_id.get(getattr(ek_data, set_column)) if set_column else None
+                if accel_set:
+                    item["spectral_sets"][spectrum_type] = set_ref(accel_set)
+
+                req_set = requirement_sets.get(
+                    (ek_data.PLANT_ID, ek_data.UNIT_ID, ek_data.BUILDING, ek_data.ROOM, spectrum_type)
+                )
+                if req_set:
+                    item["requirement_sets"][spectrum_type] = set_ref(req_set)
+
+                for ref in (accel_set, req_set):
+                    if ref:
+                        plot_ids.update((ref.X_PLOT_ID, ref.Y_PLOT_ID, ref.Z_PLOT_ID))
+
+            result_elements[ek_id] = item
+
+        return result_elements, plot_ids, missing_ek_ids
+
     def find_req_accel_set(
         self,
         db: Session,
@@ -222,13 +454,13 @@ class AccelerationService:
     ) -> Dict[str, Any]:
         """Find required acceleration set"""
         try:
-            query = text("""
+            query = text(f"""
                 SELECT ACCEL_SET_ID 
                 FROM SRTN_ACCEL_SET
                 WHERE PLANT_ID = :plant_id
                 AND UNIT_ID = :unit_id
                 AND BUILDING = :building
-                AND ((:room IS NULL AND ROOM IS NULL) OR ROOM = :room)
+                AND {room_condition(room)}
                 AND CALC_TYPE = :calc_type
                 AND SET_TYPE = :set_type
                 AND ROWNUM = 1
@@ -271,6 +503,8 @@ class AccelerationService:
     def clear_accel_set(self, db: Session, set_id: int) -> str:
         """Clear acceleration set arrays"""
         try:
+            accel_set = self.accel_set_repo.get_by_id(db, set_id)
+
             update_query = text("""
                 UPDATE SRTN_ACCEL_SET
                 SET X_PLOT_ID = NULL, Y_PLOT_ID = NULL, Z_PLOT_ID = NULL
@@ -278,6 +512,8 @@ class AccelerationService:
             """)
 
             db.execute(update_query, {"set_id": set_id})
+            if accel_set:
+                plot_cache.invalidate([accel_set.X_PLOT_ID, accel_set.Y_PLOT_ID, accel_set.Z_PLOT_ID])
             return "success"
         except Exception as e:
             print(f"Error clearing acceleration set: {e}")
@@ -298,7 +534,8 @@ class AccelerationService:
         set_type: str,
         sheets: Dict[str, Dict],
         ek_id: Optional[int],
-        can_overwrite: int
+        can_overwrite: int,
+        progress: Optional[Callable[[str, Dict[str, int]], None]] = None
     ) -> Dict[str, Any]:
         """
         Save acceleration data from Excel import
@@ -318,9 +555,10 @@ class AccelerationService:
             sheets: Dictionary of sheet data
             ek_id: Element ID (optional, required only for ХАРАКТЕРИСТИКИ)
             can_overwrite: Allow overwriting existing sets
+            progress: Called after every sheet with (sheet_name, {"plots_created", "plots_reused", "points_inserted"})
 
         Returns:
-            Dictionary with created set IDs
+            Dictionary with created set IDs and plot/point counts
         """
         try:
             # Get plant and unit names
@@ -345,7 +583,10 @@ class AccelerationService:
             mrz_set_id = None
             pz_set_id = None
 
+            totals = {"plots_created": 0, "plots_reused": 0, "points_inserted": 0}
+
             for sheet_name, sheet_info in sheets.items():
+                stats = {"plots_created": 0, "plots_reused": 0, "points_inserted": 0}
                 dempf = sheet_info.dempf  # For ВИМОГИ
                 data = sheet_info.data
 
@@ -358,8 +599,7 @@ class AccelerationService:
 
                     # Search for frequency column (case-insensitive, with various formats)
                     for key in data.keys():
-                        key_lower = key.lower().replace(' ', '').replace(',', '').replace('.', '')
-                        if any(x in key_lower for x in ['частота', 'frequency', 'freq', 'hz', 'гц']):
+                        if is_frequency_column(key):
                             frequency_data = data[key]
                             frequency_col_name = key
                             break
@@ -404,7 +644,8 @@ class AccelerationService:
                         frequency_data=frequency_data,
                         x_data=filled_data.get("МРЗ_X", []),
                         y_data=filled_data.get("МРЗ_Y", []),
-                        z_data=filled_data.get("МРЗ_Z", [])
+                        z_data=filled_data.get("МРЗ_Z", []),
+                        stats=stats
                     )
 
                     # Create ПЗ set
@@ -427,7 +668,8 @@ class AccelerationService:
                         frequency_data=frequency_data,
                         x_data=filled_data.get("ПЗ_X", []),
                         y_data=filled_data.get("ПЗ_Y", []),
-                        z_data=filled_data.get("ПЗ_Z", [])
+                        z_data=filled_data.get("ПЗ_Z", []),
+                        stats=stats
                     )
                 elif set_type == "ВИМОГИ":
                     # For requirements, we create two sets: МРЗ and ПЗ with DEMPF
@@ -437,8 +679,7 @@ class AccelerationService:
 
                     # Search for frequency column (case-insensitive, with various formats)
                     for key in data.keys():
-                        key_lower = key.lower().replace(' ', '').replace(',', '').replace('.', '')
-                        if any(x in key_lower for x in ['частота', 'frequency', 'freq', 'hz', 'гц']):
+                        if is_frequency_column(key):
                             frequency_data = data[key]
                             frequency_col_name = key
                             break
@@ -483,7 +724,8 @@ class AccelerationService:
                         frequency_data=frequency_data,
                         x_data=filled_data.get("МРЗ_X", []),
                         y_data=filled_data.get("МРЗ_Y", []),
-                        z_data=filled_data.get("МРЗ_Z", [])
+                        z_data=filled_data.get("МРЗ_Z", []),
+                        stats=stats
                     )
 
                     # Create ПЗ set with DEMPF
@@ -506,23 +748,265 @@ class AccelerationService:
                         frequency_data=frequency_data,
                         x_data=filled_data.get("ПЗ_X", []),
                         y_data=filled_data.get("ПЗ_Y", []),
-                        z_data=filled_data.get("ПЗ_Z", [])
+                        z_data=filled_data.get("ПЗ_Z", []),
+                        stats=stats
                     )
                 else:
                     raise ValueError(f"Unknown set_type: {set_type}. Expected 'ВИМОГИ' or 'ХАРАКТЕРИСТИКИ'")
 
+                for name, value in stats.items():
+                    totals[name] += value
+                if progress is not None:
+                    progress(sheet_name, stats)
+
             db.flush()
 
             return {
                 "mrz_set_id": mrz_set_id,
                 "pz_set_id": pz_set_id,
-                "message": "Data saved successfully"
+                "message": "Data saved successfully",
+                **totals
             }
 
         except Exception as e:
             print(f"Error saving acceleration data: {e}")
             raise
 
+    def import_accel_workbook(
+        self,
+        db: Session,
+        parsed: Dict[str, Dict[str, Any]],
+        sheet_names: Optional[List[str]],
+        dry_run: bool = False,
+        **location
+    ) -> Dict[str, Any]:
+        """
+        Save acceleration data straight from a parsed workbook (utils.excel.parse_workbook)
+
+        Sheets are picked by workbook_sheets; remaining keyword arguments are passed
+        to save_accel_data, so frequency detection, auto-fill and the insert path stay the same.
+        With dry_run the sheets are only validated (validate_accel_data).
+        """
+        sheets = self.workbook_sheets(parsed, sheet_names, location.get("set_type"))
+        if dry_run:
+            report = self.validate_accel_data(db, sheets=sheets, **location)
+            report["sheet_names"] = list(sheets)
+            return report
+        result = self.save_accel_data(db, sheets=sheets, **location)
+        result["sheets"] = list(sheets)
+        return result
+
+    def validate_accel_data(
+        self,
+        db: Optional[Session],
+        plant_id: int,
+        unit_id: int,
+        building: str,
+        room: Optional[str],
+        calc_type: str,
+        set_type: str,
+        sheets: Dict[str, AccelDataItem],
+        **_
+    ) -> Dict[str, Any]:
+        """
+        Dry run of save_accel_data: validate all sheets and report, without writing
+
+        Every sheet goes through the same frequency detection and auto-fill as the
+        import and is checked with spectrum_validation. For ВИМОГИ the stored sets
+        of the location are read to flag existing DEMPF values and frequency ranges
+        the new spectra do not cover (skipped without a session).
+        """
+        existing = {}
+        if set_type == "ВИМОГИ" and db is not None:
+            for spectr_earthq_type in ("МРЗ", "ПЗ"):
+                accel_sets = self.accel_set_repo.find_location_requirement_sets(
+                    db, plant_id, unit_id, building, room, spectr_earthq_type, calc_type
+                )
+                plots = self.get_plot_arrays_many(
+                    db, [plot_id for s in accel_sets for plot_id in (s.X_PLOT_ID, s.Y_PLOT_ID, s.Z_PLOT_ID)]
+                )
+                frequencies = [freq for freq, _ in plots.values() if freq.size]
+                existing[spectr_earthq_type] = {
+                    "dempfs": sorted({float(s.DEMPF) for s in accel_sets}),
+                    "frequency_range": [
+                        float(min(freq[0] for freq in frequencies)),
+                        float(max(freq[-1] for freq in frequencies)),
+                    ] if frequencies else None,
+                }
+
+        report_sheets = {}
+        for sheet_name, sheet_info in sheets.items():
+            data = sheet_info.data
+            frequency_key = next((key for key in data if is_frequency_column(key)), None)
+            filled_data = self._auto_fill_spectrum_data(data)
+
+            report = validate_spectrum_sheet(data[frequency_key] if frequency_key else None, filled_data)
+            report["dempf"] = sheet_info.dempf
+            report["frequency_column"] = frequency_key
+            if not filled_data:
+                report["errors"].append(
+                    f"No МРЗ or ПЗ spectrum columns found. Available columns: {', '.join(data.keys())}"
+                )
+            for spectr_earthq_type, stored in existing.items():
+                if sheet_info.dempf is not None and float(sheet_info.dempf) in stored["dempfs"]:
+                    report["warnings"].append(
+                        f"{spectr_earthq_type}: DEMPF {sheet_info.dempf:g}% already stored for this location"
+                    )
+                report["warnings"].extend(
+                    range_warnings(report["frequency_range"], stored["frequency_range"], spectr_earthq_type)
+                )
+            report_sheets[sheet_name] = report
+
+        error_count = sum(len(report["errors"]) for report in report_sheets.values())
+        return {
+            "dry_run": True,
+            "valid": error_count == 0,
+            "error_count": error_count,
+            "warning_count": sum(len(report["warnings"]) for report in report_sheets.values()),
+            "sheets": report_sheets,
+            "existing": existing,
+        }
+
+    def workbook_sheets(
+        self,
+        parsed: Dict[str, Dict[str, Any]],
+        sheet_names: Optional[List[str]],
+        set_type: Optional[str]
+    ) -> Dict[str, AccelDataItem]:
+        """
+        Build save_accel_data sheets from a parsed workbook
+
+        ВИМОГИ imports every percentage sheet (DEMPF from the sheet name) unless
+        sheet_names narrows the selection; ХАРАКТЕРИСТИКИ uses the first selected
+        sheet with data.
+        """
+        if sheet_names:
+            missing = [name for name in sheet_names if name not in parsed]
+            if missing:
+                raise ValueError(f"Sheets not found in Excel file: {', '.join(missing)}")
+            selected = list(sheet_names)
+        elif set_type == "ВИМОГИ":
+            selected = [name for name in parsed if is_percentage_sheet(name)]
+        else:
+            selected = [name for name, sheet in parsed.items() if sheet["data"]][:1]
+
+        if not selected:
+            raise ValueError("No sheets to import in Excel file")
+        if set_type == "ХАРАКТЕРИСТИКИ":
+            selected = selected[:1]
+
+        sheets = {}
+        for sheet_name in selected:
+            sheet = parsed[sheet_name]
+            if sheet["error"]:
+                raise ValueError(f"Sheet '{sheet_name}': {sheet['error']}")
+
+            dempf = None
+            if set_type == "ВИМОГИ":
+                if not is_percentage_sheet(sheet_name):
+                    raise ValueError(f"Sheet '{sheet_name}' is not a damping sheet (e.g. '4%')")
+                dempf = sheet_dempf(sheet_name)
+
+            # Parsed columns are already plain lists of floats/str: skip re-validation
+            sheets[sheet_name] = AccelDataItem.model_construct(dempf=dempf, data=sheet["data"])
+        return sheets
+
+    def import_accel_batch(
+        self,
+        db: Session,
+        parsed: Dict[str, Dict[str, Any]],
+        plant_id: int,
+        unit_id: int,
+        calc_type: str,
+        set_type: str,
+        locations: List[AccelBatchLocation],
+        skip_existing: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Save several locations from one parsed workbook (caller commits once)
+
+        Locations are grouped by (BUILDING, ROOM) and find_req_accel_set runs once
+        per group. Each location takes its own sheets and, with a column block, only
+        the mapped columns plus the sheet's frequency column.
+        """
+        groups: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        for index, location in enumerate(locations):
+            groups.setdefault((location.building, location.room), []).append(index)
+
+        results: List[Dict[str, Any]] = [{} for _ in locations]
+        totals = {"sets_created": 0, "plots_created": 0, "plots_reused": 0, "points_inserted": 0}
+
+        for (building, room), indexes in groups.items():
+            existing = self.find_req_accel_set(db, plant_id, unit_id, building, room, calc_type, set_type)
+
+            for index in indexes:
+                location = locations[index]
+                entry = {
+                    "building": building,
+                    "room": room,
+                    "lev1": location.lev1,
+                    "lev2": location.lev2,
+                    "existing_set_id": existing["set_id"],
+                    "found_ek": existing["found_ek"],
+                    "skipped": skip_existing and existing["set_id"] is not None,
+                }
+                results[index] = entry
+                if entry["skipped"]:
+                    continue
+
+                sheets = self.workbook_sheets(parsed, location.sheets, set_type)
+                if location.columns:
+                    sheets = {
+                        sheet_name: self._column_block(sheet_name, item, location.columns)
+                        for sheet_name, item in sheets.items()
+                    }
+
+                saved = self.save_accel_data(
+                    db,
+                    plant_id=plant_id,
+                    unit_id=unit_id,
+                    building=building,
+                    room=room,
+                    lev=location.lev,
+                    lev1=location.lev1,
+                    lev2=location.lev2,
+                    pga=location.pga,
+                    calc_type=calc_type,
+                    set_type=set_type,
+                    sheets=sheets,
+                    ek_id=None,
+                    can_overwrite=0
+                )
+                entry.update(
+                    mrz_set_id=saved["mrz_set_id"],
+                    pz_set_id=saved["pz_set_id"],
+                    sheets=list(sheets)
+                )
+                totals["sets_created"] += 2 * len(sheets)
+                for name in ("plots_created", "plots_reused", "points_inserted"):
+                    totals[name] += saved[name]
+
+        return {
+            "locations": results,
+            "groups": len(groups),
+            **totals,
+            "message": "Data saved successfully"
+        }
+
+    def _column_block(self, sheet_name: str, item: AccelDataItem, columns: Dict[str, str]) -> AccelDataItem:
+        """Keep the frequency column and the mapped columns of a sheet, renamed to МРЗ_X ... ПЗ_Z"""
+        frequency_key = next((key for key in item.data if is_frequency_column(key)), None)
+        if frequency_key is None:
+            raise ValueError(f"Sheet '{sheet_name}': frequency column not found")
+
+        missing = [header for header in columns if header not in item.data]
+        if missing:
+            raise ValueError(f"Sheet '{sheet_name}': columns not found: {', '.join(missing)}")
+
+        data = {frequency_key: item.data[frequency_key]}
+        data.update({target: item.data[header] for header, target in columns.items()})
+        return AccelDataItem.model_construct(dempf=item.dempf, data=data)
+
     def _auto_fill_spectrum_data(self, data: Dict[str, List]) -> Dict[str, List]:
         """
         Auto-fill missing spectrum columns according to rules:
@@ -538,8 +1022,7 @@ class AccelerationService:
         normalized_data = {}
         for key, value in data.items():
             # Skip frequency columns (remove spaces, commas, dots for comparison)
-            key_clean = key.lower().replace(' ', '').replace(',', '').replace('.', '')
-            if any(x in key_clean for x in ['частота', 'frequency', 'freq', 'hz', 'гц']):
+            if is_frequency_column(key):
                 continue
 
             # Normalize column name: replace spaces and separators with underscores
@@ -625,38 +1108,21 @@ class AccelerationService:
         frequency_data: List[float],
         x_data: List[float],
         y_data: List[float],
-        z_data: List[float]
+        z_data: List[float],
+        stats: Optional[Dict[str, int]] = None
     ) -> int:
         """Create acceleration set with plots and points"""
 
         # Create plots for each axis
-        x_plot_id = None
-        y_plot_id = None
-        z_plot_id = None
-
-        if x_data:
-            x_plot_id = self.accel_plot_repo.create_plot(
-                db, axis="X", name=f"{set_type}_{spectr_earthq_type}_X"
-            )
-            for freq, accel in zip(frequency_data, x_data):
-                if freq is not None and accel is not None:
-                    self.accel_point_repo.create_point(db, freq, accel, x_plot_id)
-
-        if y_data:
-            y_plot_id = self.accel_plot_repo.create_plot(
-                db, axis="Y", name=f"{set_type}_{spectr_earthq_type}_Y"
-            )
-            for freq, accel in zip(frequency_data, y_data):
-                if freq is not None and accel is not None:
-                    self.accel_point_repo.create_point(db, freq, accel, y_plot_id)
-
-        if z_data:
-            z_plot_id = self.accel_plot_repo.create_plot(
-                db, axis="Z", name=f"{set_type}_{spectr_earthq_type}_Z"
-            )
-            for freq, accel in zip(frequency_data, z_data):
-                if freq is not None and accel is not None:
-                    self.accel_point_repo.create_point(db, freq, accel, z_plot_id)
+        x_plot_id = self._create_plot_with_points(
+            db, "X", f"{set_type}_{spectr_earthq_type}_X", frequency_data, x_data, stats
+        )
+        y_plot_id = self._create_plot_with_points(
+            db, "Y", f"{set_type}_{spectr_earthq_type}_Y", frequency_data, y_data, stats
+        )
+        z_plot_id = self._create_plot_with_points(
+            db, "Z", f"{set_type}_{spectr_earthq_type}_Z", frequency_data, z_data, stats
+        )
 
         # Create acceleration set
         set_id = self.accel_set_repo.create_set(
@@ -682,6 +1148,58 @@ class AccelerationService:
 
         return set_id
 
+    def _create_plot_with_points(
+        self,
+        db: Session,
+        axis: str,
+        name: str,
+        frequency_data: List[float],
+        accel_data: List[float],
+        stats: Optional[Dict[str, int]] = None
+    ) -> Optional[int]:
+        """
+        Create plot for one axis and store its points according to settings.accel_plot_storage
+
+        With settings.accel_plot_dedup an existing plot with the same points is
+        returned instead (auto-filled axes and re-imports share one plot).
+        `stats` ("plots_created", "plots_reused", "points_inserted") is incremented when given.
+        """
+        if not accel_data:
+            return None
+
+        # Skip incomplete rows (empty cells in the imported sheet)
+        frequencies = []
+        accelerations = []
+        for freq, accel in zip(frequency_data, accel_data):
+            if freq is not None and accel is not None:
+                frequencies.append(freq)
+                accelerations.append(accel)
+
+        content_hash = None
+        if settings.accel_plot_dedup:
+            content_hash = plot_content_hash(frequencies, accelerations)
+            existing_plot_id = self.accel_plot_hash_repo.find_plot_id(db, content_hash)
+            if existing_plot_id is not None:
+                if stats is not None:
+                    stats["plots_reused"] += 1
+                return existing_plot_id
+
+        plot_id = self.accel_plot_repo.create_plot(db, axis=axis, name=name)
+        plot_cache.invalidate([plot_id])
+        if content_hash is not None:
+            self.accel_plot_hash_repo.save_hash(db, plot_id, content_hash, len(frequencies))
+
+        if settings.accel_plot_storage == "packed":
+            self.accel_plot_packed_repo.save_arrays(db, plot_id, frequencies, accelerations)
+        else:
+            self.accel_point_repo.create_points_bulk(db, plot_id, frequencies, accelerations)
+
+        if stats is not None:
+            stats["plots_created"] += 1
+            stats["points_inserted"] += len(frequencies)
+
+        return plot_id
+
     def execute_set_all_ek_accel_set(
         self,
         db: Session,
@@ -719,6 +1237,10 @@ class AccelerationService:
                 clear_sets=clear_sets
             )
 
+            # The procedure may drop plot arrays of replaced sets
+            if clear_sets:
+                plot_cache.clear()
+
             return result
 
         except Exception as e:
@@ -828,7 +1350,10 @@ class AccelerationService:
             
             # Create OUT parameter using cursor.var()
             clear_result = cursor.var(oracledb.STRING)
+            accel_set = self.accel_set_repo.get_by_id(db, set_id)
             cursor.callproc('CLEAR_ACCEL_CET_ARRAYS', [set_id, clear_result])
+            if accel_set:
+                plot_cache.invalidate([accel_set.X_PLOT_ID, accel_set.Y_PLOT_ID, accel_set.Z_PLOT_ID])
 
             return str(clear_result.getvalue() or '')
         except Exception as e:
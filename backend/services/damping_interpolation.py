@@ -0,0 +1,79 @@
+"""
+Damping interpolation - спектр требований при промежуточном демпфировании
+
+Builds a requirement spectrum at an arbitrary DEMPF from the two stored ВИМОГИ sets
+that bracket it: both sets are put on a common frequency grid (plateau outside the
+source range, as in spectral_ratio) and blended with a weight that is linear either
+in ln(DEMPF) (default) or in DEMPF.
+"""
+import bisect
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .spectral_ratio import AXES, PlotArrays, interpolate_plateau
+
+DAMPING_METHODS = ("log", "linear")
+
+
+def bracket_damping(dempfs: Sequence[float], dempf: float) -> Optional[Tuple[float, float]]:
+    """Closest stored DEMPF values below and above `dempf` (sorted input); None outside the range"""
+    if not dempfs or dempf < dempfs[0] or dempf > dempfs[-1]:
+        return None
+    upper_index = bisect.bisect_left(dempfs, dempf)
+    if dempfs[upper_index] == dempf:
+        return dempf, dempf
+    return dempfs[upper_index - 1], dempfs[upper_index]
+
+
+def damping_weight(dempf: float, lower: float, upper: float, method: str = "log") -> float:
+    """Weight of the upper set: 0 at `lower`, 1 at `upper`"""
+    if method not in DAMPING_METHODS:
+        raise ValueError(f"Unknown damping interpolation method: {method}")
+    if upper == lower:
+        return 0.0
+    if method == "log":
+        if lower <= 0:
+            raise ValueError("Log-damping interpolation needs positive DEMPF values")
+        return (math.log(dempf) - math.log(lower)) / (math.log(upper) - math.log(lower))
+    return (dempf - lower) / (upper - lower)
+
+
+def interpolate_damping_spectra(
+    lower: Dict[str, PlotArrays],
+    upper: Dict[str, PlotArrays],
+    weight: float
+) -> Tuple[np.ndarray, Dict[str, Optional[np.ndarray]]]:
+    """
+    Blend two sets of axis spectra on their common frequency grid
+
+    Returns (grid, {axis: accel}); an axis missing in either set is None.
+    """
+    frequencies = [
+        arrays[0] for spectra in (lower, upper) for arrays in spectra.values() if arrays[0].size
+    ]
+    grid = np.unique(np.concatenate(frequencies)) if frequencies else np.empty(0, dtype=np.float64)
+
+    result = {}
+    for axis in AXES:
+        low, high = lower.get(axis), upper.get(axis)
+        if low is None or high is None or low[0].size == 0 or high[0].size == 0:
+            result[axis] = None
+            continue
+        low_accel = interpolate_plateau(grid, *low)
+        high_accel = interpolate_plateau(grid, *high)
+        result[axis] = low_accel + weight * (high_accel - low_accel)
+    return grid, result
+
+
+def interpolate_pga(lower: Optional[float], upper: Optional[float], weight: float) -> Optional[float]:
+    """PGA blended with the same weight (whichever is known if only one is)"""
+    if lower is None or upper is None:
+        return lower if upper is None else upper
+    return lower + weight * (upper - lower)
+
+
+def available_dempfs(dempfs: List[Optional[float]]) -> List[float]:
+    """Distinct sorted non-null DEMPF values"""
+    return sorted({float(d) for d in dempfs if d is not None})
@@ -1,7 +1,7 @@
 """
 File service - бизнес-логика для работы с файлами
 """
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect, text
 from fastapi import HTTPException
@@ -20,6 +20,10 @@ class FileService:
     
     def get_all_files(self, db: Session) -> List[FileData]:
         """Get all files with formatted data"""
+        return [FileData(data=row) for row in self.iter_files(db)]
+
+    def iter_files(self, db: Session, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield file rows (without DATA contents), fetching batch_size rows at a time"""
         inspector = inspect(db.get_bind())
         columns = inspector.get_columns('SRTN_FILES')
         column_names = [col['name'] for col in columns if col['name'].upper() not in ['DATA', 'ORIG_FILE_PATH']]
@@ -30,16 +34,16 @@ class FileService:
             FROM SRTN_FILES
             ORDER BY FILE_ID
         """
-        result = db.execute(text(query_sql))
+        statement = text(query_sql)
+        if batch_size:
+            statement = statement.execution_options(yield_per=batch_size)
+        result = db.execute(statement)
         
-        files_data = []
         for row in result:
             data_size = row[-1]  # Last column - DATA_SIZE
             row_dict = {column_names[i]: value for i, value in enumerate(row[:-1])}
             row_dict['DATA'] = format_data_field(int(data_size) if data_size else 0)
-            files_data.append(FileData(data=row_dict))
-        
-        return files_data
+            yield row_dict
     
     def get_file_by_id(self, db: Session, file_id: int):
         """Get file by ID"""
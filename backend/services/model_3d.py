@@ -1,7 +1,7 @@
 """
 3D Model service - бизнес-логика для работы с 3D моделями
 """
-from typing import List
+from typing import Iterator, List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import base64
@@ -227,40 +227,7 @@ class Model3DService:
     def get_all_multimedia(self, db: Session) -> List[dict]:
         """Get all multimedia files with model information"""
         try:
-            query = (
-                db.query(
-                    MultimediaModel.MULTIMED_3D_ID,
-                    MultimediaModel.SH_NAME,
-                    MultimediaModel.MULTIMED_FILE_ID,
-                    MultimediaModel.MODEL_ID,
-                    Model3D.SH_NAME.label('MODEL_SH_NAME'),
-                    File.FILE_NAME.label('FILE_NAME'),
-                    FileType.NAME.label('FILE_TYPE_NAME'),
-                    FileType.DEF_EXT.label('FILE_EXT')
-                )
-                .join(Model3D, MultimediaModel.MODEL_ID == Model3D.MODEL_ID)
-                .join(File, MultimediaModel.MULTIMED_FILE_ID == File.FILE_ID)
-                .join(FileType, File.FILE_TYPE_ID == FileType.FILE_TYPE_ID)
-            )
-
-            results = query.all()
-
-            multimedia_data = []
-            for row in results:
-                multimedia_data.append({
-                    "data": {
-                        "MULTIMED_3D_ID": row.MULTIMED_3D_ID,
-                        "SH_NAME": row.SH_NAME,
-                        "MULTIMED_FILE_ID": row.MULTIMED_FILE_ID,
-                        "MODEL_ID": row.MODEL_ID,
-                        "MODEL_SH_NAME": row.MODEL_SH_NAME,
-                        "FILE_NAME": row.FILE_NAME,
-                        "FILE_TYPE_NAME": row.FILE_TYPE_NAME,
-                        "FILE_EXT": row.FILE_EXT
-                    }
-                })
-
-            return multimedia_data
+            return [{"data": row} for row in self.iter_multimedia(db)]
 
         except Exception as e:
             raise HTTPException(
@@ -268,6 +235,38 @@ class Model3DService:
                 detail=f"Error fetching multimedia data: {str(e)}"
             )
 
+    def iter_multimedia(self, db: Session, batch_size: Optional[int] = None) -> Iterator[dict]:
+        """Yield multimedia rows with model and file type names, fetching batch_size rows at a time"""
+        query = (
+            db.query(
+                MultimediaModel.MULTIMED_3D_ID,
+                MultimediaModel.SH_NAME,
+                MultimediaModel.MULTIMED_FILE_ID,
+                MultimediaModel.MODEL_ID,
+                Model3D.SH_NAME.label('MODEL_SH_NAME'),
+                File.FILE_NAME.label('FILE_NAME'),
+                FileType.NAME.label('FILE_TYPE_NAME'),
+                FileType.DEF_EXT.label('FILE_EXT')
+            )
+            .join(Model3D, MultimediaModel.MODEL_ID == Model3D.MODEL_ID)
+            .join(File, MultimediaModel.MULTIMED_FILE_ID == File.FILE_ID)
+            .join(FileType, File.FILE_TYPE_ID == FileType.FILE_TYPE_ID)
+        )
+        if batch_size:
+            query = query.yield_per(batch_size)
+
+        for row in query:
+            yield {
+                "MULTIMED_3D_ID": row.MULTIMED_3D_ID,
+                "SH_NAME": row.SH_NAME,
+                "MULTIMED_FILE_ID": row.MULTIMED_FILE_ID,
+                "MODEL_ID": row.MODEL_ID,
+                "MODEL_SH_NAME": row.MODEL_SH_NAME,
+                "FILE_NAME": row.FILE_NAME,
+                "FILE_TYPE_NAME": row.FILE_TYPE_NAME,
+                "FILE_EXT": row.FILE_EXT
+            }
+
     def delete_multimedia(self, db: Session, multimed_id: int):
         """Delete multimedia file and relation"""
         try:
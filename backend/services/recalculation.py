@@ -0,0 +1,228 @@
+"""
+Recalculation service - перерасчёт цепочки M1 → SIGMA_S_ALT → K1/K3/N → K2 для всех ЕК
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core import DbSessionContext, settings
+from repositories import SeismicRepository
+from utils import Job, job_registry
+from .acceleration import AccelerationService
+from .seismic_margins import INPUT_COLUMNS, recalculate_chunk
+
+# Bounded pools shared by all jobs: at most settings.recalc_jobs jobs hold a DB
+# session at a time, and their chunks are computed by one process pool
+_job_executor = ThreadPoolExecutor(max_workers=max(1, settings.recalc_jobs), thread_name_prefix="recalc")
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+_admission_lock = threading.Lock()
+
+
+class RecalculationBusy(Exception):
+    """Too many recalculation jobs are running or queued"""
+    pass
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=max(1, settings.recalc_workers or os.cpu_count() or 1))
+        return _process_pool
+
+
+def shutdown_recalculation_pool():
+    """Stop the worker processes (running chunks are cancelled)"""
+    global _process_pool
+    with _process_pool_lock:
+        executor, _process_pool = _process_pool, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RecalculationService:
+    """Fleet-wide recalculation of seismic margins for a plant/unit/eklist"""
+
+    JOB_KIND = "recalculation"
+
+    def __init__(self):
+        self.seismic_repo = SeismicRepository()
+        self.acceleration_service = AccelerationService()
+
+    def start_job(
+        self,
+        calc_type: str,
+        dempf: float,
+        spectrum_types: List[str],
+        plant_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        eklist_id: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Job:
+        """
+        Register a recalculation job and queue it on the recalculation pool
+
+        Raises RecalculationBusy when settings.recalc_jobs jobs are running and
+        settings.recalc_job_queue more are already waiting.
+        """
+        with _admission_lock:
+            active = sum(1 for job in job_registry.list(self.JOB_KIND) if not job.finished)
+            if active >= max(1, settings.recalc_jobs) + max(0, settings.recalc_job_queue):
+                raise RecalculationBusy(f"Too many recalculation jobs are queued ({active}), try again later")
+            job = job_registry.create(self.JOB_KIND, {
+                "plant_id": plant_id,
+                "unit_id": unit_id,
+                "eklist_id": eklist_id,
+                "calc_type": calc_type,
+                "dempf": dempf,
+                "spectrum_types": spectrum_types,
+            })
+            job.set_message("Queued")
+
+        def run():
+            try:
+                with DbSessionContext() as db:
+                    self.recalculate(
+                        db, job, calc_type, dempf, spectrum_types,
+                        plant_id=plant_id, unit_id=unit_id, eklist_id=eklist_id, workers=workers
+                    )
+            except Exception as e:
+                print(f"Error in recalculation job {job.id}: {e}")
+                job.fail(str(e))
+
+        _job_executor.submit(run)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get recalculation job by ID"""
+        job = job_registry.get(job_id)
+        return job if job is not None and job.kind == self.JOB_KIND else None
+
+    def recalculate(
+        self,
+        db: Session,
+        job: Job,
+        calc_type: str,
+        dempf: float,
+        spectrum_types: List[str],
+        plant_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        eklist_id: Optional[int] = None,
+        workers: Optional[int] = None
+    ):
+        """
+        Recalculate all elements matching the filter
+
+        Inputs are loaded with set-based queries, chunks of elements are computed in a
+        process pool and every finished chunk is written back with one bulk UPDATE and
+        committed, so progress survives a failure in a later chunk.
+        """
+        rows = self.seismic_repo.get_columns(
+            db, INPUT_COLUMNS, plant_id=plant_id, unit_id=unit_id, eklist_id=eklist_id
+        )
+        columns = {row["EK_ID"]: {column: row[column] for column in INPUT_COLUMNS} for row in rows}
+        job.start(total=len(columns), message="Loading spectra")
+
+        elements, plot_ids, missing_ek_ids = self.acceleration_service.resolve_spectral_sets(
+            db, list(columns), spectrum_types, calc_type, dempf
+        )
+        plots = self.acceleration_service.get_plot_arrays_many(db, plot_ids)
+        if missing_ek_ids:
+            job.advance(len(missing_ek_ids), {ek_id: ["Element not found"] for ek_id in missing_ek_ids})
+
+        payloads = self._build_payloads(columns, elements, plots, spectrum_types, dempf)
+        job.set_message(f"Calculating {len(elements)} element(s) in {len(payloads)} chunk(s)")
+
+        for chunk_result in self._map_chunks(payloads, workers):
+            updated = self.seismic_repo.bulk_update(db, chunk_result["rows"])
+            db.commit()
+            job.advance(chunk_result["processed"], chunk_result["errors"], updated=updated)
+
+        job.finish(
+            f"Recalculated {job.processed} element(s), updated {job.counters.get('updated', 0)}, "
+            f"{len(job.errors)} with errors"
+        )
+
+    def _build_payloads(
+        self,
+        columns: Dict[int, Dict[str, Any]],
+        elements: Dict[int, Dict[str, Any]],
+        plots: Dict[int, Any],
+        spectrum_types: List[str],
+        dempf: float
+    ) -> List[Dict[str, Any]]:
+        """Split elements into process-pool tasks, each carrying only the plots it needs"""
+        chunk_size = max(1, settings.recalc_chunk_size)
+        ek_ids = list(elements)
+        payloads = []
+        for start in range(0, len(ek_ids), chunk_size):
+            chunk = ek_ids[start:start + chunk_size]
+            chunk_plot_ids = {
+                set_ref[f"{axis}_plot_id"]
+                for ek_id in chunk
+                for sets in (elements[ek_id]["spectral_sets"], elements[ek_id]["requirement_sets"])
+                for set_ref in sets.values()
+                for axis in ("x", "y", "z")
+            }
+            payloads.append({
+                "elements": [
+                    {"ek_id": ek_id, "columns": columns[ek_id], "element": elements[ek_id]}
+                    for ek_id in chunk
+                ],
+                "plots": {plot_id: plots[plot_id] for plot_id in chunk_plot_ids if plot_id in plots},
+                "spectrum_types": spectrum_types,
+                "dempf": dempf,
+            })
+        return payloads
+
+    def _map_chunks(self, payloads: List[Dict[str, Any]], workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run recalculate_chunk over payloads, in-process for a single worker or chunk
+
+        Chunks go to the shared process pool; `workers` limits how many chunks of
+        this job are in flight at once, so concurrent jobs take turns.
+        """
+        workers = workers or settings.recalc_workers or os.cpu_count() or 1
+        if workers <= 1 or len(payloads) <= 1:
+            for payload in payloads:
+                yield recalculate_chunk(payload)
+            return
+
+        pending = deque(payloads)
+        in_flight = {}
+        while pending or in_flight:
+            while pending and len(in_flight) < workers:
+                payload = pending.popleft()
+                try:
+                    in_flight[_get_process_pool().submit(recalculate_chunk, payload)] = payload
+                except (BrokenProcessPool, RuntimeError) as e:
+                    shutdown_recalculation_pool()
+                    yield self._failed_chunk(payload, e)
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                payload = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    shutdown_recalculation_pool()
+                    yield self._failed_chunk(payload, e)
+                except Exception as e:
+                    yield self._failed_chunk(payload, e)
+
+    @staticmethod
+    def _failed_chunk(payload: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            "rows": [],
+            "results": {},
+            "errors": {item["ek_id"]: [f"Worker failed: {error}"] for item in payload["elements"]},
+            "processed": len(payload["elements"]),
+        }
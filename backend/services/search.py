@@ -1,12 +1,123 @@
 """
 Search service - бизнес-логика для поиска
 """
-from typing import List
+import base64
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, false, or_
 from sqlalchemy.orm import Session
 
+from models import EkSeismData
 from repositories import SeismicRepository
 from schemas import SearchData
 
+# Columns that can be selected, sorted and filtered by name
+SEARCH_COLUMNS = {column.name: column for column in EkSeismData.__table__.columns}
+
+# Keyset tie-breaker, always selected and last in the sort order
+KEY_COLUMN = "EK_ID"
+
+# filter=COLUMN:op:value predicates
+FILTER_OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "le": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "ge": lambda column, value: column >= value,
+    "like": lambda column, value: column.ilike(f"%{value}%"),
+    "null": lambda column, _: column.is_(None),
+    "notnull": lambda column, _: column.isnot(None),
+}
+
+
+def _column(name: str):
+    column = SEARCH_COLUMNS.get(name.strip().upper())
+    if column is None:
+        raise ValueError(f"Unknown column: {name}")
+    return column
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """fields=NAME,IDEN,... -> column names (None = all columns)"""
+    if not fields:
+        return None
+    names = [_column(name).name for name in fields.split(",") if name.strip()]
+    return list(dict.fromkeys([KEY_COLUMN, *names]))
+
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, bool]]:
+    """sort=NAME,-HCLPF -> [(column, descending)], EK_ID appended as tie-breaker"""
+    keys = []
+    for item in (sort or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name = _column(item.lstrip("+-")).name
+        if name not in (key for key, _ in keys):
+            keys.append((name, item.startswith("-")))
+    if KEY_COLUMN not in (key for key, _ in keys):
+        keys.append((KEY_COLUMN, False))
+    return keys
+
+
+def parse_filter(expression: str):
+    """COLUMN:op:value -> SQL condition (value converted to the column type)"""
+    parts = expression.split(":", 2)
+    if len(parts) < 2 or parts[1] not in FILTER_OPERATORS:
+        raise ValueError(
+            f"Invalid filter '{expression}', expected COLUMN:op:value with op in {', '.join(FILTER_OPERATORS)}"
+        )
+    column, operator = _column(parts[0]), parts[1]
+    value = parts[2] if len(parts) > 2 else None
+    if operator in ("null", "notnull"):
+        return FILTER_OPERATORS[operator](column, None)
+    if value is None:
+        raise ValueError(f"Filter '{expression}' needs a value")
+    if operator != "like":
+        try:
+            value = column.type.python_type(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for {column.name}: {value}")
+    return FILTER_OPERATORS[operator](column, value)
+
+
+def encode_cursor(sort_keys: Sequence[Tuple[str, bool]], row: dict) -> str:
+    """Opaque cursor: sort spec and sort key values of the last row"""
+    payload = {"sort": [[name, desc] for name, desc in sort_keys], "after": [row[name] for name, _ in sort_keys]}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[Tuple[str, bool]]) -> List[Any]:
+    """Sort key values from a cursor; the cursor must belong to the same sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after = payload["after"]
+        same_sort = [tuple(key) for key in payload["sort"]] == list(sort_keys)
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not same_sort or len(after) != len(sort_keys):
+        raise ValueError("Cursor does not match the sort order")
+    return after
+
+
+def keyset_condition(sort_keys: Sequence[Tuple[str, bool]], after: Sequence[Any]):
+    """
+    Rows after `after` in the sort order (NULLs last in both directions)
+
+    (k1, k2, ...) > (v1, v2, ...) expanded to OR of prefix equalities, since
+    directions may differ per key.
+    """
+    branches = []
+    equal = []
+    for (name, descending), value in zip(sort_keys, after):
+        column = SEARCH_COLUMNS[name]
+        if value is not None:
+            beyond = column < value if descending else column > value
+            branches.append(and_(*equal, or_(beyond, column.is_(None))))
+        equal.append(column.is_(None) if value is None else column == value)
+    return or_(*branches) if branches else false()
+
 
 class SearchService:
     """Search service"""
@@ -16,24 +127,101 @@ class SearchService:
     
     def search_data(self, db: Session, plant_id: int, unit_id: int, t_id: int) -> List[SearchData]:
         """Search seismic data by plant, unit and term (eklist)"""
-        # Search data using repository
-        seism_data_list = self.seismic_repo.search(
-            db=db,
-            plant_id=plant_id,
-            unit_id=unit_id,
-            eklist_id=t_id
+        return [SearchData(**item) for item in self.search_page(db, plant_id, unit_id, t_id)[0]]
+
+    def search_page(
+        self,
+        db: Session,
+        plant_id: int,
+        unit_id: int,
+        t_id: int,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Search seismic data with projection, sorting, filters and keyset pagination
+
+        Returns SearchData-shaped dicts ({"data": row}) and the next page cursor.
+        Only the `fields` columns (plus EK_ID) are selected. With `limit`, the next
+        page cursor is returned when more rows may follow; pass it back as `cursor`
+        with the same sort. Invalid parameters raise ValueError.
+        """
+        sort_keys = parse_sort(sort)
+        selected, extra, conditions, order_by = self._search_query(
+            plant_id, unit_id, t_id, fields, sort_keys, filters, cursor
         )
-        
-        # Convert ORM objects to response format
-        search_results = []
-        for seism_data in seism_data_list:
-            # Convert ORM object to dictionary using all table columns
-            row_dict = {}
-            for column in seism_data.__table__.columns:
-                value = getattr(seism_data, column.name)
-                row_dict[column.name] = value
-            
-            search_results.append(SearchData(data=row_dict))
-        
-        return search_results
+        rows = self.seismic_repo.search_rows(db, selected + extra, conditions, order_by, limit)
+
+        next_cursor = None
+        if limit is not None and len(rows) == limit:
+            next_cursor = encode_cursor(sort_keys, rows[-1])
+
+        results = []
+        for row in rows:
+            for name in extra:
+                del row[name]
+            results.append({"data": row})
+        return results, next_cursor
+
+    def iter_search(
+        self,
+        db: Session,
+        plant_id: int,
+        unit_id: int,
+        t_id: int,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield all matching rows as {"data": row}, fetching batch_size rows at a time"""
+        selected, _, conditions, order_by = self._search_query(
+            plant_id, unit_id, t_id, fields, parse_sort(sort), filters
+        )
+        for row in self.seismic_repo.iter_search_rows(db, selected, conditions, order_by, batch_size=batch_size):
+            yield {"data": row}
+
+    def validate_search(
+        self,
+        fields: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Sequence[str]] = None
+    ):
+        """Raise ValueError for invalid fields / sort / filter parameters (before streaming)"""
+        parse_fields(fields)
+        parse_sort(sort)
+        for expression in filters or ():
+            parse_filter(expression)
+
+    def _search_query(
+        self,
+        plant_id: int,
+        unit_id: int,
+        t_id: int,
+        fields: Optional[str],
+        sort_keys: Sequence[Tuple[str, bool]],
+        filters: Optional[Sequence[str]],
+        cursor: Optional[str] = None
+    ):
+        """(selected columns, extra sort columns, conditions, order_by) of a search"""
+        columns = parse_fields(fields)
+        conditions = [
+            EkSeismData.PLANT_ID == plant_id,
+            EkSeismData.UNIT_ID == unit_id,
+            EkSeismData.EKLIST_ID == t_id,
+            *(parse_filter(expression) for expression in filters or ()),
+        ]
+        if cursor:
+            conditions.append(keyset_condition(sort_keys, decode_cursor(cursor, sort_keys)))
 
+        selected = list(SEARCH_COLUMNS) if columns is None else columns
+        # Sort keys are fetched for the cursor even when not requested
+        extra = [name for name, _ in sort_keys if name not in selected]
+        order_by = [
+            (SEARCH_COLUMNS[name].desc() if descending else SEARCH_COLUMNS[name].asc()).nulls_last()
+            for name, descending in sort_keys
+        ]
+        return selected, extra, conditions, order_by
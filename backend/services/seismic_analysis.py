@@ -1,18 +1,50 @@
 """
 Seismic Analysis service - сейсмический анализ (M1, M2, K-коэффициенты, SIGMA, HCLPF)
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from repositories import SeismicRepository
+from .acceleration import AccelerationService
+from .seismic_margins import (
+    SIGMA_ALT_INPUTS,
+    SPECTRUM_SUFFIXES,
+    column_array,
+    element_pga,
+    k2_array,
+    k_arrays,
+    k_coefficient_arrays,
+    sigma_alt_arrays,
+    spectral_margins,
+)
 
 
 class SeismicAnalysisService:
     """Seismic analysis service - анализ изменения сейсмических требований"""
     
+    # Columns for M1/M2 per spectrum type (same as save_analysis_result)
+    M_FIELDS = {
+        "МРЗ": ("M1_MRZ", "M2_MRZ"),
+        "ПЗ": ("M1_PZ", "M2_PZ"),
+    }
+    
+    # save_k_results parameter -> column
+    K_FIELDS = {
+        "k1_pz": "K1_PZ",
+        "k1_mrz": "K1_MRZ",
+        "k3_pz": "K3_PZ",
+        "k3_mrz": "K3_MRZ",
+        "k2_value": "K2_",
+        "n_pz": "N_PZ",
+        "n_mrz": "N_MRZ",
+    }
+    
     def __init__(self):
         self.seismic_repo = SeismicRepository()
+        self.acceleration_service = AccelerationService()
     
     def save_analysis_result(
         self,
@@ -45,6 +77,199 @@ class SeismicAnalysisService:
             "updated_fields": update_data
         }
     
+    def calculate_m1(
+        self,
+        db: Session,
+        ek_ids: List[int],
+        calc_type: str,
+        dempf: float,
+        spectrum_types: List[str],
+        natural_frequencies: Optional[Dict[str, Optional[float]]] = None,
+        save: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Calculate M1/M2 (max requirement/characteristic ratio) on the server and optionally save them
+
+        Requirements are the ВИМОГИ sets with the given DEMPF for the element location, characteristics
+        are the element's assigned ХАРАКТЕРИСТИКИ sets. Spectra are cut below FIRST_NAT_FREQ_{X,Y,Z}
+        unless `natural_frequencies` overrides them. Infinite ratios are reported but not saved,
+        like the browser does.
+        """
+        elements, plot_ids, missing_ek_ids = self.acceleration_service.resolve_spectral_sets(
+            db, ek_ids, spectrum_types, calc_type, dempf
+        )
+        plots = self.acceleration_service.get_plot_arrays_many(db, plot_ids)
+        
+        results = {}
+        errors = {ek_id: ["Element not found"] for ek_id in missing_ek_ids}
+        update_rows = []
+        
+        for ek_id, element in elements.items():
+            element_results, element_errors = spectral_margins(
+                element, plots, spectrum_types, dempf, natural_frequencies
+            )
+            if element_errors:
+                errors[ek_id] = element_errors
+            if not element_results:
+                continue
+            results[ek_id] = element_results
+            
+            update_row = {}
+            for spectrum_type, analysis in element_results.items():
+                if not analysis["infinite"] and spectrum_type in self.M_FIELDS:
+                    m1_field, m2_field = self.M_FIELDS[spectrum_type]
+                    update_row[m1_field] = analysis["m1"]
+                    update_row[m2_field] = analysis["m2"]
+            if update_row:
+                update_rows.append({"EK_ID": ek_id, **update_row})
+        
+        updated = self.seismic_repo.bulk_update(db, update_rows) if save else 0
+        
+        return {
+            "success": True,
+            "message": f"M1 calculated for {len(results)} element(s), saved for {updated}",
+            "results": results,
+            "errors": errors,
+            "updated": updated,
+        }
+    
+    def calculate_sigma_alt_bulk(
+        self,
+        db: Session,
+        ek_ids: Optional[List[int]] = None,
+        plant_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        eklist_id: Optional[int] = None,
+        save: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Calculate SIGMA_S_ALT_{1,2}_{PZ,MRZ} for many elements (same formulas as /calculate-sigma-alt)
+
+        Inputs are read with one column-only SELECT per 1000 ids, computed as arrays and
+        written back with a single executemany UPDATE. Values with missing inputs are skipped.
+        """
+        input_columns = sorted({column for inputs in SIGMA_ALT_INPUTS.values() for column in inputs})
+        rows = self.seismic_repo.get_columns(
+            db, input_columns, ek_ids, plant_id=plant_id, unit_id=unit_id, eklist_id=eklist_id
+        )
+        found = {row["EK_ID"] for row in rows}
+        missing_ek_ids = [ek_id for ek_id in dict.fromkeys(ek_ids or []) if ek_id not in found]
+        
+        calculated = sigma_alt_arrays({
+            column: column_array(row[column] for row in rows) for column in input_columns
+        })
+        
+        results = {}
+        update_rows = []
+        for i, row in enumerate(rows):
+            values = {
+                column: float(array[i]) for column, array in calculated.items() if not np.isnan(array[i])
+            }
+            results[row["EK_ID"]] = values
+            if values:
+                update_rows.append({"EK_ID": row["EK_ID"], **values})
+        
+        updated = self.seismic_repo.bulk_update(db, update_rows) if save else 0
+        
+        return {
+            "success": True,
+            "message": f"Calculated sigma alt values for {len(update_rows)} of {len(rows)} element(s)",
+            "calculated_values": results,
+            "missing_ek_ids": missing_ek_ids,
+            "updated": updated,
+        }
+    
+    def calculate_k_bulk(
+        self,
+        db: Session,
+        ek_ids: Optional[List[int]] = None,
+        plant_id: Optional[int] = None,
+        unit_id: Optional[int] = None,
+        eklist_id: Optional[int] = None,
+        calc_type: Optional[str] = None,
+        dempf: Optional[float] = None,
+        pga: Optional[float] = None,
+        save: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Calculate K1/K3/N for МРЗ and ПЗ and K2 for many elements (same rules as SeismicAnalysisTab)
+
+        Inputs are the stored SIGMA_DOP, SIGMA_S_ALT_*, M1_*/M2_*, HCLPF, F_MU and SEISMO_TXT.
+        PGA for k2 is `pga` if given, otherwise the ВИМОГИ set for calc_type/DEMPF at the element
+        location (or the assigned set). Results use save_k_results keys; like save_k_results,
+        only calculated (non-null) values are written.
+        """
+        input_columns = [
+            "SIGMA_DOP", "HCLPF", "F_MU", "SEISMO_TXT",
+            *(
+                f"{column}_{suffix}"
+                for suffix in SPECTRUM_SUFFIXES.values()
+                for column in ("M1", "M2", "SIGMA_S_ALT_1", "SIGMA_S_ALT_2")
+            ),
+        ]
+        rows = self.seismic_repo.get_columns(
+            db, input_columns, ek_ids, plant_id=plant_id, unit_id=unit_id, eklist_id=eklist_id
+        )
+        found = [row["EK_ID"] for row in rows]
+        found_set = set(found)
+        missing_ek_ids = [ek_id for ek_id in dict.fromkeys(ek_ids or []) if ek_id not in found_set]
+        arrays = {
+            column: column_array(row[column] for row in rows)
+            for column in input_columns if column != "SEISMO_TXT"
+        }
+        
+        calculated = {}
+        for spectrum_type, suffix in SPECTRUM_SUFFIXES.items():
+            c1, c2 = k_coefficient_arrays(spectrum_type, (row["SEISMO_TXT"] for row in rows))
+            k = k_arrays(
+                arrays["SIGMA_DOP"],
+                arrays[f"SIGMA_S_ALT_1_{suffix}"],
+                arrays[f"SIGMA_S_ALT_2_{suffix}"],
+                c1, c2,
+                arrays[f"M2_{suffix}"]
+            )
+            for name, array in k.items():
+                calculated[f"{name}_{suffix.lower()}"] = array
+        
+        # k2 is shared: m1 of ПЗ, otherwise МРЗ, with PGA of the same spectrum type
+        use_pz = ~np.isnan(arrays["M1_PZ"])
+        m1 = np.where(use_pz, arrays["M1_PZ"], arrays["M1_MRZ"])
+        if pga is not None:
+            pga_values = np.full(len(rows), pga, dtype=np.float64)
+        else:
+            elements, _, _ = self.acceleration_service.resolve_spectral_sets(
+                db, found, list(SPECTRUM_SUFFIXES), calc_type, dempf
+            )
+            pga_values = column_array(
+                element_pga(elements[ek_id], "ПЗ" if pz else "МРЗ") if ek_id in elements else None
+                for ek_id, pz in zip(found, use_pz)
+            )
+        calculated["k2_value"] = k2_array(arrays["HCLPF"], m1, arrays["F_MU"], pga_values)
+        
+        results = {}
+        update_rows = []
+        for i, ek_id in enumerate(found):
+            values = {
+                name: (None if np.isnan(calculated[name][i]) else float(calculated[name][i]))
+                for name in self.K_FIELDS
+            }
+            results[ek_id] = values
+            update_row = {
+                self.K_FIELDS[name]: value for name, value in values.items() if value is not None
+            }
+            if update_row:
+                update_rows.append({"EK_ID": ek_id, **update_row})
+        
+        updated = self.seismic_repo.bulk_update(db, update_rows) if save else 0
+        
+        return {
+            "success": True,
+            "message": f"K calculated for {len(update_rows)} of {len(rows)} element(s)",
+            "results": results,
+            "missing_ek_ids": missing_ek_ids,
+            "updated": updated,
+        }
+    
     def save_stress_inputs(
         self,
         db: Session,
@@ -92,18 +317,8 @@ class SeismicAnalysisService:
         **kwargs
     ) -> Dict[str, Any]:
         """Save K calculation results"""
-        field_mapping = {
-            "k1_pz": "K1_PZ",
-            "k1_mrz": "K1_MRZ",
-            "k3_pz": "K3_PZ",
-            "k3_mrz": "K3_MRZ",
-            "k2_value": "K2_",
-            "n_pz": "N_PZ",
-            "n_mrz": "N_MRZ",
-        }
-        
         update_data = {}
-        for param_name, db_field in field_mapping.items():
+        for param_name, db_field in self.K_FIELDS.items():
             if param_name in kwargs and kwargs[param_name] is not None:
                 update_data[db_field] = kwargs[param_name]
         
@@ -0,0 +1,340 @@
+"""
+Seismic margins - чистые функции расчёта цепочки M1 → SIGMA_S_ALT → K1/K3/N → K2
+
+Mirrors the formulas of /calculate-sigma-alt, SeismicAnalysisTab.jsx (K coefficients)
+and LoadAnalysisTab.jsx (M1_ALT, K1_ALT). The HCLPF-derived value of the chain is K2
+(Д.12). HCLPF_ALT_MRZ/PZ have no formula in the app (neither the frontend,
+/calculate-sigma-alt nor LoadAnalysisService.FIELD_MAPPING computes them), so they
+are left as stored. Functions take plain dicts and numpy arrays only, so they can
+run in worker processes.
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .spectral_ratio import AXES, PlotArrays, calculate_m1_m2
+
+# Column suffix per spectrum type
+SPECTRUM_SUFFIXES = {
+    "МРЗ": "MRZ",
+    "ПЗ": "PZ",
+}
+
+# (k for σ_alt_1, k for σ_alt_2) per spectrum type / ПЗ seismic category
+K_COEFFICIENTS_MRZ = (1.4, 1.8)
+K_COEFFICIENTS_PZ = {
+    "I": (1.2, 1.6),
+    "II": (1.5, 1.9),
+}
+
+# SRTN_EK_SEISM_DATA columns read by recalculate_element
+INPUT_COLUMNS = (
+    "FIRST_NAT_FREQ_X", "FIRST_NAT_FREQ_Y", "FIRST_NAT_FREQ_Z",
+    "SIGMA_DOP", "SIGMA_ALT_DOP", "HCLPF", "F_MU", "SEISMO_TXT",
+    *(
+        f"{column}_{suffix}"
+        for suffix in SPECTRUM_SUFFIXES.values()
+        for column in (
+            "M1", "M2", "SIGMA_S_1", "SIGMA_S_2", "SIGMA_S_S1", "SIGMA_S_S2",
+            "RATIO_P", "RATIO_E",
+        )
+    ),
+)
+
+# SIGMA_S_ALT_{1,2}_{suffix} -> ((σs), (σs)s, m₁) input columns
+SIGMA_ALT_INPUTS = {
+    f"SIGMA_S_ALT_{i}_{suffix}": (f"SIGMA_S_{i}_{suffix}", f"SIGMA_S_S{i}_{suffix}", f"M1_{suffix}")
+    for suffix in SPECTRUM_SUFFIXES.values()
+    for i in (1, 2)
+}
+
+
+def _positive(value: Optional[float]) -> bool:
+    return value is not None and value > 0
+
+
+def seismic_category(seismo_txt: Optional[str]) -> Optional[str]:
+    """
+    ПЗ seismic category from SEISMO_TXT ("II" is checked first, latin or cyrillic)
+
+    Case-sensitive like determineSeismicCategory in SeismicAnalysisTab.jsx, so the
+    lowercase "і" of words such as "несейсмостійкий" is not taken for category I.
+    """
+    if not seismo_txt:
+        return None
+    text = str(seismo_txt)
+    if "II" in text or "ІІ" in text:
+        return "II"
+    if "I" in text or "І" in text:
+        return "I"
+    return None
+
+
+def sigma_alt(sigma: Optional[float], sigma_s: Optional[float], m1: Optional[float]) -> Optional[float]:
+    """(σs)* = (σs) + (σs)s × (m₁ - 1), None when any input is missing"""
+    if sigma is None or sigma_s is None or m1 is None:
+        return None
+    return sigma + sigma_s * (m1 - 1)
+
+
+def column_array(values: Iterable[Optional[float]]) -> np.ndarray:
+    """Column values as float64 array, NULL -> NaN"""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def sigma_alt_arrays(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized sigma_alt over column arrays of many elements
+
+    `columns` maps the SIGMA_ALT_INPUTS columns to arrays (NULL as NaN); results are NaN
+    where any input is missing.
+    """
+    return {
+        target: columns[sigma] + columns[sigma_s] * (columns[m1] - 1)
+        for target, (sigma, sigma_s, m1) in SIGMA_ALT_INPUTS.items()
+    }
+
+
+def k_coefficient_arrays(spectrum_type: str, seismo_txt: Iterable[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(c1, c2) arrays per element; NaN for ПЗ elements without a seismic category"""
+    categories = [seismic_category(txt) for txt in seismo_txt]
+    if spectrum_type == "МРЗ":
+        pairs = [K_COEFFICIENTS_MRZ] * len(categories)
+    else:
+        pairs = [K_COEFFICIENTS_PZ.get(category, (np.nan, np.nan)) for category in categories]
+    coefficients = np.array(pairs, dtype=np.float64).reshape(-1, 2)
+    return coefficients[:, 0], coefficients[:, 1]
+
+
+def k_arrays(
+    sigma_dop: np.ndarray,
+    sigma_alt_1: np.ndarray,
+    sigma_alt_2: np.ndarray,
+    c1: np.ndarray,
+    c2: np.ndarray,
+    m2: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized n = k1 = min(c1·σdop/σalt1, c2·σdop/σalt2), k3 = n / m2
+
+    Terms with σalt <= 0 are ignored; results are NaN where they cannot be calculated
+    (no σdop, no category, no positive σalt; k3 also needs m2 > 0).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v1 = np.where(sigma_alt_1 > 0, c1 * sigma_dop / sigma_alt_1, np.nan)
+        v2 = np.where(sigma_alt_2 > 0, c2 * sigma_dop / sigma_alt_2, np.nan)
+        k1 = np.fmin(v1, v2)
+        k1 = np.where((sigma_dop != 0) & ~np.isnan(sigma_dop), k1, np.nan)
+        k3 = np.where((m2 > 0) & (k1 != 0), k1 / m2, np.nan)
+    return {"n": k1, "k1": k1, "k3": k3}
+
+
+def k2_array(hclpf: np.ndarray, m1: np.ndarray, f_mu: np.ndarray, pga: np.ndarray) -> np.ndarray:
+    """Vectorized k2 = HCLPF / (m1 · F_MU · PGA) by Д.12, NaN unless all inputs are positive"""
+    valid = (hclpf > 0) & (m1 > 0) & (f_mu > 0) & (pga > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, hclpf / (m1 * f_mu * pga), np.nan)
+
+
+def _scalar(array: np.ndarray) -> Optional[float]:
+    value = float(array[0])
+    return None if math.isnan(value) else value
+
+
+def calculate_k(
+    sigma_dop: Optional[float],
+    sigma_alt_1: Optional[float],
+    sigma_alt_2: Optional[float],
+    coefficients: Optional[Tuple[float, float]],
+    m2: Optional[float]
+) -> Dict[str, Optional[float]]:
+    """K for a single element (see k_arrays)"""
+    c1, c2 = coefficients or (None, None)
+    arrays = k_arrays(*(column_array([v]) for v in (sigma_dop, sigma_alt_1, sigma_alt_2, c1, c2, m2)))
+    return {key: _scalar(array) for key, array in arrays.items()}
+
+
+def calculate_k2(
+    hclpf: Optional[float],
+    m1: Optional[float],
+    f_mu: Optional[float],
+    pga: Optional[float]
+) -> Optional[float]:
+    """k2 for a single element (see k2_array)"""
+    return _scalar(k2_array(*(column_array([v]) for v in (hclpf, m1, f_mu, pga))))
+
+
+def element_pga(element: Dict[str, Any], spectrum_type: str) -> Optional[float]:
+    """PGA for k2: ВИМОГИ set of the element location, otherwise the assigned set"""
+    set_ref = element["requirement_sets"].get(spectrum_type) or element["spectral_sets"].get(spectrum_type)
+    return set_ref["pga"] if set_ref else None
+
+
+def spectral_margins(
+    element: Dict[str, Any],
+    plots: Dict[int, PlotArrays],
+    spectrum_types: List[str],
+    dempf: Optional[float],
+    bounds: Optional[Dict[str, Optional[float]]] = None
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    M1/M2 analysis for one element resolved by AccelerationService.resolve_spectral_sets
+
+    Returns ({spectrum_type: analysis}, errors); infinite ratios are reported as None
+    with `infinite: True`.
+    """
+    if bounds is None:
+        bounds = element["first_natural_frequencies"]
+
+    def axis_arrays(set_ref: Dict[str, Any]) -> Dict[str, PlotArrays]:
+        return {
+            axis: plots[set_ref[f"{axis}_plot_id"]]
+            for axis in AXES
+            if set_ref[f"{axis}_plot_id"] in plots
+        }
+
+    results = {}
+    errors = []
+    for spectrum_type in spectrum_types:
+        char_set = element["spectral_sets"].get(spectrum_type)
+        req_set = element["requirement_sets"].get(spectrum_type)
+        if not char_set or char_set["set_type"] != "ХАРАКТЕРИСТИКИ":
+            errors.append(f"{spectrum_type}: no ХАРАКТЕРИСТИКИ set assigned")
+            continue
+        if not req_set:
+            errors.append(f"{spectrum_type}: no ВИМОГИ set for DEMPF={dempf}")
+            continue
+
+        analysis = calculate_m1_m2(axis_arrays(req_set), axis_arrays(char_set), bounds)
+        results[spectrum_type] = {
+            key: (value if math.isfinite(value) else None) for key, value in analysis.items()
+        }
+        results[spectrum_type]["infinite"] = not math.isfinite(analysis["m1"])
+    return results, errors
+
+
+def recalculate_element(
+    columns: Dict[str, Any],
+    element: Dict[str, Any],
+    plots: Dict[int, PlotArrays],
+    spectrum_types: List[str],
+    dempf: Optional[float]
+) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+    """
+    Recalculate the whole margin chain for one element
+
+    `columns` holds INPUT_COLUMNS of SRTN_EK_SEISM_DATA. M1/M2 fall back to the stored
+    values when the spectra cannot be resolved; every other value is derived from them.
+    The HCLPF-derived output is K2_; HCLPF_ALT_* are never written (see module docstring).
+    Returns (update_row, results, errors); update_row only contains computed (non-None)
+    columns, like save_k_results.
+    """
+    analyses, errors = spectral_margins(element, plots, spectrum_types, dempf)
+    update_row = {}
+    results = {}
+
+    natural_frequency = next(
+        (columns[f"FIRST_NAT_FREQ_{axis.upper()}"] for axis in AXES
+         if columns.get(f"FIRST_NAT_FREQ_{axis.upper()}")),
+        None
+    )
+    ratio_sigma_dop = (
+        columns["SIGMA_DOP"] / columns["SIGMA_ALT_DOP"]
+        if _positive(columns.get("SIGMA_DOP")) and _positive(columns.get("SIGMA_ALT_DOP"))
+        else None
+    )
+
+    for spectrum_type in spectrum_types:
+        suffix = SPECTRUM_SUFFIXES.get(spectrum_type)
+        if suffix is None:
+            errors.append(f"{spectrum_type}: unknown spectrum type")
+            continue
+        analysis = analyses.get(spectrum_type)
+        values = {}
+
+        # M1 / M2
+        if analysis is None:
+            m1, m2 = columns.get(f"M1_{suffix}"), columns.get(f"M2_{suffix}")
+        elif analysis["infinite"]:
+            errors.append(f"{spectrum_type}: infinite M1 (zero characteristic), not saved")
+            m1 = m2 = None
+        else:
+            m1, m2 = analysis["m1"], analysis["m2"]
+            values[f"M1_{suffix}"] = m1
+            values[f"M2_{suffix}"] = m2
+
+        # SIGMA_S_ALT
+        sigma_alt_1 = sigma_alt(columns.get(f"SIGMA_S_1_{suffix}"), columns.get(f"SIGMA_S_S1_{suffix}"), m1)
+        sigma_alt_2 = sigma_alt(columns.get(f"SIGMA_S_2_{suffix}"), columns.get(f"SIGMA_S_S2_{suffix}"), m1)
+        values[f"SIGMA_S_ALT_1_{suffix}"] = sigma_alt_1
+        values[f"SIGMA_S_ALT_2_{suffix}"] = sigma_alt_2
+
+        # K1 / K3 / N
+        if spectrum_type == "МРЗ":
+            coefficients = K_COEFFICIENTS_MRZ
+        else:
+            coefficients = K_COEFFICIENTS_PZ.get(seismic_category(columns.get("SEISMO_TXT")))
+        k = calculate_k(columns.get("SIGMA_DOP"), sigma_alt_1, sigma_alt_2, coefficients, m2)
+        values[f"N_{suffix}"] = k["n"]
+        values[f"K1_{suffix}"] = k["k1"]
+        values[f"K3_{suffix}"] = k["k3"]
+
+        # Load analysis: RATION_SIGMA_DOP, M1_ALT (shifted natural frequency), K1_ALT
+        values[f"RATION_SIGMA_DOP_{suffix}"] = ratio_sigma_dop
+        ratio_e = columns.get(f"RATIO_E_{suffix}")
+        if analysis is not None and _positive(natural_frequency) and _positive(ratio_e):
+            frequency_alt = natural_frequency / math.sqrt(ratio_e)
+            alt_analyses, _ = spectral_margins(
+                element, plots, [spectrum_type], dempf, {axis: frequency_alt for axis in AXES}
+            )
+            alt = alt_analyses.get(spectrum_type)
+            values[f"M1_ALT_{suffix}"] = alt["m1"] if alt else None
+        ratio_p = columns.get(f"RATIO_P_{suffix}")
+        if k["k1"] and ratio_p and _positive(ratio_e) and ratio_sigma_dop:
+            values[f"K1_ALT_{suffix}"] = k["k1"] / (ratio_p * ratio_e * ratio_sigma_dop)
+
+        results[spectrum_type] = {"m1": m1, "m2": m2, **values}
+        update_row.update({key: value for key, value in values.items() if value is not None})
+
+    # K2 is shared by both spectrum types: m1 and PGA of ПЗ, otherwise МРЗ
+    k2 = None
+    for spectrum_type in ("ПЗ", "МРЗ"):
+        m1 = results.get(spectrum_type, {}).get("m1")
+        if m1 is None:
+            continue
+        k2 = calculate_k2(columns.get("HCLPF"), m1, columns.get("F_MU"), element_pga(element, spectrum_type))
+        break
+    results["K2_"] = k2
+    if k2 is not None:
+        update_row["K2_"] = k2
+
+    return update_row, results, errors
+
+
+def recalculate_chunk(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process-pool entry point: recalculate a chunk of elements
+
+    payload = {"elements": [{"ek_id", "columns", "element"}], "plots": {plot_id: (freq, accel)},
+    "spectrum_types", "dempf"}; returns {"rows", "results", "errors", "processed"}.
+    """
+    rows = []
+    results = {}
+    errors = {}
+    for item in payload["elements"]:
+        ek_id = item["ek_id"]
+        try:
+            update_row, element_results, element_errors = recalculate_element(
+                item["columns"], item["element"], payload["plots"],
+                payload["spectrum_types"], payload["dempf"]
+            )
+        except Exception as e:
+            errors[ek_id] = [f"Calculation failed: {e}"]
+            continue
+        results[ek_id] = element_results
+        if element_errors:
+            errors[ek_id] = element_errors
+        if update_row:
+            rows.append({"EK_ID": ek_id, **update_row})
+    return {"rows": rows, "results": results, "errors": errors, "processed": len(payload["elements"])}
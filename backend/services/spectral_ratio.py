@@ -0,0 +1,87 @@
+"""
+Spectral ratio engine - векторизованный расчёт m1/m2 (отношение требований к характеристикам)
+
+Mirrors calculateAnalysis / calculateAnalysisWithNaturalFrequency from AnalysisModal.jsx:
+both spectra are interpolated onto the union of their frequencies (plateau outside the
+source range), optionally cut below the natural frequency, and the max ratio is taken per axis.
+"""
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+AXES = ("x", "y", "z")
+
+PlotArrays = Tuple[np.ndarray, np.ndarray]
+
+
+def interpolate_plateau(target: np.ndarray, frequencies: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Linear interpolation onto target frequencies, constant outside the source range"""
+    if frequencies.size == 0:
+        return np.zeros(target.shape, dtype=np.float64)
+    order = np.argsort(frequencies, kind="stable")
+    return np.interp(target, frequencies[order], values[order])
+
+
+def max_spectral_ratio(
+    requirement: PlotArrays,
+    characteristic: PlotArrays,
+    natural_frequency: Optional[float] = None
+) -> float:
+    """
+    Max requirement/characteristic ratio on the union frequency grid
+
+    Returns inf when the characteristic is zero where the requirement is positive,
+    and 0 when there is nothing to compare.
+    """
+    req_freq, req_accel = requirement
+    char_freq, char_accel = characteristic
+    if req_freq.size == 0 or char_freq.size == 0:
+        return 0.0
+
+    grid = np.union1d(req_freq, char_freq)
+    if natural_frequency is not None and natural_frequency > 0:
+        grid = grid[grid >= natural_frequency]
+        if grid.size == 0:
+            return 0.0
+
+    req = interpolate_plateau(grid, req_freq, req_accel)
+    char = interpolate_plateau(grid, char_freq, char_accel)
+
+    zero_char = char == 0
+    if np.any(zero_char & (req > 0)):
+        return math.inf
+
+    ratios = np.divide(req, char, out=np.zeros_like(req), where=~zero_char)
+    finite = ratios[np.isfinite(ratios)]
+    return float(finite.max()) if finite.size else 0.0
+
+
+def calculate_m1_m2(
+    requirements: Dict[str, PlotArrays],
+    characteristics: Dict[str, PlotArrays],
+    natural_frequencies: Optional[Dict[str, Optional[float]]] = None
+) -> Dict[str, float]:
+    """
+    Calculate m_{x,y,z}_max, m1 = max over axes and m2 = SRSS over axes
+
+    `requirements` / `characteristics` map axis ("x", "y", "z") to (freq, accel) arrays;
+    `natural_frequencies` maps axis to the lower frequency bound (None - whole spectrum).
+    """
+    natural_frequencies = natural_frequencies or {}
+    result = {}
+    for axis in AXES:
+        if axis in requirements and axis in characteristics:
+            result[f"m_{axis}_max"] = max_spectral_ratio(
+                requirements[axis], characteristics[axis], natural_frequencies.get(axis)
+            )
+        else:
+            result[f"m_{axis}_max"] = 0.0
+
+    maxima = [result[f"m_{axis}_max"] for axis in AXES]
+    result["m1"] = max(maxima)
+    result["m2"] = math.sqrt(sum(m ** 2 for m in maxima))
+
+    all_frequencies = [arrays[0] for arrays in (*requirements.values(), *characteristics.values())]
+    result["number_of_points"] = int(np.unique(np.concatenate(all_frequencies)).size) if all_frequencies else 0
+    return result
@@ -0,0 +1,153 @@
+"""
+Spectrum validation - векторная проверка импортируемых спектров (без записи в БД)
+
+Columns are converted to float64 arrays once and checked with array operations:
+frequencies must be finite, non-negative, strictly increasing and unique;
+accelerations must be numeric, finite and non-negative; all columns must have the
+frequency column's length. Empty cells are only warnings, since the import skips
+those rows.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Row numbers listed per problem in a report
+MAX_REPORTED_ROWS = 10
+
+
+def column_vector(values: Sequence[Any]) -> Tuple[np.ndarray, int]:
+    """Column as a float64 array (empty cells -> NaN) and the number of non-numeric cells"""
+    try:
+        return np.array(values, dtype=np.float64), 0
+    except (TypeError, ValueError):
+        vector = np.array([
+            value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+            for value in values
+        ], dtype=np.float64)
+        non_numeric = sum(1 for value in values if value is not None and not isinstance(value, (int, float)))
+        return vector, non_numeric
+
+
+def _rows(mask: np.ndarray) -> List[int]:
+    """First 1-based data row numbers where mask is set"""
+    return (np.flatnonzero(mask)[:MAX_REPORTED_ROWS] + 1).tolist()
+
+
+def validate_frequency(values: Sequence[Any]) -> Dict[str, Any]:
+    """Check the frequency column; returns {"vector", "errors", "warnings", "range"}"""
+    frequency, non_numeric = column_vector(values)
+    errors, warnings = [], []
+
+    if non_numeric:
+        errors.append(f"Frequency: {non_numeric} non-numeric cell(s)")
+    if np.isinf(frequency).any():
+        errors.append(f"Frequency: infinite values at rows {_rows(np.isinf(frequency))}")
+    negative = frequency < 0
+    if negative.any():
+        errors.append(f"Frequency: negative values at rows {_rows(negative)}")
+
+    present = np.flatnonzero(np.isfinite(frequency))
+    if present.size == 0:
+        errors.append("Frequency: no values")
+        return {"vector": frequency, "errors": errors, "warnings": warnings, "range": None}
+
+    missing = np.isnan(frequency)
+    if missing.any():
+        warnings.append(f"Frequency: {int(missing.sum())} empty cell(s), rows skipped")
+
+    steps = np.diff(frequency[present])
+    if (steps < 0).any():
+        errors.append(f"Frequency: not increasing at rows {(present[1:][steps < 0][:MAX_REPORTED_ROWS] + 1).tolist()}")
+    if (steps == 0).any():
+        errors.append(f"Frequency: duplicate values at rows {(present[1:][steps == 0][:MAX_REPORTED_ROWS] + 1).tolist()}")
+
+    finite = frequency[present]
+    return {
+        "vector": frequency,
+        "errors": errors,
+        "warnings": warnings,
+        "range": [float(finite.min()), float(finite.max())],
+    }
+
+
+def validate_acceleration(name: str, values: Sequence[Any], frequency: np.ndarray) -> Dict[str, Any]:
+    """Check one acceleration column against the frequency vector; returns {"points", "errors", "warnings"}"""
+    accel, non_numeric = column_vector(values)
+    errors, warnings = [], []
+
+    if accel.size != frequency.size:
+        errors.append(f"{name}: {accel.size} value(s), frequency column has {frequency.size}")
+    size = min(accel.size, frequency.size)
+    accel, freq = accel[:size], frequency[:size]
+
+    if non_numeric:
+        errors.append(f"{name}: {non_numeric} non-numeric cell(s)")
+    if np.isinf(accel).any():
+        errors.append(f"{name}: infinite values at rows {_rows(np.isinf(accel))}")
+    negative = accel < 0
+    if negative.any():
+        errors.append(f"{name}: negative values at rows {_rows(negative)}")
+
+    empty = np.isnan(accel) & np.isfinite(freq)
+    if empty.any():
+        warnings.append(f"{name}: {int(empty.sum())} empty cell(s) at rows {_rows(empty)}, rows skipped")
+    orphan = np.isfinite(accel) & np.isnan(freq)
+    if orphan.any():
+        warnings.append(f"{name}: values without frequency at rows {_rows(orphan)}, rows skipped")
+
+    return {
+        "points": int((np.isfinite(accel) & np.isfinite(freq)).sum()),
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
+def validate_spectrum_sheet(
+    frequency_values: Optional[Sequence[Any]],
+    columns: Dict[str, Sequence[Any]]
+) -> Dict[str, Any]:
+    """
+    Validate one sheet: frequency column plus the МРЗ/ПЗ columns that would be saved
+
+    Returns {"rows", "frequency_range", "points": {column: n}, "errors", "warnings"}.
+    """
+    if frequency_values is None:
+        return {"rows": 0, "frequency_range": None, "points": {}, "errors": ["Frequency column not found"], "warnings": []}
+
+    frequency = validate_frequency(frequency_values)
+    errors, warnings = list(frequency["errors"]), list(frequency["warnings"])
+    # Auto-filled axes share the source list: check it once, report under all names
+    shared: Dict[int, List[str]] = {}
+    for name, values in columns.items():
+        shared.setdefault(id(values), []).append(name)
+
+    points = {}
+    for names in shared.values():
+        checked = validate_acceleration("/".join(names), columns[names[0]], frequency["vector"])
+        points.update({name: checked["points"] for name in names})
+        errors.extend(checked["errors"])
+        warnings.extend(checked["warnings"])
+
+    return {
+        "rows": int(frequency["vector"].size),
+        "frequency_range": frequency["range"],
+        "points": points,
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
+def range_warnings(
+    frequency_range: Optional[List[float]],
+    existing_range: Optional[List[float]],
+    label: str
+) -> List[str]:
+    """Warn when a new spectrum does not cover the frequency range of the stored sets"""
+    if not frequency_range or not existing_range:
+        return []
+    if frequency_range[0] > existing_range[0] or frequency_range[1] < existing_range[1]:
+        return [
+            f"{label}: frequency range {frequency_range[0]:g}-{frequency_range[1]:g} Hz does not cover "
+            f"stored sets {existing_range[0]:g}-{existing_range[1]:g} Hz"
+        ]
+    return []
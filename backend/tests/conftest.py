@@ -0,0 +1,10 @@
+"""
+Shared test setup: tests import backend packages (core, services, utils, ...)
+the same way `python -m scripts.X` does, from the backend directory.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
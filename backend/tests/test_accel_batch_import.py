@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import main
+import utils.helpers as helpers
+from core import settings
+from core.database import DbSessionManager
+from models import AccelPlot, AccelPoint, AccelSet, Base, Plant, Unit
+from repositories import AccelPointRepository
+from schemas.acceleration import AccelBatchLocation
+from services.acceleration import AccelerationService
+from tests.test_excel import workbook_bytes
+from utils.excel import parse_sheets
+
+# One sheet with a column block per room
+ROWS = [
+    ["Частота, Гц", "R1 X", "R1 Y", "R2 X"],
+    [1.0, 0.1, 0.2, 0.5],
+    [2.0, 0.3, 0.4, 0.6],
+]
+
+
+@pytest.fixture
+def parsed():
+    return parse_sheets(workbook_bytes({"2%": ROWS, "5%": ROWS}))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    monkeypatch.setattr(settings, "accel_plot_dedup", False)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        Plant.__table__, Unit.__table__, AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__
+    ])
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """find_req_accel_set calls; the real query uses Oracle's ROWNUM"""
+    calls = []
+
+    def find_req_accel_set(self, db, plant_id, unit_id, building, room, calc_type, set_type):
+        calls.append((building, room))
+        return {"set_id": 99 if room == "R2" else None, "found_ek": 3}
+
+    monkeypatch.setattr(AccelerationService, "find_req_accel_set", find_req_accel_set)
+    return calls
+
+
+def import_batch(db, parsed, locations, **kwargs):
+    return AccelerationService().import_accel_batch(
+        db, parsed, plant_id=1, unit_id=2, calc_type="ДЕТ", set_type="ВИМОГИ", locations=locations, **kwargs
+    )
+
+
+def test_locations_of_one_room_share_a_lookup(db, parsed, lookups):
+    locations = [
+        AccelBatchLocation(building="A", room="R1", lev1=0, lev2=5, sheets=["2%"],
+                           columns={"R1 X": "МРЗ_X", "R1 Y": "МРЗ_Y"}),
+        AccelBatchLocation(building="A", room="R1", lev1=5, lev2=10, sheets=["5%"],
+                           columns={"R1 X": "МРЗ_X"}),
+        AccelBatchLocation(building="A", room="R2", columns={"R2 X": "МРЗ_X"}),
+    ]
+
+    result = import_batch(db, parsed, locations)
+
+    assert lookups == [("A", "R1"), ("A", "R2")]
+    assert result["groups"] == 2
+    assert result["sets_created"] == 2 + 2 + 2 * 2
+    first, second, third = result["locations"]
+    assert (first["sheets"], second["sheets"], third["sheets"]) == (["2%"], ["5%"], ["2%", "5%"])
+    assert third["existing_set_id"] == 99 and third["found_ek"] == 3
+
+    mrz = db.get(AccelSet, first["mrz_set_id"])
+    assert (mrz.ROOM, mrz.LEV1, mrz.LEV2, mrz.DEMPF) == ("R1", 0, 5, 2.0)
+    # Only the mapped columns are imported: Y comes from "R1 Y", not from the other room
+    _, accel = AccelPointRepository().get_arrays_by_plot_id(db, mrz.Y_PLOT_ID)
+    assert accel.tolist() == [0.2, 0.4]
+    _, accel = AccelPointRepository().get_arrays_by_plot_id(db, db.get(AccelSet, third["mrz_set_id"]).X_PLOT_ID)
+    assert accel.tolist() == [0.5, 0.6]
+
+
+def test_skip_existing_leaves_location_untouched(db, parsed, lookups):
+    locations = [
+        AccelBatchLocation(building="A", room="R1", sheets=["2%"], columns={"R1 X": "МРЗ_X"}),
+        AccelBatchLocation(building="A", room="R2", sheets=["2%"], columns={"R2 X": "МРЗ_X"}),
+    ]
+
+    result = import_batch(db, parsed, locations, skip_existing=True)
+
+    assert [entry["skipped"] for entry in result["locations"]] == [False, True]
+    assert "mrz_set_id" not in result["locations"][1]
+    assert {s.ROOM for s in db.scalars(select(AccelSet))} == {"R1"}
+
+
+def test_unknown_block_column_is_reported(db, parsed, lookups):
+    location = AccelBatchLocation(building="A", sheets=["2%"], columns={"R3 X": "МРЗ_X"})
+
+    with pytest.raises(ValueError, match="Sheet '2%': columns not found: R3 X"):
+        import_batch(db, parsed, [location])
+
+
+@pytest.fixture
+def client():
+    main.app.dependency_overrides[DbSessionManager.get_request_session] = lambda: None
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("mapping, status_code", [
+    ('{"plant_id": 1}', 422),
+    ('{"plant_id": 1, "unit_id": 2, "calc_type": "ДЕТ", "locations": []}', 400),
+])
+def test_endpoint_validates_mapping(client, mapping, status_code):
+    response = client.post("/api/import-accel-file/batch", data={"mapping": mapping, "upload_token": "unknown"})
+    assert response.status_code == status_code
@@ -0,0 +1,152 @@
+import contextlib
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import main
+import services.accel_import as accel_import
+import utils.helpers as helpers
+from core import settings
+from models import AccelPlot, AccelPoint, AccelSet, Base, Plant, Unit
+from schemas.acceleration import AccelDataItem
+from services.accel_import import AccelImportService, shutdown_import_jobs
+from tests.test_excel import workbook_bytes
+from utils import job_registry
+from utils.excel import parse_sheets
+
+LOCATION = {"plant_id": 1, "unit_id": 2, "building": "A", "set_type": "ВИМОГИ"}
+SAVE_LOCATION = dict(
+    LOCATION, room=None, lev=None, lev1=None, lev2=None, pga=None, calc_type="ДЕТ", ek_id=None, can_overwrite=0
+)
+SHEET = {"Частота, Гц": [1.0, 2.0], "МРЗ_X": [0.1, 0.2], "ПЗ_X": [0.3, 0.4]}
+
+
+def test_shutdown_waits_for_running_jobs_and_fails_queued(monkeypatch):
+    shutdown_import_jobs()
+    monkeypatch.setattr(accel_import.settings, "import_job_workers", 1)
+    release = threading.Event()
+
+    def run(self, job, *args):
+        job.start(message="Saving")
+        release.wait(5)
+        job.finish("done")
+
+    monkeypatch.setattr(AccelImportService, "_run", run)
+    service = AccelImportService()
+    running = service.start_job(LOCATION, sheets={})
+    queued = service.start_job(LOCATION, sheets={})
+    time.sleep(0.05)
+
+    stopper = threading.Thread(target=shutdown_import_jobs)
+    stopper.start()
+    time.sleep(0.05)
+    # The running job still holds its session: shutdown waits for it
+    assert stopper.is_alive()
+    release.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive()
+    assert running.status == "completed"
+    assert queued.status == "failed"
+    assert "shutting down" in queued.message
+    assert queued.params["building"] == "A"
+
+
+def test_pool_is_recreated_after_shutdown(monkeypatch):
+    shutdown_import_jobs()
+    monkeypatch.setattr(AccelImportService, "_run", lambda self, job, *args: job.finish("done"))
+
+    job = AccelImportService().start_job(LOCATION, sheets={})
+    shutdown_import_jobs()
+
+    assert job.status == "completed"
+    assert AccelImportService().get_job(job.id) is job
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    monkeypatch.setattr(settings, "accel_plot_dedup", False)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[
+        Plant.__table__, Unit.__table__, AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__
+    ])
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+def test_run_import_reports_progress_per_sheet(db):
+    parsed = parse_sheets(workbook_bytes({
+        "2%": [list(SHEET), *zip(*SHEET.values())],
+        "5%": [list(SHEET), *zip(*SHEET.values())],
+    }))
+    job = job_registry.create(AccelImportService.JOB_KIND)
+    messages = []
+    job.set_message = lambda message: messages.append(message)
+
+    AccelImportService().run_import(db, job, SAVE_LOCATION, parsed=parsed)
+
+    state = job.to_dict()
+    assert state["status"] == "completed"
+    assert (state["total"], state["processed"]) == (2, 2)
+    # Missing Y/Z axes are auto-filled from X
+    assert state["counters"] == {"sheets_parsed": 2, "plots_created": 12, "plots_reused": 0, "points_inserted": 24}
+    assert messages == ["Saved sheet 2%", "Saved sheet 5%"]
+    assert state["result"]["sheets"] == ["2%", "5%"]
+    assert db.scalar(select(func.count()).select_from(AccelSet)) == 4
+
+
+def test_failed_sheet_rolls_back_the_whole_import(db):
+    sheets = {
+        "2%": AccelDataItem(dempf=2.0, data=SHEET),
+        "5%": AccelDataItem(dempf=5.0, data={"МРЗ_X": [0.1]}),
+    }
+    job = job_registry.create(AccelImportService.JOB_KIND)
+
+    with pytest.raises(ValueError, match="Frequency column not found"):
+        AccelImportService().run_import(db, job, SAVE_LOCATION, sheets=sheets)
+
+    assert job.processed == 1
+    assert db.scalar(select(func.count()).select_from(AccelSet)) == 0
+    assert db.scalar(select(func.count()).select_from(AccelPoint)) == 0
+
+
+def test_failed_job_is_marked_failed(monkeypatch):
+    shutdown_import_jobs()
+
+    def run_import(self, db, job, *args):
+        raise ValueError("Sheet '5%': No header row found in first 5 rows")
+
+    monkeypatch.setattr(AccelImportService, "run_import", run_import)
+    monkeypatch.setattr(accel_import, "DbSessionContext", contextlib.nullcontext)
+
+    job = AccelImportService().start_job(LOCATION, sheets={})
+    shutdown_import_jobs()
+
+    assert job.status == "failed"
+    assert "No header row" in job.message
+
+
+def test_job_status_and_events_endpoints():
+    job = job_registry.create(AccelImportService.JOB_KIND, {"building": "A"})
+    job.start(total=1)
+    job.advance(1, points_inserted=4)
+    job.finish("done")
+    client = TestClient(main.app)
+
+    assert client.get(f"/api/import-jobs/{job.id}").json()["counters"] == {"points_inserted": 4}
+    events = client.get(f"/api/import-jobs/{job.id}/events").text
+    assert events.count("event: progress") == 1
+    assert '"status": "completed"' in events
+    assert client.get("/api/import-jobs/unknown").status_code == 404
+    other = job_registry.create("other")
+    other.finish()
+    assert client.get(f"/api/import-jobs/{other.id}").status_code == 404
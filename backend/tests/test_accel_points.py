@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import repositories.acceleration as acceleration_repositories
+import utils.helpers as helpers
+from core import settings
+from models import AccelPlot, AccelPoint, Base
+from repositories import AccelPointRepository
+from services.acceleration import AccelerationService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AccelPlot.__table__, AccelPoint.__table__])
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def point_inserts(db):
+    """Row counts of every INSERT into SRTN_ACCEL_POINT"""
+    batches = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO \"SRTN_ACCEL_POINT\""):
+            batches.append(len(parameters) if executemany else 1)
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    yield batches
+    event.remove(db.get_bind(), "before_cursor_execute", record)
+
+
+def test_bulk_insert_batches_rows(db, point_inserts, monkeypatch):
+    monkeypatch.setattr(acceleration_repositories, "BULK_INSERT_BATCH", 4)
+    db.add(AccelPlot(PLOT_ID=1, AXIS="X"))
+    frequencies = np.linspace(1.0, 10.0, 10)
+
+    inserted = AccelPointRepository().create_points_bulk(db, 1, frequencies, frequencies / 10)
+
+    assert inserted == 10
+    assert point_inserts == [4, 4, 2]
+    freq, accel = AccelPointRepository().get_arrays_by_plot_id(db, 1)
+    np.testing.assert_allclose(freq, frequencies)
+    np.testing.assert_allclose(accel, frequencies / 10)
+
+
+def test_bulk_insert_of_empty_plot(db, point_inserts):
+    assert AccelPointRepository().create_points_bulk(db, 1, [], []) == 0
+    assert point_inserts == []
+
+
+def test_create_plot_skips_incomplete_rows(db, point_inserts, monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    monkeypatch.setattr(settings, "accel_plot_dedup", False)
+    stats = {"plots_created": 0, "plots_reused": 0, "points_inserted": 0}
+
+    plot_id = AccelerationService()._create_plot_with_points(
+        db, "X", "5%", [1.0, 2.0, None, 4.0], [0.1, None, 0.3, 0.4], stats
+    )
+
+    assert point_inserts == [2]
+    assert stats == {"plots_created": 1, "plots_reused": 0, "points_inserted": 2}
+    freq, accel = AccelPointRepository().get_arrays_by_plot_id(db, plot_id)
+    assert freq.tolist() == [1.0, 4.0]
+    assert accel.tolist() == [0.1, 0.4]
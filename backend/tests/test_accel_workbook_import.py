@@ -0,0 +1,122 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import main
+import utils.helpers as helpers
+from core import settings
+from core.database import DbSessionManager
+from models import AccelPlot, AccelPoint, AccelSet, Base, Plant, Unit
+from services.acceleration import AccelerationService
+from tests.test_excel import workbook_bytes
+from utils.excel import parse_sheets
+from utils.upload_cache import content_token, upload_cache
+
+HEADER = ["Частота, Гц", "МРЗ_X", "МРЗ_Y", "МРЗ_Z", "ПЗ_X", "ПЗ_Y", "ПЗ_Z"]
+ROWS = [HEADER, [1.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6], [2.0, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]]
+LOCATION = {
+    "plant_id": 1,
+    "unit_id": 2,
+    "building": "A",
+    "room": None,
+    "lev": None,
+    "lev1": None,
+    "lev2": None,
+    "pga": 0.1,
+    "calc_type": "ДЕТ",
+    "set_type": "ВИМОГИ",
+    "ek_id": None,
+    "can_overwrite": 0,
+}
+
+
+@pytest.fixture
+def parsed():
+    return parse_sheets(workbook_bytes({"2%": ROWS, "Notes": [["text"]], "5%": ROWS}))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    monkeypatch.setattr(settings, "accel_plot_dedup", False)
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[
+        Plant.__table__, Unit.__table__, AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__
+    ])
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        session.add_all([Plant(PLANT_ID=1, NAME="ЗАЕС"), Unit(UNIT_ID=2, PLANT_ID=1, NAME="Блок 2")])
+        session.commit()
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+def test_workbook_sheets_selects_damping_sheets(parsed):
+    service = AccelerationService()
+
+    sheets = service.workbook_sheets(parsed, None, "ВИМОГИ")
+    assert {name: sheet.dempf for name, sheet in sheets.items()} == {"2%": 2.0, "5%": 5.0}
+
+    assert list(service.workbook_sheets(parsed, ["5%"], "ВИМОГИ")) == ["5%"]
+    assert list(service.workbook_sheets(parsed, None, "ХАРАКТЕРИСТИКИ")) == ["2%"]
+
+
+@pytest.mark.parametrize("sheet_names, message", [
+    (["7%"], "Sheets not found in Excel file: 7%"),
+    (["Notes"], "Sheet 'Notes'"),
+])
+def test_workbook_sheets_rejects_bad_selection(parsed, sheet_names, message):
+    with pytest.raises(ValueError, match=message):
+        AccelerationService().workbook_sheets(parsed, sheet_names, "ВИМОГИ")
+
+
+def test_import_saves_every_damping_sheet(db, parsed):
+    result = AccelerationService().import_accel_workbook(db, parsed, None, **LOCATION)
+
+    assert result["sheets"] == ["2%", "5%"]
+    assert result["points_inserted"] == 2 * 2 * 6
+    sets = db.scalars(select(AccelSet).order_by(AccelSet.ACCEL_SET_ID)).all()
+    assert [(s.SPECTR_EARTHQ_TYPE, s.DEMPF) for s in sets] == [("МРЗ", 2.0), ("ПЗ", 2.0), ("МРЗ", 5.0), ("ПЗ", 5.0)]
+    assert {(s.PLANT_NAME, s.UNIT_NAME, s.BUILDING) for s in sets} == {("ЗАЕС", "Блок 2", "A")}
+
+
+@pytest.fixture
+def client(db):
+    main.app.dependency_overrides[DbSessionManager.get_request_session] = lambda: db
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def form(**fields):
+    return {key: str(value) for key, value in dict(LOCATION, **fields).items() if value is not None}
+
+
+def test_endpoint_imports_cached_upload(client, db, parsed):
+    token = content_token(b"test_endpoint_imports_cached_upload")
+    upload_cache.put(token, parsed)
+
+    response = client.post("/api/import-accel-file", data=form(upload_token=token, sheet_names="5%"))
+
+    assert response.status_code == 200
+    assert response.json()["upload_token"] == token
+    assert response.json()["sheets"] == ["5%"]
+    assert db.scalar(select(func.count()).select_from(AccelSet)) == 2
+
+
+def test_endpoint_dry_run_writes_nothing(client, db, parsed):
+    token = content_token(b"test_endpoint_dry_run_writes_nothing")
+    upload_cache.put(token, parsed)
+
+    response = client.post("/api/import-accel-file", data=form(upload_token=token, dry_run="true"))
+
+    assert response.status_code == 200
+    assert response.json()["sheet_names"] == ["2%", "5%"]
+    assert db.scalar(select(func.count()).select_from(AccelPoint)) == 0
+
+
+def test_endpoint_asks_for_upload_again_when_token_expired(client):
+    response = client.post("/api/import-accel-file", data=form(upload_token="unknown"))
+    assert response.status_code == 410
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.damping_interpolation import (
+    available_dempfs,
+    bracket_damping,
+    damping_weight,
+    interpolate_damping_spectra,
+    interpolate_pga,
+)
+
+
+def test_available_dempfs_skips_null_and_duplicates():
+    assert available_dempfs([5, None, 2.0, 5.0, 7]) == [2.0, 5.0, 7.0]
+
+
+@pytest.mark.parametrize("dempf, expected", [
+    (2.0, (2.0, 2.0)),
+    (3.0, (2.0, 5.0)),
+    (5.0, (5.0, 5.0)),
+    (6.0, (5.0, 7.0)),
+    (1.0, None),
+    (8.0, None),
+])
+def test_bracket_damping(dempf, expected):
+    assert bracket_damping([2.0, 5.0, 7.0], dempf) == expected
+
+
+def test_damping_weight():
+    assert damping_weight(2.0, 2.0, 5.0) == 0.0
+    assert damping_weight(5.0, 2.0, 5.0) == pytest.approx(1.0)
+    assert damping_weight(3.0, 2.0, 5.0) == pytest.approx(math.log(1.5) / math.log(2.5))
+    assert damping_weight(3.0, 2.0, 5.0, "linear") == pytest.approx(1 / 3)
+    assert damping_weight(4.0, 4.0, 4.0) == 0.0
+    with pytest.raises(ValueError):
+        damping_weight(3.0, 2.0, 5.0, "cubic")
+
+
+def test_interpolate_damping_spectra_common_grid():
+    lower = {"x": (np.array([1.0, 3.0]), np.array([1.0, 3.0]))}
+    upper = {"x": (np.array([2.0, 3.0]), np.array([4.0, 6.0])), "y": (np.array([1.0]), np.array([1.0]))}
+    grid, result = interpolate_damping_spectra(lower, upper, 0.5)
+
+    assert grid.tolist() == [1.0, 2.0, 3.0]
+    # Upper set is held at its first value below its range (plateau)
+    assert result["x"].tolist() == pytest.approx([2.5, 3.0, 4.5])
+    assert result["y"] is None
+    assert result["z"] is None
+
+
+def test_interpolate_pga():
+    assert interpolate_pga(0.1, 0.3, 0.5) == pytest.approx(0.2)
+    assert interpolate_pga(None, 0.3, 0.5) == 0.3
+    assert interpolate_pga(0.1, None, 0.5) == 0.1
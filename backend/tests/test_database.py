@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+
+import anyio
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+
+import main
+from core import DbSessionContext, DbSessionDep, DbSessionManager, configure_request_threads, pool_metrics, settings
+from core.database import MeteredQueuePool, PoolMetrics, SessionSlots
+from utils.streaming import ndjson_response
+
+
+def test_async_waiters_are_served_in_order():
+    async def run():
+        slots = SessionSlots(1)
+        order = []
+
+        async def worker(name):
+            await slots.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            slots.release()
+
+        await asyncio.gather(*(worker(name) for name in "abc"))
+        return order, slots.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == ["a", "b", "c"]
+    assert stats == {"total": 1, "in_use": 0, "waiting": 0}
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        slots = SessionSlots(1)
+        await slots.acquire()
+        waiter = asyncio.create_task(slots.acquire())
+        await asyncio.sleep(0)
+        assert slots.stats()["waiting"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        slots.release()
+        return slots.stats()
+
+    assert asyncio.run(run()) == {"total": 1, "in_use": 0, "waiting": 0}
+
+
+def test_threads_and_event_loop_share_slots():
+    slots = SessionSlots(1)
+    acquired = threading.Event()
+
+    def job():
+        slots.acquire_blocking()
+        acquired.set()
+        slots.release()
+
+    async def run():
+        await slots.acquire()
+        thread = threading.Thread(target=job)
+        thread.start()
+        await asyncio.sleep(0.05)
+        # The job waits while the request holds the only slot
+        assert not acquired.is_set()
+        slots.release()
+        await asyncio.to_thread(thread.join, 5)
+
+    asyncio.run(run())
+    assert acquired.is_set()
+    assert slots.stats()["in_use"] == 0
+
+
+@pytest.fixture
+def db_manager(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE T (ID INTEGER)"))
+        connection.execute(text("INSERT INTO T VALUES (1), (2), (3)"))
+    monkeypatch.setattr(DbSessionManager, "_engine", engine)
+    monkeypatch.setattr(DbSessionManager, "_session_maker", sessionmaker(bind=engine))
+    monkeypatch.setattr(DbSessionManager, "_slots", SessionSlots(2))
+    yield DbSessionManager
+    engine.dispose()
+
+
+def test_session_context_takes_a_slot(db_manager):
+    slots = db_manager.session_slots()
+    with DbSessionContext():
+        assert slots.stats()["in_use"] == 1
+        with DbSessionContext(slot=False):
+            assert slots.stats()["in_use"] == 1
+    assert slots.stats()["in_use"] == 0
+
+
+def test_ndjson_stream_holds_a_slot_while_streaming(db_manager):
+    slots = db_manager.session_slots()
+    in_use = []
+
+    def produce(db):
+        for (row_id,) in db.execute(text("SELECT ID FROM T ORDER BY ID")):
+            in_use.append(slots.stats()["in_use"])
+            yield {"ID": row_id}
+
+    app = FastAPI()
+    app.add_api_route("/stream", lambda: ndjson_response(produce, batch_rows=1))
+
+    response = TestClient(app).get("/stream")
+
+    assert response.text.splitlines() == ['{"ID": 1}', '{"ID": 2}', '{"ID": 3}']
+    assert in_use == [1, 1, 1]
+    assert slots.stats()["in_use"] == 0
+
+
+def test_request_sessions_wait_for_slots(db_manager):
+    peak = []
+    app = FastAPI()
+
+    @app.get("/query")
+    def query(db: DbSessionDep):
+        peak.append(db_manager.session_slots().stats()["in_use"])
+        time.sleep(0.02)
+        return db.execute(text("SELECT COUNT(*) FROM T")).scalar()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/query") for _ in range(6)))
+
+    responses = asyncio.run(run())
+
+    assert [response.json() for response in responses] == [3] * 6
+    assert max(peak) <= 2
+    assert db_manager.session_slots().stats() == {"total": 2, "in_use": 0, "waiting": 0}
+
+
+def test_pool_metrics_stats():
+    metrics = PoolMetrics()
+    metrics.record_wait(0.002)
+    metrics.record_wait(0.004)
+    metrics.record_connect()
+    metrics.record_timeout()
+
+    assert metrics.stats() == {
+        "checkouts": 2,
+        "connects": 1,
+        "timeouts": 1,
+        "wait_ms_total": 6.0,
+        "wait_ms_avg": 3.0,
+        "wait_ms_max": 4.0,
+    }
+    metrics.reset()
+    assert metrics.stats()["wait_ms_avg"] == 0.0
+
+
+@pytest.fixture
+def metered_pool(monkeypatch, tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.05,
+        connect_args={"check_same_thread": False},
+    )
+    monkeypatch.setattr(DbSessionManager, "_engine", engine)
+    monkeypatch.setattr(DbSessionManager, "_slots", SessionSlots(2))
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    pool_metrics.reset()
+    yield engine
+    pool_metrics.reset()
+    engine.dispose()
+
+
+def test_warm_up_opens_at_most_the_pool_size(metered_pool):
+    assert DbSessionManager.warm_up(5) == 2
+
+    stats = DbSessionManager.pool_stats()
+    assert (stats["size"], stats["checked_in"], stats["checked_out"]) == (2, 2, 0)
+    assert (stats["checkouts"], stats["connects"]) == (2, 2)
+
+    # Warm connections are reused
+    with metered_pool.connect():
+        pass
+    assert pool_metrics.stats()["connects"] == 2
+
+
+def test_checkout_timeouts_are_counted(metered_pool):
+    first, second = metered_pool.connect(), metered_pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        metered_pool.connect()
+    first.close()
+    second.close()
+
+    stats = pool_metrics.stats()
+    assert (stats["checkouts"], stats["timeouts"]) == (3, 1)
+    assert stats["wait_ms_max"] >= 50
+
+
+def test_pool_stats_endpoint(metered_pool):
+    response = TestClient(main.app).get("/health/db-pool")
+
+    assert response.status_code == 200
+    assert response.json()["session_slots"] == {"total": 2, "in_use": 0, "waiting": 0}
+    assert response.json()["max_overflow"] == 0
+
+
+def test_request_threads_setting(monkeypatch):
+    async def run():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        default = configure_request_threads()
+        monkeypatch.setattr(settings, "request_threads", 8)
+        configured = configure_request_threads()
+        limiter.total_tokens = default
+        return default, configured
+
+    monkeypatch.setattr(settings, "request_threads", 0)
+    assert anyio.run(run) == (40, 8)
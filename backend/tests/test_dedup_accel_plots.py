@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import scripts.dedup_accel_plots as dedup
+import utils.helpers as helpers
+from models import AccelPlot, AccelPlotHash, AccelPoint, AccelSet, Base
+from services.acceleration import AccelerationService
+
+SPECTRUM = ([1.0, 2.0, 5.0], [0.1, 0.3, 0.2])
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    tables = [AccelPlot.__table__, AccelPoint.__table__, AccelPlotHash.__table__, AccelSet.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+def add_set(db, set_id: int, plot_id: int):
+    db.add(AccelPlot(PLOT_ID=plot_id, AXIS="X"))
+    db.add_all(AccelPoint(PLOT_ID=plot_id, FREQ=freq, ACCEL=accel) for freq, accel in zip(*SPECTRUM))
+    db.add(AccelSet(ACCEL_SET_ID=set_id, X_PLOT_ID=plot_id))
+
+
+def test_relink_refused_without_dedup_setting(monkeypatch, capsys):
+    monkeypatch.setattr(dedup.settings, "accel_plot_dedup", False)
+    assert not dedup.relink_allowed(procedures_safe=False)
+    assert "Not relinking" in capsys.readouterr().out
+
+
+def test_relink_allowed_with_setting_or_flag(monkeypatch, capsys):
+    monkeypatch.setattr(dedup.settings, "accel_plot_dedup", True)
+    assert dedup.relink_allowed(procedures_safe=False)
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setattr(dedup.settings, "accel_plot_dedup", False)
+    assert dedup.relink_allowed(procedures_safe=True)
+    assert "WARNING" in capsys.readouterr().out
+
+
+def test_clearing_relinked_set_keeps_shared_plot(db):
+    add_set(db, set_id=1, plot_id=10)
+    add_set(db, set_id=2, plot_id=20)
+    db.flush()
+
+    dedup.hash_batch(db, [10, 20])
+    groups = dedup.duplicate_groups(db)
+    assert groups == {10: [20]}
+    assert dedup.relink_batch(db, {20: 10}, delete_duplicates=True) == 1
+    assert db.get(AccelSet, 2).X_PLOT_ID == 10
+    assert db.get(AccelPlot, 20) is None
+
+    AccelerationService().clear_accel_set(db, 1)
+    db.expire_all()
+
+    assert db.get(AccelSet, 1).X_PLOT_ID is None
+    assert db.get(AccelSet, 2).X_PLOT_ID == 10
+    assert db.get(AccelPlot, 10) is not None
+    assert db.query(AccelPoint).filter(AccelPoint.PLOT_ID == 10).count() == len(SPECTRUM[0])
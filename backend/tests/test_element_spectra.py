@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import utils.helpers as helpers
+from core import settings
+from models import AccelPlot, AccelPlotPacked, AccelPoint, AccelSet, Base, EkSeismData
+from repositories import AccelSetRepository
+from utils.helpers import pack_vector
+
+TABLES = [EkSeismData.__table__, AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__]
+
+
+def make_db(tables):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=tables)
+    helpers._packed_table_state.clear()
+    db = Session(engine)
+    db.add_all([AccelPlot(PLOT_ID=plot_id) for plot_id in (1, 2, 3, 4)])
+    db.add(AccelSet(ACCEL_SET_ID=10, SET_TYPE="ВИМОГИ", PGA_=0.1, X_PLOT_ID=1, Y_PLOT_ID=2, Z_PLOT_ID=2))
+    db.add(AccelSet(ACCEL_SET_ID=20, SET_TYPE="ВИМОГИ", PGA_=0.2, X_PLOT_ID=3, Y_PLOT_ID=4, Z_PLOT_ID=None))
+    db.add(EkSeismData(EK_ID=1, ACCEL_SET_ID_MRZ=10, ACCEL_SET_ID_PZ=20, F_MU=1.5))
+    db.add(EkSeismData(EK_ID=2, ACCEL_SET_ID_MRZ=10, ACCEL_SET_ID_PZ=None))
+    # Points are inserted out of frequency order
+    for plot_id, points in {1: [(2.0, 0.2), (1.0, 0.1)], 2: [(1.0, 0.5)], 3: [(5.0, 0.3), (3.0, 0.1)]}.items():
+        db.add_all([AccelPoint(PLOT_ID=plot_id, FREQ=freq, ACCEL=accel) for freq, accel in points])
+    db.flush()
+    return engine, db
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    engine, session = make_db(TABLES)
+    yield session
+    session.close()
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(db):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    yield executed
+    event.remove(db.get_bind(), "before_cursor_execute", record)
+
+
+def test_both_spectra_in_one_statement(db, statements):
+    # The packed-table check is cached per database, not part of the query
+    helpers.packed_plots_available(db)
+    statements.clear()
+
+    spectra = AccelSetRepository().get_element_spectra(db, 1)
+
+    assert len(statements) == 1
+    assert spectra.keys() == {"МРЗ", "ПЗ"}
+    mrz = spectra["МРЗ"]
+    assert (mrz["ACCEL_SET_ID"], mrz["PGA_"], mrz["F_MU"]) == (10, 0.1, 1.5)
+    assert mrz["plot_ids"] == {"X": 1, "Y": 2, "Z": 2}
+    assert mrz["plots"]["X"][0].tolist() == [1.0, 2.0]
+    assert mrz["plots"]["X"][1].tolist() == [0.1, 0.2]
+    # Two axes share one plot
+    assert mrz["plots"]["Y"][1].tolist() == mrz["plots"]["Z"][1].tolist() == [0.5]
+
+    pz = spectra["ПЗ"]
+    assert pz["plots"]["X"][0].tolist() == [3.0, 5.0]
+    # Plot without points gives empty arrays, missing plot is omitted
+    assert pz["plots"]["Y"][0].size == 0
+    assert "Z" not in pz["plots"]
+
+
+def test_spectrum_filter_and_unassigned_sets(db):
+    assert AccelSetRepository().get_element_spectra(db, 1, "ПЗ").keys() == {"ПЗ"}
+    assert AccelSetRepository().get_element_spectra(db, 2).keys() == {"МРЗ"}
+    assert AccelSetRepository().get_element_spectra(db, 3) == {}
+
+
+def test_packed_plots_take_precedence(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    engine, db = make_db(TABLES + [AccelPlotPacked.__table__])
+    db.add(AccelPlotPacked(PLOT_ID=1, POINT_COUNT=3, FREQ_DATA=pack_vector([1.0, 2.0, 4.0]),
+                           ACCEL_DATA=pack_vector([0.7, 0.8, 0.9])))
+    db.flush()
+
+    plots = AccelSetRepository().get_element_spectra(db, 1, "МРЗ")["МРЗ"]["plots"]
+
+    assert plots["X"][0].tolist() == [1.0, 2.0, 4.0]
+    assert plots["X"][1].tolist() == [0.7, 0.8, 0.9]
+    assert plots["Y"][1].tolist() == [0.5]
+    db.close()
+    helpers._packed_table_state.clear()
+    engine.dispose()
@@ -0,0 +1,112 @@
+import io
+import re
+import zipfile
+
+import openpyxl
+import pytest
+
+from utils.excel import (
+    SheetFormatError,
+    extract_sheet_columns,
+    is_frequency_column,
+    is_percentage_sheet,
+    open_workbook,
+    parse_sheets,
+    sheet_dempf,
+    sheet_groups,
+)
+
+
+def workbook_bytes(sheets, declare_dimension: bool = True) -> bytes:
+    """Build an .xlsx from {sheet name: rows}; optionally drop <dimension> like some writers do"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    if declare_dimension:
+        return buffer.getvalue()
+
+    source = zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension [^>]*/>", b"", data)
+            target.writestr(item, data)
+    return output.getvalue()
+
+
+RAGGED_ROWS = [
+    ["Частота, Гц", "X", "Y"],
+    [1.0, 0.1, 0.2],
+    [2.0, 0.3],
+    [3.0],
+    [4.0, None, 0.5],
+]
+
+
+@pytest.mark.parametrize("declare_dimension", [True, False])
+def test_ragged_rows_keep_columns_aligned(declare_dimension):
+    content = workbook_bytes({"5%": RAGGED_ROWS}, declare_dimension)
+    workbook = open_workbook(content)
+    try:
+        data = extract_sheet_columns(workbook["5%"])
+    finally:
+        workbook.close()
+
+    assert data == {
+        "Частота, Гц": [1.0, 2.0, 3.0, 4.0],
+        "X": [0.1, 0.3, None, None],
+        "Y": [0.2, None, None, 0.5],
+    }
+
+
+def test_parse_sheets_reports_rows_and_errors():
+    content = workbook_bytes({"5%": RAGGED_ROWS, "empty": [], "numbers": [[1.0, 2.0]]})
+
+    parsed = parse_sheets(content)
+
+    assert list(parsed) == ["5%", "empty", "numbers"]
+    assert parsed["5%"]["rows"] == 5
+    assert parsed["5%"]["error"] is None
+    assert parsed["empty"]["data"] is None
+    assert parsed["numbers"]["error"] == "No header row found in first 5 rows"
+    assert parse_sheets(content, ["missing", "5%"]).keys() == {"5%"}
+
+
+def test_header_row_found_below_title_rows():
+    content = workbook_bytes({"sheet": [[None], [1.0], ["freq", "accel"], [1.0, 0.5]]})
+    workbook = open_workbook(content)
+    try:
+        assert extract_sheet_columns(workbook["sheet"]) == {"freq": [1.0], "accel": [0.5]}
+    finally:
+        workbook.close()
+
+
+def test_sheet_without_header_raises():
+    content = workbook_bytes({"sheet": [[1.0]] * 6})
+    workbook = open_workbook(content)
+    try:
+        with pytest.raises(SheetFormatError):
+            extract_sheet_columns(workbook["sheet"])
+    finally:
+        workbook.close()
+
+
+def test_sheet_name_helpers():
+    assert is_percentage_sheet("4%") and is_percentage_sheet(" 1,2% ") and is_percentage_sheet("0.2%")
+    assert not is_percentage_sheet("Лист1")
+    assert sheet_dempf("1,2%") == 1.2
+    assert is_frequency_column("Частота, Гц") and is_frequency_column("Freq.")
+    assert not is_frequency_column("X")
+
+
+def test_sheet_groups_round_robin():
+    assert sheet_groups(["a", "b", "c"], workers=4, parallel_min_sheets=4) == [["a", "b", "c"]]
+    assert sheet_groups(["a", "b", "c", "d", "e"], workers=2, parallel_min_sheets=4) == [["a", "c", "e"], ["b", "d"]]
+    assert sheet_groups(["a", "b"], workers=1) == [["a", "b"]]
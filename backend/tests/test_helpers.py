@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import utils.helpers as helpers
+from models import AccelPlot, AccelPlotPacked, AccelPoint, Base
+from utils.helpers import get_plot_data, pack_vector, packed_plots_available, unpack_vector
+from utils.plot_cache import plot_cache
+
+
+def test_pack_unpack_roundtrip():
+    values = [0.1, 1.5, 33.333333333333336, 1e-12, 250.0]
+    packed = pack_vector(values)
+
+    assert len(packed) == 8 * len(values)
+    unpacked = unpack_vector(packed)
+    assert unpacked.dtype == np.float64
+    assert unpacked.tolist() == values
+
+
+def test_pack_vector_is_little_endian_float64():
+    assert pack_vector([1.0]) == b"\x00\x00\x00\x00\x00\x00\xf0\x3f"
+
+
+@pytest.mark.parametrize("data", [None, b""])
+def test_unpack_empty(data):
+    assert unpack_vector(data).size == 0
+
+
+def test_unpacked_vector_is_writable():
+    # frombuffer views are read-only; callers sort and scale the arrays in place
+    unpacked = unpack_vector(pack_vector([2.0, 1.0]))
+    unpacked.sort()
+    assert unpacked.tolist() == [1.0, 2.0]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AccelPlot.__table__, AccelPoint.__table__])
+    helpers._packed_table_state.clear()
+    plot_cache.invalidate([1])
+    with Session(engine) as session:
+        session.add(AccelPlot(PLOT_ID=1, AXIS="X", NAME="plot"))
+        session.add_all([AccelPoint(PLOT_ID=1, FREQ=f, ACCEL=f * 2) for f in (3.0, 1.0, 2.0)])
+        session.commit()
+        yield session
+    helpers._packed_table_state.clear()
+    plot_cache.invalidate([1])
+    engine.dispose()
+
+
+def test_points_storage_without_packed_table(db):
+    assert not packed_plots_available(db)
+    assert get_plot_data(db, 1) == ([1.0, 2.0, 3.0], [2.0, 4.0, 6.0])
+
+
+def test_packed_row_takes_precedence(db):
+    AccelPlotPacked.__table__.create(db.connection())
+    db.add(AccelPlotPacked(PLOT_ID=1, POINT_COUNT=2, FREQ_DATA=pack_vector([5.0, 6.0]),
+                           ACCEL_DATA=pack_vector([0.5, 0.6])))
+    db.flush()
+    helpers._packed_table_state.clear()
+
+    assert packed_plots_available(db)
+    assert get_plot_data(db, 1) == ([5.0, 6.0], [0.5, 0.6])
@@ -0,0 +1,44 @@
+from utils.jobs import Job, JobRegistry
+
+
+def test_job_progress_and_counters():
+    job = Job("accel_import", {"building": "A"})
+    assert job.to_dict()["progress"] == 0.0
+
+    job.start(total=4, message="Saving")
+    job.advance(1, points_inserted=10)
+    job.advance(1, errors={"5%": ["bad row"]}, points_inserted=5, plots_created=3)
+
+    state = job.to_dict()
+    assert (state["status"], state["processed"], state["progress"]) == ("running", 2, 0.5)
+    assert state["counters"] == {"points_inserted": 15, "plots_created": 3}
+    assert state["errors"] == {"5%": ["bad row"]}
+    assert "errors" not in job.to_dict(include_errors=False)
+
+    job.finish("done", {"sets": 2})
+    state = job.to_dict()
+    assert state["status"] == "completed" and state["result"] == {"sets": 2}
+    assert state["finished_at"] is not None
+
+
+def test_job_without_total_reports_done_when_finished():
+    job = Job("accel_import")
+    job.fail("broken")
+    assert job.finished
+    assert job.to_dict()["progress"] == 1.0
+
+
+def test_registry_drops_oldest_finished_jobs_first():
+    registry = JobRegistry(max_jobs=2)
+    running = registry.create("a")
+    finished = registry.create("b")
+    finished.finish()
+
+    newest = registry.create("a")
+
+    assert registry.get(finished.id) is None
+    assert registry.list() == [running, newest]
+    assert registry.list("a") == [running, newest]
+    # Running jobs are never dropped, even above the limit
+    registry.create("a")
+    assert len(registry.list()) == 3
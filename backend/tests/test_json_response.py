@@ -0,0 +1,90 @@
+import datetime
+import decimal
+import json
+from typing import List
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+import main
+from api.endpoints import acceleration, search
+from core.database import DbSessionManager
+from schemas import SearchData, SpectralDataResult
+from utils.json_response import FastJSONResponse
+
+
+def render(content):
+    return json.loads(FastJSONResponse(content).body)
+
+
+def test_numpy_values_are_serialized_natively():
+    content = {"frequency": np.array([1.0, 2.5]), "count": np.int64(3), "pga": np.float32(0.5)}
+    assert render(content) == {"frequency": [1.0, 2.5], "count": 3, "pga": 0.5}
+
+
+def test_int_keys_nan_and_db_values():
+    content = {
+        1: float("nan"),
+        2: float("inf"),
+        "date": datetime.date(2024, 5, 1),
+        "amount": decimal.Decimal("1.25"),
+        "blob": b"\x00",
+    }
+    assert render(content) == {"1": None, "2": None, "date": "2024-05-01", "amount": 1.25, "blob": None}
+
+
+@pytest.fixture
+def client():
+    main.app.dependency_overrides[DbSessionManager.get_request_session] = lambda: None
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def test_app_default_renders_plain_dicts_with_orjson(client, monkeypatch):
+    monkeypatch.setattr(
+        acceleration.acceleration_service, "get_available_damping_factors", lambda *args: [np.float64(2.0), float("nan")]
+    )
+
+    response = client.get(
+        "/api/available-damping-factors", params={"ek_id": 1, "spectr_earthq_type": "МРЗ", "calc_type": "ДЕТ"}
+    )
+
+    # The stdlib JSONResponse rejects NaN
+    assert response.status_code == 200
+    assert response.json() == {"damping_factors": [2.0, None]}
+
+
+def test_spectral_data_bypass_matches_schema(client, monkeypatch):
+    data = {"frequency": [1.0, 2.0], "mrz_x": [0.1, 0.2], "mrz_y": [0.3, 0.4], "mrz_z": [0.5, 0.6]}
+    monkeypatch.setattr(acceleration.acceleration_service, "get_spectral_data", lambda db, ek_id, spectrum_type: data)
+
+    response = client.get("/api/spectral-data", params={"ek_id": 1, "calc_type": "ДЕТ", "spectrum_type": "МРЗ"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert SpectralDataResult.model_validate(body).model_dump() == body
+    assert body["pz_x"] is None
+
+
+def test_search_page_matches_schema_and_sends_cursor(client, monkeypatch):
+    rows = [{"data": {"EK_ID": 1, "NAME": "a"}}, {"data": {"EK_ID": 2, "NAME": None}}]
+    monkeypatch.setattr(search.search_service, "search_page", lambda *args, **kwargs: (rows, "next"))
+
+    response = client.get("/api/search", params={"plant_id": 1, "unit_id": 1, "t_id": 1, "limit": 2})
+
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == "next"
+    assert TypeAdapter(List[SearchData]).validate_python(response.json())
+    assert response.json() == rows
+
+
+def test_openapi_documents_bypass_routes():
+    paths = main.app.openapi()["paths"]
+    search_ok = paths["/api/search"]["get"]["responses"]["200"]
+    assert search_ok["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/SearchData")
+    assert "X-Next-Cursor" in search_ok["headers"]
+
+    spectral_ok = paths["/api/spectral-data"]["get"]["responses"]["200"]
+    assert spectral_ok["content"]["application/json"]["schema"]["$ref"].endswith("/SpectralDataResult")
@@ -0,0 +1,93 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+
+from models import AccelPlot, AccelPoint, AccelSet, Base, EkSeismData
+from repositories.base import room_condition
+
+VERSIONS = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+
+
+def load_migration(file_name: str):
+    spec = importlib.util.spec_from_file_location(file_name[:-3], VERSIONS / file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("room, column, expected", [
+    (None, "ROOM", "ROOM IS NULL"),
+    ("", "ROOM", "ROOM IS NULL"),
+    ("R1", "ROOM", "ROOM = :room"),
+    ("R1", "s.ROOM", "s.ROOM = :room"),
+])
+def test_room_condition(room, column, expected):
+    assert room_condition(room, column) == expected
+
+
+def test_room_condition_matches_like_the_or_expression():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE T (ID INTEGER, ROOM TEXT)"))
+        connection.execute(text("INSERT INTO T VALUES (1, NULL), (2, 'R1'), (3, 'R2')"))
+        for room in (None, "R1", "R3"):
+            old = connection.execute(
+                text("SELECT ID FROM T WHERE (:room IS NULL AND ROOM IS NULL) OR ROOM = :room ORDER BY ID"),
+                {"room": room},
+            ).scalars().all()
+            new = connection.execute(
+                text(f"SELECT ID FROM T WHERE {room_condition(room)} ORDER BY ID"), {"room": room}
+            ).scalars().all()
+            assert new == old
+    engine.dispose()
+
+
+def test_models_declare_the_migration_indexes():
+    migration = load_migration("0002_spectrum_lookup_indexes.py")
+    declared = {
+        index.name: (table.name, [column.name for column in index.columns])
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+    for name, table_name, columns in migration.INDEXES:
+        assert declared[name] == (table_name, columns)
+        assert len(name) <= 30
+
+
+def test_upgrade_creates_missing_indexes_once():
+    engine = create_engine("sqlite://")
+    tables = [AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__, EkSeismData.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    migration = load_migration("0002_spectrum_lookup_indexes.py")
+    side_tables = load_migration("0001_accel_plot_side_tables.py")
+
+    def index_names():
+        inspector = inspect(engine)
+        return {index["name"] for table in tables for index in inspector.get_indexes(table.name)}
+
+    with engine.begin() as connection:
+        for name in index_names():
+            connection.execute(text(f'DROP INDEX "{name}"'))
+
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            side_tables.upgrade()
+            migration.upgrade()
+            # Existing indexes and tables are skipped
+            side_tables.upgrade()
+            migration.upgrade()
+
+    assert index_names() == {name for name, _, _ in migration.INDEXES}
+    assert inspect(engine).has_table("SRTN_ACCEL_PLOT_PACKED")
+    assert [index["name"] for index in inspect(engine).get_indexes("SRTN_ACCEL_PLOT_HASH")] == ["IX_ACCEL_PLOT_HASH_HASH"]
+
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.downgrade()
+    assert index_names() == set()
+    engine.dispose()
@@ -0,0 +1,126 @@
+import asyncio
+import importlib
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from api.endpoints import excel
+from utils.parse_pool import ParsePool, ParsePoolBusy, ParsePoolUnavailable
+
+# utils re-exports the parse_pool instance under the module's name
+parse_pool_module = importlib.import_module("utils.parse_pool")
+
+
+def fake_sheet_names(content: bytes):
+    return ["Sheet"]
+
+
+def fake_parse_sheets(content: bytes, sheet_names):
+    """Runs in a worker process: b"oserror" raises, b"crash" kills the worker"""
+    if content == b"oserror":
+        raise OSError("disk went away")
+    if content == b"crash":
+        os._exit(1)
+    time.sleep(0.3)
+    return {name: {"columns": {"value": [content.decode()]}} for name in sheet_names}
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(parse_pool_module, "workbook_sheet_names", fake_sheet_names)
+    monkeypatch.setattr(parse_pool_module, "parse_sheets", fake_parse_sheets)
+    pool = ParsePool(workers=2, max_queue=6, parallel_min_sheets=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_error_in_one_parse_does_not_cancel_others(pool):
+    async def run():
+        # The healthy workbooks are still queued when the failing one returns
+        failing = asyncio.create_task(pool.parse(b"oserror"))
+        healthy = [asyncio.create_task(pool.parse(b"ok")) for _ in range(6)]
+        with pytest.raises(ParsePoolUnavailable):
+            await failing
+        return await asyncio.gather(*healthy, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results == [{"Sheet": {"columns": {"value": ["ok"]}}}] * 6
+    assert pool.stats()["failures"] == 1
+
+
+def test_broken_pool_fails_waiting_parses_as_unavailable(pool):
+    async def run():
+        running = [asyncio.create_task(pool.parse(b"ok")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        crashed = asyncio.create_task(pool.parse(b"crash"))
+        return await asyncio.gather(*running, crashed, return_exceptions=True)
+
+    *results, crashed = asyncio.run(run())
+
+    assert isinstance(crashed, ParsePoolUnavailable)
+    # Workbooks parsed before the crash succeed, the ones left on the broken pool are 503s
+    ok = {"Sheet": {"columns": {"value": ["ok"]}}}
+    assert all(result == ok or isinstance(result, ParsePoolUnavailable) for result in results)
+    # The broken executor was replaced for later workbooks
+    assert asyncio.run(pool.parse(b"again")) == {"Sheet": {"columns": {"value": ["again"]}}}
+
+
+def test_shutdown_while_parsing_is_unavailable(pool):
+    outcomes = []
+
+    def parse():
+        try:
+            outcomes.append(pool.parse_blocking(b"slow"))
+        except Exception as e:
+            outcomes.append(e)
+
+    # Two workers are busy, the later workbooks wait in the executor queue
+    threads = [threading.Thread(target=parse) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    pool.shutdown()
+    for thread in threads:
+        thread.join()
+
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    assert errors
+    assert all(isinstance(error, ParsePoolUnavailable) for error in errors), errors
+
+
+def test_admission_limit(pool):
+    async def run():
+        running = [asyncio.create_task(pool.parse(b"ok")) for _ in range(pool.max_active)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ParsePoolBusy):
+            await pool.parse(b"ok")
+        await asyncio.gather(*running)
+
+    asyncio.run(run())
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == pool.max_active
+    assert stats["active"] == 0
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (ParsePoolBusy("Too many workbooks are being parsed"), 429),
+    (ParsePoolUnavailable("Workbook parser is unavailable"), 503),
+])
+def test_rejected_uploads_ask_to_retry(monkeypatch, error, status_code):
+    async def parse(content):
+        raise error
+
+    monkeypatch.setattr(excel.parse_pool, "parse", parse)
+    content = f"rejected with {status_code}".encode()
+
+    response = TestClient(main.app).post("/api/analyze-excel", files={"file": ("book.xlsx", content)})
+
+    assert response.status_code == status_code
+    assert response.json()["detail"] == str(error)
+    assert response.headers["Retry-After"] == str(excel.PARSE_RETRY_AFTER)
@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import services.acceleration as acceleration_module
+from models import AccelPlot, AccelSet, Base
+from services.acceleration import AccelerationService
+from utils.plot_cache import PlotCache
+from utils.spectrum_memo import SpectrumMemo
+
+
+def arrays(points: int, value: float = 1.0):
+    return np.full(points, value), np.full(points, value / 10)
+
+
+def test_get_returns_stored_arrays_read_only():
+    cache = PlotCache(max_bytes=1 << 20, max_entries=10)
+    frequencies, accelerations = arrays(3)
+    cache.put(1, frequencies, accelerations)
+
+    freq, accel = cache.get(1)
+    np.testing.assert_array_equal(freq, frequencies)
+    np.testing.assert_array_equal(accel, accelerations)
+    with pytest.raises(ValueError):
+        freq[0] = 5.0
+    # The caller's arrays are copied, not frozen
+    frequencies[0] = 5.0
+    assert cache.get(1)[0][0] == 1.0
+
+
+def test_lru_eviction_by_bytes():
+    entry_bytes = 2 * 10 * 8
+    cache = PlotCache(max_bytes=2 * entry_bytes, max_entries=10)
+    cache.put(1, *arrays(10))
+    cache.put(2, *arrays(10))
+    cache.get(1)
+    cache.put(3, *arrays(10))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    stats = cache.stats()
+    assert stats["bytes"] == 2 * entry_bytes
+    assert stats["evictions"] == 1
+
+
+def test_lru_eviction_by_entries_and_oversized_plots():
+    cache = PlotCache(max_bytes=1000, max_entries=2)
+    for plot_id in (1, 2, 3):
+        cache.put(plot_id, *arrays(2))
+    cache.put(4, *arrays(100))
+
+    assert cache.get_many([1, 2, 3, 4]).keys() == {2, 3}
+
+
+def test_empty_and_disabled():
+    cache = PlotCache(max_bytes=1 << 20, max_entries=10)
+    cache.put(1, np.array([]), np.array([]))
+    assert cache.get(1) is None
+
+    disabled = PlotCache(max_bytes=0, max_entries=10)
+    disabled.put(1, *arrays(2))
+    assert not disabled.enabled and disabled.get(1) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = PlotCache(max_bytes=1 << 20, max_entries=10, ttl_seconds=60)
+    cache.put(1, *arrays(2))
+
+    now[0] += 59
+    assert cache.get(1) is not None
+    now[0] += 1
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["bytes"] == 0
+
+
+def test_invalidation_notifies_memo():
+    cache = PlotCache(max_bytes=1 << 20, max_entries=10)
+    memo = SpectrumMemo(max_entries=10)
+    cache.subscribe(memo.on_plots_invalidated)
+    cache.put(1, *arrays(2))
+    cache.put(2, *arrays(2))
+    memo.put("a", "from 1", [1, None])
+    memo.put("b", "from 2", [2])
+
+    cache.invalidate([1, None])
+    assert cache.get(1) is None and cache.get(2) is not None
+    assert memo.get("a") is None and memo.get("b") == "from 2"
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert memo.get("b") is None
+
+
+def test_memo_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    memo = SpectrumMemo(max_entries=10, ttl_seconds=60)
+    memo.put("a", "value", [1])
+
+    now[0] += 30
+    assert memo.get("a") == "value"
+    now[0] += 30
+    assert memo.get("a") is None
+
+
+def test_clear_accel_set_invalidates_its_plots(monkeypatch):
+    cache = PlotCache(max_bytes=1 << 20, max_entries=10)
+    monkeypatch.setattr(acceleration_module, "plot_cache", cache)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AccelPlot.__table__, AccelSet.__table__])
+    with Session(engine) as db:
+        db.add_all([AccelPlot(PLOT_ID=plot_id) for plot_id in (1, 2, 3, 4)])
+        db.add(AccelSet(ACCEL_SET_ID=10, X_PLOT_ID=1, Y_PLOT_ID=2, Z_PLOT_ID=3))
+        db.flush()
+        for plot_id in (1, 2, 3, 4):
+            cache.put(plot_id, *arrays(2))
+
+        AccelerationService().clear_accel_set(db, 10)
+
+    assert cache.get_many([1, 2, 3, 4]).keys() == {4}
+    engine.dispose()
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import utils.helpers as helpers
+from models import AccelPlot, AccelPlotHash, AccelPoint, Base
+from repositories import AccelPlotHashRepository
+from utils.helpers import plot_content_hash
+
+
+def test_hash_ignores_row_order():
+    assert plot_content_hash([1.0, 2.0, 3.0], [0.1, 0.2, 0.3]) == plot_content_hash([3.0, 1.0, 2.0], [0.3, 0.1, 0.2])
+
+
+def test_hash_is_sha256_hex():
+    content_hash = plot_content_hash([1.0], [0.1])
+    assert len(content_hash) == 64
+    int(content_hash, 16)
+
+
+def test_hash_depends_on_values_and_pairing():
+    base = plot_content_hash([1.0, 2.0], [0.1, 0.2])
+    assert base != plot_content_hash([1.0, 2.0], [0.1, 0.2000001])
+    assert base != plot_content_hash([1.0, 2.0], [0.2, 0.1])
+    assert base != plot_content_hash([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+
+
+def test_hash_treats_ints_as_floats():
+    assert plot_content_hash([1, 2], [1, 2]) == plot_content_hash([1.0, 2.0], [1.0, 2.0])
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[AccelPlot.__table__, AccelPoint.__table__, AccelPlotHash.__table__])
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+def test_find_plot_id_skips_missing_and_cleared_plots(db):
+    repository = AccelPlotHashRepository()
+    content_hash = plot_content_hash([1.0], [0.1])
+    db.add_all([AccelPlot(PLOT_ID=plot_id, AXIS="X") for plot_id in (2, 3)])
+    db.add(AccelPoint(PLOT_ID=3, FREQ=1.0, ACCEL=0.1))
+    # Plot 1 was deleted without its hash row, plot 2 has no points left
+    db.add_all([AccelPlotHash(PLOT_ID=plot_id, CONTENT_HASH=content_hash, POINT_COUNT=1) for plot_id in (1, 2, 3)])
+    db.flush()
+
+    assert repository.find_plot_id(db, content_hash) == 3
+    assert repository.find_plot_id(db, plot_content_hash([2.0], [0.1])) is None
@@ -0,0 +1,20 @@
+import pytest
+
+from core import settings
+from services import RecalculationBusy, RecalculationService
+from utils import job_registry
+
+
+def test_jobs_beyond_the_queue_are_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "recalc_jobs", 1)
+    monkeypatch.setattr(settings, "recalc_job_queue", 1)
+    service = RecalculationService()
+    # One running and one queued job fill the limit
+    waiting = [job_registry.create(RecalculationService.JOB_KIND) for _ in range(2)]
+
+    with pytest.raises(RecalculationBusy):
+        service.start_job("DET", 5.0, ["МРЗ"], eklist_id=1)
+    assert len([job for job in job_registry.list(RecalculationService.JOB_KIND) if not job.finished]) == 2
+
+    for job in waiting:
+        job.fail("test")
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from models import Base, EkSeismData
+from services.search import (
+    SearchService,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_filter,
+    parse_sort,
+)
+
+
+def test_parse_fields_adds_key_column():
+    assert parse_fields(None) is None
+    assert parse_fields("name, hclpf,NAME") == ["EK_ID", "NAME", "HCLPF"]
+    with pytest.raises(ValueError, match="Unknown column"):
+        parse_fields("NAME,NOPE")
+
+
+def test_parse_sort():
+    assert parse_sort(None) == [("EK_ID", False)]
+    assert parse_sort("-hclpf,+NAME,HCLPF") == [("HCLPF", True), ("NAME", False), ("EK_ID", False)]
+    assert parse_sort("-EK_ID") == [("EK_ID", True)]
+
+
+@pytest.mark.parametrize("expression", ["NAME", "NAME:between:1", "HCLPF:gt", "HCLPF:gt:abc", "NOPE:eq:1"])
+def test_parse_filter_errors(expression):
+    with pytest.raises(ValueError):
+        parse_filter(expression)
+
+
+def test_cursor_roundtrip():
+    sort_keys = parse_sort("-HCLPF,NAME")
+    cursor = encode_cursor(sort_keys, {"EK_ID": 7, "HCLPF": None, "NAME": "Насос"})
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, sort_keys) == [None, "Насос", 7]
+
+
+def test_cursor_must_match_sort():
+    cursor = encode_cursor(parse_sort("NAME"), {"EK_ID": 1, "NAME": "a"})
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(cursor, parse_sort("-NAME"))
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor", parse_sort("NAME"))
+
+
+@pytest.fixture(scope="module")
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[EkSeismData.__table__])
+    rng = random.Random(1)
+    with Session(engine) as session:
+        session.add_all([
+            EkSeismData(
+                EK_ID=ek_id, PLANT_ID=1, UNIT_ID=1, EKLIST_ID=7,
+                NAME=rng.choice([None, "Насос", "Клапан", "Бак"]),
+                HCLPF=rng.choice([None, 0.1, 0.2, 0.3]),
+            )
+            for ek_id in range(1, 41)
+        ])
+        session.add(EkSeismData(EK_ID=99, PLANT_ID=1, UNIT_ID=1, EKLIST_ID=8, NAME="Бак"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+class _Reversed:
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def sort_key(sort_keys):
+    """Python equivalent of the ORDER BY ... NULLS LAST of a sort spec"""
+    def key(row):
+        parts = []
+        for name, descending in sort_keys:
+            value = row[name]
+            parts.append((value is None, _Reversed(value) if descending and value is not None else value))
+        return parts
+    return key
+
+
+def pages(db, limit, **params):
+    service = SearchService()
+    rows, cursor, count = [], None, 0
+    while True:
+        page, cursor = service.search_page(db, 1, 1, 7, limit=limit, cursor=cursor, **params)
+        rows.extend(item["data"] for item in page)
+        count += 1
+        if cursor is None:
+            return rows, count
+
+
+@pytest.mark.parametrize("sort", [None, "NAME", "-HCLPF", "-HCLPF,NAME", "HCLPF,-NAME", "-NAME,-EK_ID"])
+def test_keyset_pages_match_full_sort(db, sort):
+    everything, _ = SearchService().search_page(db, 1, 1, 7, fields="NAME,HCLPF")
+    expected = sorted((item["data"] for item in everything), key=sort_key(parse_sort(sort)))
+
+    rows, count = pages(db, 6, fields="NAME,HCLPF", sort=sort)
+
+    assert [row["EK_ID"] for row in rows] == [row["EK_ID"] for row in expected]
+    assert count == 7  # 40 rows: six full pages of 6, then 4 rows without a next cursor
+
+
+def test_pages_with_projection_and_filter(db):
+    rows, _ = pages(db, 5, fields="NAME", sort="-HCLPF", filters=["NAME:notnull"])
+
+    assert rows
+    assert all(set(row) == {"EK_ID", "NAME"} and row["NAME"] is not None for row in rows)
+    assert 99 not in [row["EK_ID"] for row in rows]
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from models import Base, EkSeismData
+from services.seismic_analysis import SeismicAnalysisService
+from services.seismic_margins import sigma_alt
+
+MRZ_INPUTS = {"SIGMA_S_1_MRZ": 100.0, "SIGMA_S_S1_MRZ": 20.0, "SIGMA_S_2_MRZ": 80.0, "SIGMA_S_S2_MRZ": 10.0}
+PZ_INPUTS = {"SIGMA_S_1_PZ": 50.0, "SIGMA_S_S1_PZ": 5.0, "SIGMA_S_2_PZ": 40.0, "SIGMA_S_S2_PZ": 4.0}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[EkSeismData.__table__])
+    with Session(engine) as session:
+        session.add_all([
+            EkSeismData(EK_ID=1, PLANT_ID=1, M1_MRZ=1.5, M1_PZ=2.0, **MRZ_INPUTS, **PZ_INPUTS),
+            # ПЗ inputs without M1_PZ: only МРЗ values can be calculated
+            EkSeismData(EK_ID=2, PLANT_ID=1, M1_MRZ=1.0, **MRZ_INPUTS, **PZ_INPUTS),
+            EkSeismData(EK_ID=3, PLANT_ID=2),
+        ])
+        session.flush()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def updates(db):
+    """Parameter rows of every UPDATE of SRTN_EK_SEISM_DATA"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE \"SRTN_EK_SEISM_DATA\""):
+            statements.append(len(parameters) if executemany else 1)
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    yield statements
+    event.remove(db.get_bind(), "before_cursor_execute", record)
+
+
+def test_sigma_alt_bulk_matches_single_element_formula(db, updates):
+    result = SeismicAnalysisService().calculate_sigma_alt_bulk(db, ek_ids=[1, 2, 3, 4])
+
+    assert result["missing_ek_ids"] == [4]
+    assert result["updated"] == 2
+    values = result["calculated_values"]
+    assert values[1] == pytest.approx({
+        "SIGMA_S_ALT_1_MRZ": sigma_alt(100.0, 20.0, 1.5),
+        "SIGMA_S_ALT_2_MRZ": sigma_alt(80.0, 10.0, 1.5),
+        "SIGMA_S_ALT_1_PZ": sigma_alt(50.0, 5.0, 2.0),
+        "SIGMA_S_ALT_2_PZ": sigma_alt(40.0, 4.0, 2.0),
+    })
+    assert values[2] == {"SIGMA_S_ALT_1_MRZ": 100.0, "SIGMA_S_ALT_2_MRZ": 80.0}
+    assert values[3] == {}
+    # One statement per distinct column set
+    assert sorted(updates) == [1, 1]
+
+    db.expire_all()
+    assert db.get(EkSeismData, 1).SIGMA_S_ALT_2_PZ == pytest.approx(44.0)
+    assert db.get(EkSeismData, 2).SIGMA_S_ALT_1_PZ is None
+
+
+def test_sigma_alt_bulk_by_filter_without_saving(db, updates):
+    result = SeismicAnalysisService().calculate_sigma_alt_bulk(db, plant_id=1, save=False)
+
+    assert list(result["calculated_values"]) == [1, 2]
+    assert result["missing_ek_ids"] == []
+    assert result["updated"] == 0
+    assert updates == []
@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+import pytest
+
+from services.seismic_margins import (
+    INPUT_COLUMNS,
+    K_COEFFICIENTS_MRZ,
+    K_COEFFICIENTS_PZ,
+    calculate_k,
+    calculate_k2,
+    column_array,
+    k_arrays,
+    k_coefficient_arrays,
+    recalculate_chunk,
+    recalculate_element,
+    seismic_category,
+    sigma_alt,
+)
+
+
+@pytest.mark.parametrize("seismo_txt, expected", [
+    ("II", "II"),
+    ("ІІ", "II"),
+    ("Категорія ІІ", "II"),
+    ("I", "I"),
+    ("І", "I"),
+    ("Категорія І", "I"),
+    ("II (І)", "II"),
+])
+def test_seismic_category(seismo_txt, expected):
+    assert seismic_category(seismo_txt) == expected
+
+
+@pytest.mark.parametrize("seismo_txt", [
+    None,
+    "",
+    "несейсмостійкий",
+    "Сейсмостійкий",
+    "категорія сейсмостійкості відсутня",
+])
+def test_seismic_category_without_category(seismo_txt):
+    # Lowercase cyrillic "і" inside words must not be read as category I
+    assert seismic_category(seismo_txt) is None
+
+
+def js_k_coefficient(sigma_dop, sigma_alt_1, sigma_alt_2, coefficients, m2):
+    """calculateKCoefficient / calculateKCoefficientPZ + k3 of SeismicAnalysisTab.jsx, line by line"""
+    result = {"n": None, "k1": None, "k3": None}
+    coeff1, coeff2 = coefficients or (None, None)
+    if sigma_dop and coeff1 and coeff2:
+        values = []
+        if sigma_alt_1 is not None and sigma_alt_1 > 0:
+            values.append(coeff1 * sigma_dop / sigma_alt_1)
+        if sigma_alt_2 is not None and sigma_alt_2 > 0:
+            values.append(coeff2 * sigma_dop / sigma_alt_2)
+        if values:
+            result["n"] = result["k1"] = min(values)
+    if result["n"] and m2 and m2 > 0:
+        result["k3"] = result["n"] / m2
+    return result
+
+
+def js_k2(hclpf, m1, f_mu, pga):
+    """k2 of calculateAllKCoefficients (Д.12)"""
+    if all(value is not None and value > 0 for value in (hclpf, m1, f_mu, pga)):
+        return hclpf / (m1 * f_mu * pga)
+    return None
+
+
+K_INPUTS = [None, 0.0, -5.0, 12.5, 140.0]
+
+
+def k_cases():
+    for sigma_dop in (None, 0.0, -100.0, 180.0):
+        for sigma_alt_1 in K_INPUTS:
+            for sigma_alt_2 in K_INPUTS:
+                for m2 in (None, 0.0, 1.7):
+                    for seismo_txt in (None, "II", "І", "несейсмостійкий"):
+                        yield sigma_dop, sigma_alt_1, sigma_alt_2, seismo_txt, m2
+
+
+def approx_or_none(value):
+    return None if value is None else pytest.approx(value)
+
+
+def test_k_parity_with_seismic_analysis_tab():
+    for sigma_dop, sigma_alt_1, sigma_alt_2, seismo_txt, m2 in k_cases():
+        for coefficients in (K_COEFFICIENTS_MRZ, K_COEFFICIENTS_PZ.get(seismic_category(seismo_txt))):
+            expected = js_k_coefficient(sigma_dop, sigma_alt_1, sigma_alt_2, coefficients, m2)
+            result = calculate_k(sigma_dop, sigma_alt_1, sigma_alt_2, coefficients, m2)
+            assert result == {key: approx_or_none(value) for key, value in expected.items()}, (
+                sigma_dop, sigma_alt_1, sigma_alt_2, coefficients, m2
+            )
+
+
+def test_k_arrays_match_scalar_engine():
+    cases = list(k_cases())
+    sigma_dop, sigma_alt_1, sigma_alt_2, seismo_txt, m2 = zip(*cases)
+    c1, c2 = k_coefficient_arrays("ПЗ", seismo_txt)
+    arrays = k_arrays(
+        column_array(sigma_dop), column_array(sigma_alt_1), column_array(sigma_alt_2), c1, c2, column_array(m2)
+    )
+
+    for i, (dop, alt_1, alt_2, txt, m2_value) in enumerate(cases):
+        expected = calculate_k(dop, alt_1, alt_2, K_COEFFICIENTS_PZ.get(seismic_category(txt)), m2_value)
+        for key, value in expected.items():
+            assert (None if np.isnan(arrays[key][i]) else arrays[key][i]) == approx_or_none(value)
+
+
+@pytest.mark.parametrize("hclpf, m1, f_mu, pga", [
+    (0.4, 1.2, 0.5, 0.1),
+    (0.4, None, 0.5, 0.1),
+    (0.4, 1.2, 0.0, 0.1),
+    (-0.4, 1.2, 0.5, 0.1),
+    (0.4, 1.2, 0.5, None),
+])
+def test_k2_parity_with_seismic_analysis_tab(hclpf, m1, f_mu, pga):
+    assert calculate_k2(hclpf, m1, f_mu, pga) == approx_or_none(js_k2(hclpf, m1, f_mu, pga))
+
+
+def set_ref(set_type, plot_id, pga=None):
+    return {"set_id": plot_id, "set_type": set_type, "dempf": 5.0, "pga": pga,
+            "x_plot_id": plot_id, "y_plot_id": plot_id, "z_plot_id": plot_id}
+
+
+def margin_element(characteristic_plot=1):
+    return {
+        "natural_frequency": None,
+        "first_natural_frequencies": {"x": None, "y": None, "z": None},
+        "spectral_sets": {"МРЗ": set_ref("ХАРАКТЕРИСТИКИ", characteristic_plot)},
+        "requirement_sets": {"МРЗ": set_ref("ВИМОГИ", 2, pga=0.1)},
+    }
+
+
+MARGIN_PLOTS = {
+    1: (np.array([1.0, 2.0, 4.0]), np.array([1.0, 1.0, 1.0])),
+    2: (np.array([1.0, 2.0, 4.0]), np.array([0.5, 2.0, 1.0])),
+    3: (np.array([1.0, 2.0, 4.0]), np.array([1.0, 0.0, 1.0])),
+}
+
+
+def margin_columns(**overrides):
+    columns = {column: None for column in INPUT_COLUMNS}
+    columns.update({
+        "FIRST_NAT_FREQ_X": 2.4, "SIGMA_DOP": 100.0, "SIGMA_ALT_DOP": 125.0, "HCLPF": 0.4, "F_MU": 0.5,
+        "SIGMA_S_1_MRZ": 20.0, "SIGMA_S_S1_MRZ": 5.0, "SIGMA_S_2_MRZ": 30.0, "SIGMA_S_S2_MRZ": 10.0,
+        "RATIO_P_MRZ": 1.1, "RATIO_E_MRZ": 1.2,
+    })
+    columns.update(overrides)
+    return columns
+
+
+def test_sigma_alt():
+    assert sigma_alt(20.0, 5.0, 2.0) == 25.0
+    assert sigma_alt(20.0, None, 2.0) is None
+
+
+def test_recalculate_element_chain():
+    update_row, results, errors = recalculate_element(margin_columns(), margin_element(), MARGIN_PLOTS, ["МРЗ"], 5.0)
+
+    assert errors == []
+    m2 = 2 * math.sqrt(3)
+    k1 = min(1.4 * 100 / 25, 1.8 * 100 / 40)
+    assert update_row == pytest.approx({
+        "M1_MRZ": 2.0,
+        "M2_MRZ": m2,
+        "SIGMA_S_ALT_1_MRZ": 25.0,
+        "SIGMA_S_ALT_2_MRZ": 40.0,
+        "N_MRZ": k1,
+        "K1_MRZ": k1,
+        "K3_MRZ": k1 / m2,
+        "RATION_SIGMA_DOP_MRZ": 0.8,
+        # Natural frequency shifted to 2.4 / sqrt(1.2) leaves only the 4 Hz point
+        "M1_ALT_MRZ": 1.0,
+        "K1_ALT_MRZ": k1 / (1.1 * 1.2 * 0.8),
+        "K2_": 0.4 / (2.0 * 0.5 * 0.1),
+    })
+    assert results["K2_"] == pytest.approx(4.0)
+
+
+def test_recalculate_element_derives_k2_from_hclpf_and_keeps_hclpf_alt():
+    update_row, _, _ = recalculate_element(
+        margin_columns(HCLPF=0.8), margin_element(), MARGIN_PLOTS, ["МРЗ", "ПЗ"], 5.0
+    )
+    assert update_row["K2_"] == pytest.approx(0.8 / (2.0 * 0.5 * 0.1))
+    assert not any(column.startswith("HCLPF") for column in update_row)
+
+
+def test_recalculate_element_skips_alt_values_without_positive_ratio_e():
+    update_row, _, _ = recalculate_element(
+        margin_columns(RATIO_E_MRZ=-1.2), margin_element(), MARGIN_PLOTS, ["МРЗ"], 5.0
+    )
+    assert "M1_ALT_MRZ" not in update_row
+    assert "K1_ALT_MRZ" not in update_row
+
+
+def test_recalculate_element_infinite_m1_is_not_saved():
+    update_row, results, errors = recalculate_element(
+        margin_columns(), margin_element(characteristic_plot=3), MARGIN_PLOTS, ["МРЗ"], 5.0
+    )
+    assert errors == ["МРЗ: infinite M1 (zero characteristic), not saved"]
+    assert "M1_MRZ" not in update_row
+    assert results["МРЗ"]["m1"] is None
+    assert "K2_" not in update_row
+
+
+def test_recalculate_element_falls_back_to_stored_m1():
+    element = margin_element()
+    element["requirement_sets"] = {}
+    update_row, results, errors = recalculate_element(
+        margin_columns(M1_MRZ=2.0, M2_MRZ=3.0), element, MARGIN_PLOTS, ["МРЗ"], 5.0
+    )
+    assert errors == ["МРЗ: no ВИМОГИ set for DEMPF=5.0"]
+    assert "M1_MRZ" not in update_row
+    assert update_row["SIGMA_S_ALT_1_MRZ"] == 25.0
+    assert update_row["K3_MRZ"] == pytest.approx(4.5 / 3.0)
+
+
+def test_recalculate_chunk_reports_failures_per_element():
+    payload = {
+        "elements": [
+            {"ek_id": 1, "columns": margin_columns(), "element": margin_element()},
+            {"ek_id": 2, "columns": margin_columns(), "element": {}},
+        ],
+        "plots": MARGIN_PLOTS,
+        "spectrum_types": ["МРЗ"],
+        "dempf": 5.0,
+    }
+    result = recalculate_chunk(payload)
+
+    assert result["processed"] == 2
+    assert [row["EK_ID"] for row in result["rows"]] == [1]
+    assert list(result["errors"]) == [2]
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import services.acceleration as acceleration_module
+import utils.helpers as helpers
+from core import settings
+from models import AccelPlot, AccelPoint, AccelSet, Base, EkSeismData
+from repositories import AccelSetRepository
+from repositories.base import ORACLE_IN_LIMIT, chunked
+from services.acceleration import AccelerationService
+from utils.plot_cache import PlotCache
+
+
+def test_chunked_splits_distinct_ids_at_oracle_limit():
+    ids = list(range(2500, 0, -1)) + [1, 2, None]
+
+    chunks = list(chunked(ids))
+
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert sum(chunks, []) == list(range(1, 2501))
+    assert list(chunked([None])) == []
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "accel_plot_storage", "points")
+    monkeypatch.setattr(acceleration_module, "plot_cache", PlotCache(max_bytes=1 << 20, max_entries=100))
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(
+        engine, tables=[EkSeismData.__table__, AccelSet.__table__, AccelPlot.__table__, AccelPoint.__table__]
+    )
+    helpers._packed_table_state.clear()
+    with Session(engine) as session:
+        yield session
+    helpers._packed_table_state.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def in_list_sizes(db):
+    """Bound parameter counts of every SELECT"""
+    sizes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            sizes.append(len(parameters))
+
+    event.listen(db.get_bind(), "before_cursor_execute", record)
+    yield sizes
+    event.remove(db.get_bind(), "before_cursor_execute", record)
+
+
+def test_get_by_ids_keeps_in_lists_under_limit(db, in_list_sizes):
+    db.add_all([AccelSet(ACCEL_SET_ID=set_id) for set_id in range(1, 1501)])
+    db.flush()
+
+    sets = AccelSetRepository().get_by_ids(db, range(1, 2501))
+
+    assert sorted(s.ACCEL_SET_ID for s in sets) == list(range(1, 1501))
+    assert in_list_sizes == [1000, 1000, 500]
+    assert max(in_list_sizes) <= ORACLE_IN_LIMIT
+
+
+def add_set(db, set_id, plot_ids, **columns):
+    x_plot_id, y_plot_id, z_plot_id = plot_ids
+    db.add(AccelSet(ACCEL_SET_ID=set_id, X_PLOT_ID=x_plot_id, Y_PLOT_ID=y_plot_id, Z_PLOT_ID=z_plot_id, **columns))
+
+
+def test_batch_sends_shared_plots_once(db):
+    db.add_all([AccelPlot(PLOT_ID=plot_id) for plot_id in (1, 2, 3)])
+    db.add_all([
+        AccelPoint(PLOT_ID=1, FREQ=2.0, ACCEL=0.2),
+        AccelPoint(PLOT_ID=1, FREQ=1.0, ACCEL=0.1),
+        AccelPoint(PLOT_ID=2, FREQ=1.0, ACCEL=0.3),
+        AccelPoint(PLOT_ID=3, FREQ=1.0, ACCEL=0.4),
+    ])
+    add_set(db, 10, (1, 2, 2), SET_TYPE="ЕК", PGA_=0.1)
+    location = {"PLANT_ID": 1, "UNIT_ID": 2, "BUILDING": "A"}
+    requirement = dict(location, SET_TYPE="ВИМОГИ", CALC_TYPE="ДЕТ", SPECTR_EARTHQ_TYPE="МРЗ")
+    add_set(db, 20, (3, 3, 3), DEMPF=2.0, **requirement)
+    add_set(db, 21, (1, 1, 1), DEMPF=2.0, **requirement)
+    add_set(db, 22, (2, 2, 2), DEMPF=5.0, **requirement)
+    db.add_all([
+        EkSeismData(EK_ID=1, ACCEL_SET_ID_MRZ=10, F_MU=3.0, **location),
+        EkSeismData(EK_ID=2, ACCEL_SET_ID_MRZ=10, **location),
+    ])
+    db.flush()
+
+    result = AccelerationService().get_spectral_data_batch(db, [2, 1, 2, 99], ["МРЗ", "ПЗ"], "ДЕТ", 2.0)
+
+    assert list(result["elements"]) == [2, 1]
+    assert result["missing_ek_ids"] == [99]
+    element = result["elements"][1]
+    assert element["natural_frequency"] == 3.0
+    assert element["spectral_sets"].keys() == {"МРЗ"}
+    assert element["spectral_sets"]["МРЗ"]["y_plot_id"] == 2
+    # The lowest ACCEL_SET_ID with the requested damping wins
+    assert element["requirement_sets"]["МРЗ"]["set_id"] == 20
+    assert result["plots"] == {
+        1: {"frequency": [1.0, 2.0], "accel": [0.1, 0.2]},
+        2: {"frequency": [1.0], "accel": [0.3]},
+        3: {"frequency": [1.0], "accel": [0.4]},
+    }
+
+
+def test_batch_without_damping_skips_requirements(db):
+    db.add(EkSeismData(EK_ID=1, BUILDING="A"))
+    db.flush()
+
+    result = AccelerationService().get_spectral_data_batch(db, [1], ["МРЗ"])
+
+    assert result["elements"][1]["spectral_sets"] == {}
+    assert result["elements"][1]["requirement_sets"] == {}
+    assert result["plots"] == {}
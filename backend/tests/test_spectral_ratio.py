@@ -0,0 +1,119 @@
+import json
+import math
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from services.spectral_ratio import calculate_m1_m2, interpolate_plateau, max_spectral_ratio
+
+ANALYSIS_MODAL = Path(__file__).resolve().parents[2] / "frontend" / "src" / "components" / "AnalysisModal.jsx"
+
+
+def arrays(frequencies, accelerations):
+    return np.array(frequencies, dtype=np.float64), np.array(accelerations, dtype=np.float64)
+
+
+def test_interpolate_plateau():
+    target = np.array([0.5, 1.0, 1.5, 2.0, 3.0])
+    values = interpolate_plateau(target, *arrays([2.0, 1.0], [4.0, 2.0]))
+    assert values.tolist() == [2.0, 2.0, 3.0, 4.0, 4.0]
+    assert interpolate_plateau(target, *arrays([], [])).tolist() == [0.0] * 5
+
+
+def test_identical_spectra():
+    spectrum = arrays([1.0, 2.0, 5.0], [0.2, 0.6, 0.3])
+    result = calculate_m1_m2({"x": spectrum, "y": spectrum, "z": spectrum}, {"x": spectrum, "y": spectrum, "z": spectrum})
+    assert result["m1"] == pytest.approx(1.0)
+    assert result["m2"] == pytest.approx(math.sqrt(3))
+
+
+def test_ratio_on_union_grid():
+    requirement = arrays([1.0, 3.0], [1.0, 3.0])
+    characteristic = arrays([2.0], [1.0])
+    # Requirement at 3 Hz is 3.0, characteristic is a plateau of 1.0
+    assert max_spectral_ratio(requirement, characteristic) == pytest.approx(3.0)
+    # Below the natural frequency the spectra are ignored
+    assert max_spectral_ratio(requirement, characteristic, 1.5) == pytest.approx(3.0)
+    assert max_spectral_ratio(requirement, characteristic, 10.0) == 0.0
+
+
+def test_zero_characteristic_is_infinite():
+    requirement = arrays([1.0, 2.0], [0.5, 0.5])
+    assert max_spectral_ratio(requirement, arrays([1.0, 2.0], [0.0, 1.0])) == math.inf
+    assert max_spectral_ratio(arrays([1.0, 2.0], [0.0, 0.5]), arrays([1.0, 2.0], [0.0, 1.0])) == pytest.approx(0.5)
+
+
+def test_missing_axis_counts_as_zero():
+    spectrum = arrays([1.0, 2.0], [1.0, 2.0])
+    result = calculate_m1_m2({"x": spectrum}, {"x": spectrum, "y": spectrum})
+    assert result["m_y_max"] == 0.0
+    assert result["m_z_max"] == 0.0
+    assert result["m1"] == pytest.approx(1.0)
+    assert result["m2"] == pytest.approx(1.0)
+
+
+def random_frequencies(rng: random.Random):
+    return sorted(rng.sample([round(0.5 * i, 2) for i in range(1, 80)], rng.randint(1, 12)))
+
+
+def js_cases(count: int):
+    rng = random.Random(1)
+    cases = []
+    for _ in range(count):
+        frequency_req = random_frequencies(rng)
+        frequency_char = random_frequencies(rng)
+        cases.append({
+            "requirements": {"frequency": frequency_req, **{
+                f"mrz_{axis}": [round(rng.uniform(0.05, 3.0), 4) for _ in frequency_req] for axis in "xyz"
+            }},
+            "characteristics": {"frequency": frequency_char, **{
+                f"mrz_{axis}": [0.0 if rng.random() < 0.005 else round(rng.uniform(0.05, 3.0), 4) for _ in frequency_char]
+                for axis in "xyz"
+            }},
+            "natural": {
+                axis: {"enabled": rng.random() < 0.5, "value": str(round(rng.uniform(0.5, 30.0), 2))} for axis in "xyz"
+            },
+        })
+    return cases
+
+
+def run_js_analysis(cases):
+    """Evaluate the frontend's own calculateAnalysisWithNaturalFrequency with node"""
+    source = ANALYSIS_MODAL.read_text(encoding="utf-8")
+    start = source.index("const linearInterpolate")
+    end = source.index("const AnalysisModal")
+    script = source[start:end] + """
+const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const encode = v => (v === Infinity ? 'inf' : v);
+const results = cases.map(c => {
+  const r = calculateAnalysisWithNaturalFrequency(c.requirements, c.characteristics, c.natural);
+  return Object.fromEntries(['m_x_max', 'm_y_max', 'm_z_max', 'm1', 'm2'].map(k => [k, encode(r[k])]));
+});
+process.stdout.write(JSON.stringify(results));
+"""
+    output = subprocess.run(
+        ["node", "-e", script], input=json.dumps(cases), capture_output=True, text=True, check=True, timeout=60
+    )
+    return json.loads(output.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None or not ANALYSIS_MODAL.exists(), reason="node or frontend sources missing")
+def test_parity_with_analysis_modal():
+    cases = js_cases(200)
+    expected = run_js_analysis(cases)
+
+    for case, js in zip(cases, expected):
+        requirements = {axis: arrays(case["requirements"]["frequency"], case["requirements"][f"mrz_{axis}"]) for axis in "xyz"}
+        characteristics = {
+            axis: arrays(case["characteristics"]["frequency"], case["characteristics"][f"mrz_{axis}"]) for axis in "xyz"
+        }
+        natural = {
+            axis: float(value["value"]) if value["enabled"] else None for axis, value in case["natural"].items()
+        }
+        result = calculate_m1_m2(requirements, characteristics, natural)
+        for key, value in js.items():
+            assert result[key] == (math.inf if value == "inf" else pytest.approx(value, rel=1e-12)), key
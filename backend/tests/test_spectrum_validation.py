@@ -0,0 +1,91 @@
+import math
+
+from services.spectrum_validation import (
+    MAX_REPORTED_ROWS,
+    range_warnings,
+    validate_acceleration,
+    validate_frequency,
+    validate_spectrum_sheet,
+)
+
+
+def test_valid_sheet():
+    report = validate_spectrum_sheet([0.5, 1.0, 2.0], {"МРЗ_X": [0.1, 0.2, 0.3], "ПЗ_X": [0.05, 0.1, 0.15]})
+
+    assert report["errors"] == []
+    assert report["warnings"] == []
+    assert report["rows"] == 3
+    assert report["frequency_range"] == [0.5, 2.0]
+    assert report["points"] == {"МРЗ_X": 3, "ПЗ_X": 3}
+
+
+def test_missing_frequency_column():
+    report = validate_spectrum_sheet(None, {"МРЗ_X": [0.1]})
+    assert report["errors"] == ["Frequency column not found"]
+    assert report["points"] == {}
+
+
+def test_frequency_order_and_duplicates():
+    report = validate_frequency([1.0, 2.0, 2.0, 1.5, None, 3.0])
+
+    assert report["errors"] == [
+        "Frequency: not increasing at rows [4]",
+        "Frequency: duplicate values at rows [3]",
+    ]
+    assert report["warnings"] == ["Frequency: 1 empty cell(s), rows skipped"]
+    assert report["range"] == [1.0, 3.0]
+
+
+def test_frequency_invalid_values():
+    report = validate_frequency([1.0, "abc", -2.0, math.inf])
+
+    assert "Frequency: 1 non-numeric cell(s)" in report["errors"]
+    assert "Frequency: negative values at rows [3]" in report["errors"]
+    assert "Frequency: infinite values at rows [4]" in report["errors"]
+
+
+def test_frequency_without_values():
+    report = validate_frequency([None, None])
+    assert report["errors"] == ["Frequency: no values"]
+    assert report["range"] is None
+
+
+def test_acceleration_checks():
+    frequency = validate_frequency([1.0, 2.0, None, 4.0])["vector"]
+    report = validate_acceleration("МРЗ_X", [0.1, None, 0.3, -0.4], frequency)
+
+    assert report["errors"] == ["МРЗ_X: negative values at rows [4]"]
+    assert report["warnings"] == [
+        "МРЗ_X: 1 empty cell(s) at rows [2], rows skipped",
+        "МРЗ_X: values without frequency at rows [3], rows skipped",
+    ]
+    # Rows 1 and 4 have both values (the negative one is an error, not skipped)
+    assert report["points"] == 2
+
+
+def test_acceleration_length_mismatch():
+    frequency = validate_frequency([1.0, 2.0, 3.0])["vector"]
+    report = validate_acceleration("ПЗ_Z", [0.1, 0.2], frequency)
+    assert report["errors"] == ["ПЗ_Z: 2 value(s), frequency column has 3"]
+    assert report["points"] == 2
+
+
+def test_auto_filled_columns_are_checked_once():
+    shared = [0.1, -0.2]
+    report = validate_spectrum_sheet([1.0, 2.0], {"МРЗ_X": shared, "МРЗ_Y": shared, "МРЗ_Z": [0.1, 0.2]})
+
+    assert report["errors"] == ["МРЗ_X/МРЗ_Y: negative values at rows [2]"]
+    assert report["points"] == {"МРЗ_X": 2, "МРЗ_Y": 2, "МРЗ_Z": 2}
+
+
+def test_reported_rows_are_capped():
+    report = validate_frequency([-1.0] * (MAX_REPORTED_ROWS + 5))
+    assert report["errors"][0] == f"Frequency: negative values at rows {list(range(1, MAX_REPORTED_ROWS + 1))}"
+
+
+def test_range_warnings():
+    assert range_warnings([0.5, 50.0], [1.0, 33.0], "3%") == []
+    assert range_warnings([0.5, 20.0], [1.0, 33.0], "3%") == [
+        "3%: frequency range 0.5-20 Hz does not cover stored sets 1-33 Hz"
+    ]
+    assert range_warnings(None, [1.0, 33.0], "3%") == []
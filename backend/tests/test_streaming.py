@@ -0,0 +1,131 @@
+import datetime
+import decimal
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+import main
+from core import settings
+from core.database import DbSessionManager, SessionSlots
+from models import Base, EkSeismData, File, FileType, Model3D, MultimediaModel
+from utils.streaming import NDJSON_MEDIA_TYPE, json_default, ndjson_lines, ndjson_response
+
+
+def test_json_default_encodes_db_values():
+    assert json_default(datetime.date(2024, 5, 1)) == "2024-05-01"
+    assert json_default(datetime.datetime(2024, 5, 1, 12, 30)) == "2024-05-01T12:30:00"
+    assert json_default(decimal.Decimal("0.25")) == 0.25
+    assert json_default(b"\x00") is None
+    with pytest.raises(TypeError):
+        json_default(object())
+
+
+def test_ndjson_lines_are_batched():
+    items = [{"EK_ID": ek_id, "NAME": "Насос"} for ek_id in range(5)]
+
+    chunks = list(ndjson_lines(items, batch_rows=2))
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == items
+    # Cyrillic is sent as UTF-8, not escaped
+    assert "Насос" in lines[0]
+    assert list(ndjson_lines([], batch_rows=2)) == []
+
+
+@pytest.fixture
+def db_manager(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[
+        EkSeismData.__table__, FileType.__table__, File.__table__, Model3D.__table__, MultimediaModel.__table__
+    ])
+    with Session(engine) as session:
+        session.add_all([
+            EkSeismData(EK_ID=ek_id, PLANT_ID=1, UNIT_ID=1, EKLIST_ID=7, NAME=f"EK {ek_id}")
+            for ek_id in range(1, 6)
+        ])
+        session.add(FileType(FILE_TYPE_ID=1, NAME="Модель", DEF_EXT="glb"))
+        session.add_all([
+            File(FILE_ID=1, FILE_TYPE_ID=1, FILE_NAME="a.glb", DATA=b"x" * 2048),
+            File(FILE_ID=2, FILE_TYPE_ID=1, FILE_NAME="b.glb"),
+        ])
+        session.add(Model3D(MODEL_ID=1, SH_NAME="Реактор", MODEL_FILE_ID=1))
+        session.add(MultimediaModel(MULTIMED_3D_ID=1, SH_NAME="Вид", MULTIMED_FILE_ID=2, MODEL_ID=1))
+        session.commit()
+    monkeypatch.setattr(DbSessionManager, "_engine", engine)
+    monkeypatch.setattr(DbSessionManager, "_session_maker", sessionmaker(bind=engine))
+    monkeypatch.setattr(DbSessionManager, "_slots", SessionSlots(2))
+    monkeypatch.setattr(settings, "stream_batch_rows", 2)
+    yield DbSessionManager
+    engine.dispose()
+
+
+def ndjson(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_error_after_first_chunk_is_sent_as_last_line(db_manager):
+    def produce(db):
+        for (ek_id,) in db.execute(text('SELECT EK_ID FROM "SRTN_EK_SEISM_DATA" ORDER BY EK_ID')):
+            if ek_id == 4:
+                raise RuntimeError("connection lost")
+            yield {"EK_ID": ek_id}
+
+    app = FastAPI()
+    app.add_api_route("/stream", lambda: ndjson_response(produce, batch_rows=2))
+
+    lines = ndjson(TestClient(app).get("/stream"))
+
+    assert lines == [{"EK_ID": 1}, {"EK_ID": 2}, {"error": "connection lost"}]
+    assert db_manager.session_slots().stats()["in_use"] == 0
+
+
+@pytest.fixture
+def client(db_manager):
+    # Streams open their own session; the request session is not used
+    main.app.dependency_overrides[DbSessionManager.get_request_session] = lambda: None
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def test_search_stream(client):
+    params = {"plant_id": 1, "unit_id": 1, "t_id": 7, "fields": "NAME", "sort": "-EK_ID", "stream": True}
+
+    lines = ndjson(client.get("/api/search", params=params))
+
+    assert [line["data"] for line in lines] == [{"EK_ID": ek_id, "NAME": f"EK {ek_id}"} for ek_id in range(5, 0, -1)]
+
+
+@pytest.mark.parametrize("params", [{"limit": 2}, {"fields": "NOPE"}])
+def test_search_stream_rejects_bad_parameters_before_streaming(client, params):
+    response = client.get("/api/search", params={"plant_id": 1, "unit_id": 1, "t_id": 7, "stream": True, **params})
+    assert response.status_code == 400
+
+
+def test_files_stream_omits_contents(client):
+    lines = ndjson(client.get("/api/files", params={"stream": True}))
+
+    assert [line["data"]["FILE_NAME"] for line in lines] == ["a.glb", "b.glb"]
+    assert lines[0]["data"]["DATA"] == "2.0 KB"
+    assert lines[1]["data"]["DATA"] == "NO DATA"
+
+
+def test_multimedia_stream(client):
+    lines = ndjson(client.get("/api/multimedia", params={"stream": True}))
+
+    assert lines == [{"data": {
+        "MULTIMED_3D_ID": 1,
+        "SH_NAME": "Вид",
+        "MULTIMED_FILE_ID": 2,
+        "MODEL_ID": 1,
+        "MODEL_SH_NAME": "Реактор",
+        "FILE_NAME": "b.glb",
+        "FILE_TYPE_NAME": "Модель",
+        "FILE_EXT": "glb",
+    }}]
@@ -0,0 +1,92 @@
+import time
+
+from utils.upload_cache import UploadCache, content_token, estimate_size
+
+
+def sheets(values):
+    return {"3%": {"rows": len(values), "data": {"Частота": values}, "error": None}}
+
+
+def test_content_token_is_sha256_hex():
+    token = content_token(b"workbook")
+    assert len(token) == 64
+    assert token == content_token(b"workbook")
+    assert token != content_token(b"workbook2")
+
+
+def test_estimate_size_counts_floats_and_strings():
+    assert estimate_size(sheets([1.0, 2.0])) == 2 * (8 + 24)
+    assert estimate_size(sheets(["ab"])) == 8 + 49 + 2
+    assert estimate_size({"empty": {"rows": 0, "data": None, "error": "no data"}}) == 0
+
+
+def test_get_or_parse_parses_once():
+    cache = UploadCache(max_bytes=1 << 20, max_entries=4, ttl_seconds=60)
+    calls = []
+
+    def parse(content):
+        calls.append(content)
+        return sheets([1.0])
+
+    token, first = cache.get_or_parse(b"book", parse)
+    again_token, again = cache.get_or_parse(b"book", parse)
+
+    assert calls == [b"book"]
+    assert token == again_token == content_token(b"book")
+    assert again is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_entry_count():
+    cache = UploadCache(max_bytes=1 << 20, max_entries=2, ttl_seconds=60)
+    cache.put("a", sheets([1.0]))
+    cache.put("b", sheets([2.0]))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", sheets([3.0]))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_size_and_oversized_entries():
+    entry_size = estimate_size(sheets([1.0]))
+    cache = UploadCache(max_bytes=2 * entry_size, max_entries=10, ttl_seconds=60)
+    for token in ("a", "b", "c"):
+        cache.put(token, sheets([1.0]))
+    assert cache.stats()["bytes"] == 2 * entry_size
+    assert cache.get("a") is None
+
+    cache.put("big", sheets([1.0] * 10))
+    assert cache.get("big") is None
+
+
+def test_replacing_a_token_keeps_size_consistent():
+    cache = UploadCache(max_bytes=1 << 20, max_entries=4, ttl_seconds=60)
+    cache.put("a", sheets([1.0]))
+    cache.put("a", sheets([1.0, 2.0]))
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == estimate_size(sheets([1.0, 2.0]))
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = UploadCache(max_bytes=1 << 20, max_entries=4, ttl_seconds=60)
+    cache.put("a", sheets([1.0]))
+
+    now[0] += 59
+    assert cache.get("a") is not None  # access refreshes the TTL
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = UploadCache(max_bytes=1 << 20, max_entries=0, ttl_seconds=60)
+    cache.put("a", sheets([1.0]))
+    assert cache.get("a") is None
@@ -2,12 +2,36 @@
 Utilities - вспомогательные функции
 """
 from .formatters import format_file_size, format_data_field
-from .helpers import get_plot_data, build_spectral_response
+from .helpers import get_plot_data, build_spectral_response, pack_vector, unpack_vector
+from .plot_cache import PlotCache, plot_cache
+from .spectrum_memo import SpectrumMemo, requirement_spectrum_memo
+from .upload_cache import UploadCache, upload_cache
+from .jobs import Job, JobRegistry, job_registry
+from .parse_pool import ParsePool, ParsePoolBusy, ParsePoolUnavailable, parse_pool
+from .streaming import ndjson_response
+from .json_response import FastJSONResponse
 
 __all__ = [
     "format_file_size",
     "format_data_field",
     "get_plot_data",
     "build_spectral_response",
+    "pack_vector",
+    "unpack_vector",
+    "PlotCache",
+    "plot_cache",
+    "SpectrumMemo",
+    "requirement_spectrum_memo",
+    "UploadCache",
+    "upload_cache",
+    "Job",
+    "JobRegistry",
+    "job_registry",
+    "ParsePool",
+    "ParsePoolBusy",
+    "ParsePoolUnavailable",
+    "parse_pool",
+    "ndjson_response",
+    "FastJSONResponse",
 ]
 
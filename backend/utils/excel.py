@@ -0,0 +1,199 @@
+"""
+Excel helpers - потоковое чтение книг Excel (read-only, values only)
+"""
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence
+
+import openpyxl
+
+# Sheet names like 4%, 0.2%, 1,2%
+PERCENTAGE_SHEET_RE = re.compile(r'^\d+([.,]\d+)?%$')
+
+# Rows scanned for the header row
+HEADER_SEARCH_ROWS = 5
+
+
+class SheetFormatError(ValueError):
+    """Sheet has no usable header row / columns"""
+    pass
+
+
+def is_percentage_sheet(sheet_name: str) -> bool:
+    """Check if sheet name is a damping percentage (4%, 0.2%, 1,2%)"""
+    return bool(PERCENTAGE_SHEET_RE.match(sheet_name.strip()))
+
+
+def is_frequency_column(header: str) -> bool:
+    """Check if a column header is the frequency column (case-insensitive, spaces/commas/dots ignored)"""
+    header_clean = header.lower().replace(' ', '').replace(',', '').replace('.', '')
+    return any(x in header_clean for x in ['частота', 'frequency', 'freq', 'hz', 'гц'])
+
+
+def sheet_dempf(sheet_name: str) -> float:
+    """DEMPF value of a percentage sheet ("4%" -> 4.0, "1,2%" -> 1.2)"""
+    return float(sheet_name.strip().rstrip('%').replace(',', '.'))
+
+
+def open_workbook(content: bytes):
+    """
+    Open workbook in streaming mode
+
+    read_only parses sheets lazily row by row instead of building Cell objects
+    for the whole book; the caller must close() it.
+    """
+    return openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True, keep_links=False)
+
+
+def sheet_row_count(sheet) -> int:
+    """
+    Number of rows with data
+
+    Taken from the sheet <dimension> when the writer declared it (no cells are read);
+    otherwise rows are streamed and the non-empty ones counted.
+    """
+    try:
+        dimension = sheet.calculate_dimension()
+    except ValueError:
+        dimension = None
+
+    # Some writers always declare "A1"; treat it as unknown
+    if dimension and dimension not in ("A1", "A1:A1") and sheet.min_row and sheet.max_row:
+        return sheet.max_row - sheet.min_row + 1
+
+    return sum(
+        1 for row in sheet.iter_rows(values_only=True)
+        if any(value is not None for value in row)
+    )
+
+
+def extract_sheet_columns(sheet) -> Dict[str, List[Any]]:
+    """
+    Read sheet as {header: [values]} in a single streaming pass
+
+    The header row is the first row with text within the first 5 rows; only columns
+    with a header are kept. Numbers are returned as float, other values as str.
+    Rows of sheets without a <dimension> end at their last cell, so missing
+    trailing cells are read as None and every column gets one value per row.
+    """
+    rows = sheet.iter_rows(values_only=True)
+
+    header_row = None
+    scanned = 0
+    for row in rows:
+        scanned += 1
+        if row and any(cell is not None and not isinstance(cell, (int, float)) for cell in row):
+            header_row = row
+            break
+        if scanned >= HEADER_SEARCH_ROWS:
+            break
+
+    if scanned == 0:
+        raise SheetFormatError("Sheet is empty")
+    if header_row is None:
+        raise SheetFormatError("No header row found in first 5 rows")
+
+    headers = [
+        (idx, str(cell).strip())
+        for idx, cell in enumerate(header_row)
+        if cell is not None and str(cell).strip()
+    ]
+    if not headers:
+        raise SheetFormatError("No valid column headers found in first row")
+
+    data = {header: [] for _, header in headers}
+    for row in rows:
+        for col_idx, header in headers:
+            cell = row[col_idx] if col_idx < len(row) else None
+            if cell is None:
+                data[header].append(None)
+            elif isinstance(cell, (int, float)):
+                data[header].append(float(cell))
+            else:
+                data[header].append(str(cell))
+    return data
+
+
+def parse_sheets(content: bytes, sheet_names: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse the given sheets of a workbook (all sheets by default)
+
+    Returns {sheet_name: {"rows", "data", "error"}}; sheets without a usable
+    header keep data None and the error message. Unknown names are skipped.
+    Top-level so it can run in a worker process.
+    """
+    workbook = open_workbook(content)
+    try:
+        sheets = {}
+        for sheet_name in workbook.sheetnames if sheet_names is None else sheet_names:
+            if sheet_name not in workbook.sheetnames:
+                continue
+            sheet = workbook[sheet_name]
+            try:
+                data, error = extract_sheet_columns(sheet), None
+            except SheetFormatError as e:
+                data, error = None, str(e)
+            sheets[sheet_name] = {"rows": sheet_row_count(sheet), "data": data, "error": error}
+        return sheets
+    finally:
+        workbook.close()
+
+
+def workbook_sheet_names(content: bytes) -> List[str]:
+    """Sheet names of a workbook in workbook order"""
+    workbook = open_workbook(content)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def sheet_groups(sheet_names: Sequence[str], workers: int, parallel_min_sheets: int = 2) -> List[List[str]]:
+    """
+    Split sheets round-robin into one group per worker
+
+    A single group is returned for one worker or books with fewer than
+    parallel_min_sheets sheets (process start-up would dominate).
+    """
+    sheet_names = list(sheet_names)
+    workers = min(workers, len(sheet_names))
+    if workers <= 1 or len(sheet_names) < parallel_min_sheets:
+        return [sheet_names]
+    return [sheet_names[i::workers] for i in range(workers)]
+
+
+def parse_workbook(
+    content: bytes,
+    sheet_names: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    parallel_min_sheets: int = 2
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a workbook once, optionally spreading the sheets over worker processes
+
+    With workers > 1 the sheets are split round-robin into one group per worker,
+    every worker opens its own read-only copy of the book and the results are
+    merged back in workbook order. Books with fewer than parallel_min_sheets sheets
+    (process start-up would dominate), a single worker and platforms where the pool
+    cannot start parse in-process; workers=0 uses the CPU count.
+    """
+    if sheet_names is None:
+        sheet_names = workbook_sheet_names(content)
+    sheet_names = list(sheet_names)
+
+    groups = sheet_groups(sheet_names, workers or os.cpu_count() or 1, parallel_min_sheets)
+    if len(groups) == 1:
+        return parse_sheets(content, sheet_names)
+
+    parsed = {}
+    try:
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            for group_result in executor.map(parse_sheets, [content] * len(groups), groups):
+                parsed.update(group_result)
+    except (BrokenProcessPool, OSError) as e:
+        print(f"Parallel sheet parsing unavailable, parsing in-process: {e}")
+        return parse_sheets(content, sheet_names)
+    return {name: parsed[name] for name in sheet_names if name in parsed}
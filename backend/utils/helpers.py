@@ -1,16 +1,76 @@
 """
 Helpers - вспомогательные функции для бизнес-логики
 """
-from typing import List, Tuple, Dict, Any
-from sqlalchemy import text
+import hashlib
+import threading
+import time
+from typing import List, Tuple, Dict, Any, Sequence
+import numpy as np
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
 
+from core.config import settings
+from .plot_cache import plot_cache
+
+# Byte layout of packed spectrum vectors (SRTN_ACCEL_PLOT_PACKED)
+PACKED_DTYPE = np.dtype("<f8")
+
+# Seconds before a missing SRTN_ACCEL_PLOT_PACKED is looked up again
+PACKED_TABLE_RECHECK_SECONDS = 300
+
+# {database URL: (table exists, checked at)}
+_packed_table_state: Dict[str, Tuple[bool, float]] = {}
+_packed_table_lock = threading.Lock()
+
+
+def packed_plots_available(db: Session) -> bool:
+    """
+    Whether SRTN_ACCEL_PLOT_PACKED can be read
+
+    Always true with accel_plot_storage="packed". In "points" mode the side table
+    is optional (created by migrations or scripts.migrate_packed_plots), so its
+    existence is checked once per database; a missing table is re-checked every
+    PACKED_TABLE_RECHECK_SECONDS.
+    """
+    if settings.accel_plot_storage == "packed":
+        return True
+
+    key = str(db.get_bind().url)
+    with _packed_table_lock:
+        state = _packed_table_state.get(key)
+    if state is not None and (state[0] or time.monotonic() - state[1] < PACKED_TABLE_RECHECK_SECONDS):
+        return state[0]
+
+    # Checked on the session's connection, so no second pool connection is taken
+    exists = inspect(db.connection()).has_table("SRTN_ACCEL_PLOT_PACKED")
+    with _packed_table_lock:
+        _packed_table_state[key] = (exists, time.monotonic())
+    return exists
+
 
 def get_plot_data(db: Session, plot_id: int) -> Tuple[List[float], List[float]]:
     """Extract frequency and acceleration data from a plot"""
     if not plot_id:
         return [], []
     
+    cached = plot_cache.get(plot_id)
+    if cached is not None:
+        return cached[0].tolist(), cached[1].tolist()
+    
+    if packed_plots_available(db):
+        packed_query = text(
+            """
+            SELECT FREQ_DATA, ACCEL_DATA
+            FROM SRTN_ACCEL_PLOT_PACKED
+            WHERE PLOT_ID = :plot_id
+            """
+        )
+        packed = db.execute(packed_query, {"plot_id": plot_id}).fetchone()
+        if packed is not None:
+            frequencies, accelerations = unpack_vector(packed[0]), unpack_vector(packed[1])
+            plot_cache.put(plot_id, frequencies, accelerations)
+            return frequencies.tolist(), accelerations.tolist()
+    
     point_query = text(
         """
         SELECT FREQ, ACCEL
@@ -30,6 +90,7 @@ def get_plot_data(db: Session, plot_id: int) -> Tuple[List[float], List[float]]:
         frequencies.append(freq)
         accelerations.append(accel)
     
+    plot_cache.put(plot_id, np.array(frequencies), np.array(accelerations))
     return frequencies, accelerations
 
 
@@ -58,3 +119,30 @@ def build_spectral_response(
     
     return response_data
 
+
+
+def pack_vector(values: Sequence[float]) -> bytes:
+    """Pack a vector of floats into little-endian float64 bytes"""
+    return np.asarray(values, dtype=PACKED_DTYPE).tobytes()
+
+
+def plot_content_hash(frequencies: Sequence[float], accelerations: Sequence[float]) -> str:
+    """
+    SHA-256 of a plot's points sorted by frequency (same layout as packed vectors)
+
+    Identical spectra get the same hash regardless of row order.
+    """
+    freq = np.asarray(frequencies, dtype=PACKED_DTYPE)
+    accel = np.asarray(accelerations, dtype=PACKED_DTYPE)
+    order = np.lexsort((accel, freq))
+    digest = hashlib.sha256()
+    digest.update(freq[order].tobytes())
+    digest.update(accel[order].tobytes())
+    return digest.hexdigest()
+
+
+def unpack_vector(data: bytes | None) -> np.ndarray:
+    """Unpack little-endian float64 bytes into a NumPy array"""
+    if not data:
+        return np.empty(0, dtype=np.float64)
+    return np.frombuffer(data, dtype=PACKED_DTYPE).astype(np.float64)
@@ -0,0 +1,122 @@
+"""
+Job registry - in-process registry of background jobs with progress polling
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class Job:
+    """Background job state; mutated by the worker thread, read by status endpoints"""
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = "pending"  # pending / running / completed / failed
+        self.message = ""
+        self.total = 0
+        self.processed = 0
+        self.counters: Dict[str, int] = {}
+        self.errors: Dict[Any, List[str]] = {}
+        self.result: Any = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def start(self, total: int = 0, message: str = ""):
+        with self._lock:
+            self.status = "running"
+            self.total = total
+            self.message = message
+            self.started_at = datetime.now()
+
+    def set_message(self, message: str):
+        with self._lock:
+            self.message = message
+
+    def advance(self, processed: int = 0, errors: Optional[Dict[Any, List[str]]] = None, **counters: int):
+        """Add processed items, per-item errors and counter increments"""
+        with self._lock:
+            self.processed += processed
+            for key, messages in (errors or {}).items():
+                self.errors.setdefault(key, []).extend(messages)
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self, message: str = "", result: Any = None):
+        with self._lock:
+            self.status = "completed"
+            self.message = message
+            self.result = result
+            self.finished_at = datetime.now()
+
+    def fail(self, message: str):
+        with self._lock:
+            self.status = "failed"
+            self.message = message
+            self.finished_at = datetime.now()
+
+    def to_dict(self, include_errors: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "job_id": self.id,
+                "kind": self.kind,
+                "params": self.params,
+                "status": self.status,
+                "message": self.message,
+                "total": self.total,
+                "processed": self.processed,
+                "progress": round(self.processed / self.total, 4) if self.total else (1.0 if self.finished else 0.0),
+                "counters": dict(self.counters),
+                "error_count": len(self.errors),
+                "created_at": self.created_at.isoformat(),
+                "started_at": self.started_at.isoformat() if self.started_at else None,
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            }
+            if self.result is not None:
+                data["result"] = self.result
+            if include_errors:
+                data["errors"] = {str(key): list(messages) for key, messages in self.errors.items()}
+            return data
+
+
+class JobRegistry:
+    """
+    Bounded registry of jobs
+
+    Keeps at most `max_jobs` jobs; the oldest finished jobs are dropped first.
+    """
+
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, j in self._jobs.items() if j.finished]
+            while len(self._jobs) > self.max_jobs and finished:
+                del self._jobs[finished.pop(0)]
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs.values() if kind is None or job.kind == kind]
+
+
+# Shared registry for the API worker process
+job_registry = JobRegistry()
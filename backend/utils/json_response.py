@@ -0,0 +1,28 @@
+"""
+JSON responses - быстрая сериализация ответов через orjson
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from .streaming import json_default
+
+# numpy arrays/scalars are serialized natively; int dict keys (EK_ID, PLOT_ID) become strings
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    The app default response class: routes without a response_model (plain dicts)
+    are rendered with orjson, while routes with a response_model keep FastAPI's
+    pydantic dump_json path. Hot routes return it directly to skip response_model
+    validation and jsonable_encoder - only for trusted service output that already
+    has the schema shape; such routes document the shape with responses={200: ...}
+    instead of response_model. NaN and Infinity are sent as null.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=json_default, option=ORJSON_OPTIONS)
@@ -0,0 +1,189 @@
+"""
+Parse pool - выделенный пул процессов для разбора книг Excel с ограничением очереди
+
+Uploaded workbooks are parsed in long-lived worker processes, so openpyxl never
+holds the GIL of the API process. At most `workers + max_queue` workbooks are
+admitted at a time; further uploads are rejected (ParsePoolBusy -> 429) instead of
+piling up behind the running ones.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence
+
+from core.config import settings
+from .excel import parse_sheets, sheet_groups, workbook_sheet_names
+
+ParsedWorkbook = Dict[str, Dict[str, Any]]
+
+
+class ParsePoolBusy(Exception):
+    """All parse workers are busy and the queue is full"""
+    pass
+
+
+class ParsePoolUnavailable(Exception):
+    """Worker processes could not be started or died while parsing"""
+    pass
+
+
+class ParsePool:
+    """
+    Bounded process pool for workbook parsing
+
+    Workbooks with at least parallel_min_sheets sheets are split into sheet groups
+    parsed by several workers at once; a workbook counts once against the limit.
+    A broken executor is replaced for new workbooks; its pending tasks fail with
+    BrokenProcessPool, which every waiting caller turns into ParsePoolUnavailable.
+    """
+
+    def __init__(self, workers: int, max_queue: int, parallel_min_sheets: int):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self.parallel_min_sheets = parallel_min_sheets
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failures = 0
+
+    @property
+    def max_active(self) -> int:
+        return self.workers + self.max_queue
+
+    async def parse(self, content: bytes, sheet_names: Optional[Sequence[str]] = None) -> ParsedWorkbook:
+        """Parse a workbook in the pool; raises ParsePoolBusy when saturated"""
+        self._admit()
+        executor = None
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            if sheet_names is None:
+                sheet_names = await loop.run_in_executor(executor, workbook_sheet_names, content)
+            sheet_names = list(sheet_names)
+
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, parse_sheets, content, group)
+                for group in sheet_groups(sheet_names, self.workers, self.parallel_min_sheets)
+            ))
+            return self._merge(sheet_names, results)
+        except (BrokenProcessPool, OSError) as e:
+            self._fail(e, executor)
+        except RuntimeError as e:
+            self._fail_if_shut_down(e, executor)
+        except asyncio.CancelledError as e:
+            # The request itself was cancelled (client went away): keep cancelling
+            if asyncio.current_task().cancelling():
+                raise
+            # Otherwise a pool task was cancelled by shutdown()
+            self._fail(e, executor)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def parse_blocking(self, content: bytes, sheet_names: Optional[Sequence[str]] = None) -> ParsedWorkbook:
+        """
+        Parse a workbook in the pool from a worker thread, waiting for a free worker
+
+        For background import jobs, which are bounded by their own executor and
+        should queue rather than be rejected.
+        """
+        executor = None
+        try:
+            executor = self._get_executor()
+            if sheet_names is None:
+                sheet_names = executor.submit(workbook_sheet_names, content).result()
+            sheet_names = list(sheet_names)
+
+            futures = [
+                executor.submit(parse_sheets, content, group)
+                for group in sheet_groups(sheet_names, self.workers, self.parallel_min_sheets)
+            ]
+            return self._merge(sheet_names, [future.result() for future in futures])
+        except (BrokenProcessPool, OSError, CancelledError) as e:
+            self._fail(e, executor)
+        except RuntimeError as e:
+            self._fail_if_shut_down(e, executor)
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool counters"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": max(0, self._active - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "failures": self.failures,
+            }
+
+    def shutdown(self):
+        """Stop the worker processes (pending tasks are cancelled)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _merge(self, sheet_names: Sequence[str], results) -> ParsedWorkbook:
+        parsed = {}
+        for group_result in results:
+            parsed.update(group_result)
+        with self._lock:
+            self.completed += 1
+        return {name: parsed[name] for name in sheet_names if name in parsed}
+
+    def _fail(self, error: BaseException, executor: Optional[ProcessPoolExecutor]):
+        with self._lock:
+            self.failures += 1
+        if isinstance(error, BrokenProcessPool):
+            self._discard(executor)
+        raise ParsePoolUnavailable(f"Workbook parser unavailable: {str(error) or 'parsing was cancelled'}") from error
+
+    def _fail_if_shut_down(self, error: RuntimeError, executor: Optional[ProcessPoolExecutor]):
+        """A submit to an executor stopped by shutdown() meanwhile is a pool failure; re-raise others"""
+        with self._lock:
+            shut_down = executor is not None and executor is not self._executor
+        if not shut_down:
+            raise error
+        self._fail(error, executor)
+
+    def _admit(self):
+        with self._lock:
+            if self._active >= self.max_active:
+                self.rejected += 1
+                raise ParsePoolBusy(
+                    f"Too many workbooks are being parsed ({self._active}), try again later"
+                )
+            self._active += 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _discard(self, executor: Optional[ProcessPoolExecutor]):
+        """
+        Replace a broken executor for new workbooks
+
+        Only the executor the caller used is dropped (another caller may already have
+        replaced it), and its futures are not cancelled: those of a broken pool fail
+        by themselves, and the ones of a healthy replacement must keep running.
+        """
+        with self._lock:
+            if executor is None or self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False)
+
+
+# Global instance for upload endpoints
+parse_pool = ParsePool(
+    workers=settings.excel_parse_workers,
+    max_queue=settings.excel_parse_queue,
+    parallel_min_sheets=settings.excel_parse_parallel_min_sheets
+)
@@ -0,0 +1,146 @@
+"""
+Plot cache - in-process LRU cache of acceleration plot vectors keyed by PLOT_ID
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+
+PlotArrays = Tuple[np.ndarray, np.ndarray]
+
+
+class PlotCache:
+    """
+    Bounded LRU cache of (FREQ, ACCEL) arrays
+
+    Limited both by entry count and by total array bytes. Cached arrays are
+    read-only so callers cannot corrupt shared entries. invalidate()/clear() only
+    reach the cache of the calling process, so entries also expire `ttl_seconds`
+    after they were loaded (0 = never): other API workers serve a cleared or
+    re-imported plot for at most that long.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl_seconds: float = 0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # PLOT_ID -> (FREQ, ACCEL, loaded_at)
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, np.ndarray, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Optional[List[int]]], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.max_entries > 0
+
+    def get(self, plot_id: int) -> Optional[PlotArrays]:
+        """Get cached arrays for a plot and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(plot_id)
+            if entry is not None and self._expired(entry[2]):
+                self._remove(plot_id)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(plot_id)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def get_many(self, plot_ids: Iterable[int]) -> Dict[int, PlotArrays]:
+        """Get cached arrays for several plots (missing plots are omitted)"""
+        return {
+            plot_id: entry
+            for plot_id in plot_ids
+            if (entry := self.get(plot_id)) is not None
+        }
+
+    def put(self, plot_id: int, frequencies: np.ndarray, accelerations: np.ndarray):
+        """Store arrays for a plot; empty plots are not cached (they may not be committed yet)"""
+        if not self.enabled or not plot_id or frequencies.size == 0:
+            return
+
+        freq = np.array(frequencies, dtype=np.float64)
+        accel = np.array(accelerations, dtype=np.float64)
+        freq.setflags(write=False)
+        accel.setflags(write=False)
+        size = freq.nbytes + accel.nbytes
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(plot_id)
+            self._entries[plot_id] = (freq, accel, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def subscribe(self, listener: Callable[[Optional[List[int]]], None]):
+        """Register a callback for invalidations: called with plot IDs, or None on clear"""
+        self._listeners.append(listener)
+
+    def invalidate(self, plot_ids: Iterable[Optional[int]]):
+        """Drop cached arrays for the given plots"""
+        plot_ids = [plot_id for plot_id in plot_ids if plot_id]
+        with self._lock:
+            for plot_id in plot_ids:
+                if self._remove(plot_id):
+                    self.invalidations += 1
+        for listener in self._listeners:
+            listener(plot_ids)
+
+    def clear(self):
+        """Drop all cached plots"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        for listener in self._listeners:
+            listener(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _expired(self, loaded_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.monotonic() - loaded_at >= self.ttl_seconds
+
+    def _remove(self, plot_id: int) -> bool:
+        entry = self._entries.pop(plot_id, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[0].nbytes + entry[1].nbytes
+        return True
+
+
+# Shared cache instance for the API worker process
+plot_cache = PlotCache(
+    max_bytes=settings.plot_cache_max_mb * 1024 * 1024,
+    max_entries=settings.plot_cache_max_entries,
+    ttl_seconds=settings.plot_cache_ttl_seconds,
+)
@@ -0,0 +1,75 @@
+"""
+Spectrum memo - LRU memo of derived spectra (e.g. damping-interpolated requirements)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from .plot_cache import plot_cache
+
+
+class SpectrumMemo:
+    """
+    Bounded LRU memo of computed spectra
+
+    Every entry remembers the PLOT_IDs it was built from and is dropped when
+    the plot cache invalidates any of them, or `ttl_seconds` after it was
+    computed (0 = never), like the plot cache entries it was built from.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (source PLOT_IDs, value, computed_at)
+        self._entries: "OrderedDict[Hashable, Tuple[frozenset, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry[2] >= self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, source_plot_ids: Iterable[Optional[int]]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (frozenset(p for p in source_plot_ids if p), value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def on_plots_invalidated(self, plot_ids: Optional[List[int]]):
+        """Plot cache listener: drop entries built from the given plots (all entries on None)"""
+        with self._lock:
+            if plot_ids is None:
+                self._entries.clear()
+                return
+            changed = set(plot_ids)
+            for key in [k for k, (sources, _, _) in self._entries.items() if sources & changed]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Damping-interpolated requirement spectra
+requirement_spectrum_memo = SpectrumMemo(settings.requirement_memo_max_entries, settings.plot_cache_ttl_seconds)
+plot_cache.subscribe(requirement_spectrum_memo.on_plots_invalidated)
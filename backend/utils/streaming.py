@@ -0,0 +1,69 @@
+"""
+Streaming - потоковая отдача больших выборок в формате NDJSON
+"""
+import datetime
+import decimal
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator
+
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core import DbSessionContext, DbSessionManager
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def json_default(value: Any) -> Any:
+    """JSON encoding of DB values json.dumps does not handle"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_lines(items: Iterable[Dict[str, Any]], batch_rows: int) -> Iterator[bytes]:
+    """Encode items as NDJSON, one chunk per batch_rows lines"""
+    batch = []
+    for item in items:
+        batch.append(json.dumps(item, ensure_ascii=False, default=json_default))
+        if len(batch) >= batch_rows:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+def ndjson_response(produce: Callable[[Session], Iterable[Dict[str, Any]]], batch_rows: int) -> StreamingResponse:
+    """
+    Stream rows produced from a DB session as NDJSON
+
+    The stream opens its own session, since request dependencies may be closed
+    before the body is sent; it waits for a session slot on the event loop like a
+    request does. `produce` should fetch with yield_per so neither the rows nor the
+    encoded body are held in memory at once. An error after the first chunk cannot
+    change the status code, so it is sent as a last {"error": ...} line.
+    """
+    def chunks() -> Iterator[bytes]:
+        with DbSessionContext(slot=False) as db:
+            try:
+                yield from ndjson_lines(produce(db), max(1, batch_rows))
+            except Exception as e:
+                print(f"Error streaming rows: {e}")
+                yield (json.dumps({"error": str(e)}, ensure_ascii=False) + "\n").encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        async with DbSessionManager.session_slot():
+            rows = chunks()
+            try:
+                async for chunk in iterate_in_threadpool(rows):
+                    yield chunk
+            finally:
+                # Client gone: close the session before the slot is released
+                await run_in_threadpool(rows.close)
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,116 @@
+"""
+Upload cache - разобранные книги Excel по хешу содержимого (parse once, reference by token)
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.config import settings
+
+# {sheet_name: {"rows": int, "data": {header: [values]} | None, "error": str | None}}
+ParsedWorkbook = Dict[str, Dict[str, Any]]
+
+
+def content_token(content: bytes) -> str:
+    """Upload token: SHA-256 of the file content"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def estimate_size(sheets: ParsedWorkbook) -> int:
+    """Rough in-memory size of parsed sheets in bytes (list slots, floats and strings)"""
+    size = 0
+    for sheet in sheets.values():
+        for values in (sheet.get("data") or {}).values():
+            size += 8 * len(values)
+            size += sum(24 if isinstance(v, float) else (49 + len(v) if isinstance(v, str) else 0) for v in values)
+    return size
+
+
+class UploadCache:
+    """
+    Bounded TTL + LRU cache of parsed workbooks keyed by content hash
+
+    Entries expire `ttl_seconds` after the last access; the least recently used
+    ones are evicted when the entry count or the estimated size is exceeded.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl_seconds: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[ParsedWorkbook]:
+        """Get parsed sheets for a token and refresh its TTL"""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["accessed_at"] = time.monotonic()
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry["sheets"]
+
+    def put(self, token: str, sheets: ParsedWorkbook):
+        """Store parsed sheets; workbooks larger than the whole cache are not stored"""
+        size = estimate_size(sheets)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = {"sheets": sheets, "size": size, "accessed_at": time.monotonic()}
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_parse(self, content: bytes, parse: Callable[[bytes], ParsedWorkbook]) -> Tuple[str, ParsedWorkbook]:
+        """Return (token, parsed sheets), parsing the content only on a cache miss"""
+        token = content_token(content)
+        sheets = self.get(token)
+        if sheets is None:
+            sheets = parse(content)
+            self.put(token, sheets)
+        return token, sheets
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._expire()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _expire(self):
+        deadline = time.monotonic() - self.ttl_seconds
+        for token in [t for t, e in self._entries.items() if e["accessed_at"] < deadline]:
+            self._remove(token)
+            self.evictions += 1
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+
+# Shared cache instance for the API worker process
+upload_cache = UploadCache(
+    max_bytes=settings.upload_cache_max_mb * 1024 * 1024,
+    max_entries=settings.upload_cache_max_entries,
+    ttl_seconds=settings.upload_cache_ttl_seconds,
+)
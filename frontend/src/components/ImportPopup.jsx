@@ -99,8 +99,13 @@ const ImportPopup = ({
       const firstSheet = analyzeData.sheets[0];
       
       // Step 2: Extract data from the first sheet
+      // The workbook is already parsed on the server - reference it by upload token
       const extractFormData = new FormData();
-      extractFormData.append('file', selectedFile);
+      if (analyzeData.upload_token) {
+        extractFormData.append('upload_token', analyzeData.upload_token);
+      } else {
+        extractFormData.append('file', selectedFile);
+      }
       extractFormData.append('sheet_name', firstSheet.name);
       
       const extractResponse = await fetch('/api/extract-sheet-data', {
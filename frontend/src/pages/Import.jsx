@@ -28,6 +28,7 @@ function Import() {
   const [roomStatus, setRoomStatus] = useState(null); // 'success', 'warning', or null
   const [roomMessage, setRoomMessage] = useState('');
   const [sheetInfo, setSheetInfo] = useState(null);
+  const [uploadToken, setUploadToken] = useState(null); // Server-side parsed workbook (from analyze-excel)
   const [analyzingFile, setAnalyzingFile] = useState(false);
   const [sheetsData, setSheetsData] = useState(null); // To store extracted sheet data
   const [extractingData, setExtractingData] = useState(false); // Flag for data extraction in progress
@@ -218,6 +219,7 @@ function Import() {
     if (selectedFile) {
       setFile(selectedFile);
       setSheetInfo(null);
+      setUploadToken(null);
       setSheetsData(null);
       setDataImported(false); // Reset imported state when file changes
       setImportStatus(null); // Clear any previous import status
@@ -242,17 +244,24 @@ function Import() {
         body: formData,
       });
       
+      // Workbook parser saturated (429) or unavailable (503)
+      if (response.status === 429 || response.status === 503) {
+        const retryAfter = response.headers.get('Retry-After') || '5';
+        throw new Error(`Сервер зайнятий обробкою інших файлів, спробуйте через ${retryAfter} с`);
+      }
+
       if (!response.ok) {
         throw new Error('Failed to analyze Excel file');
       }
-      
+
       const data = await response.json();
-      
+
       if (!data.sheets || !Array.isArray(data.sheets) || data.sheets.length === 0) {
         throw new Error('В Excel файлі не знайдено листів з іменами у форматі відсотків (наприклад: 4%, 0.2%, 1,2%)');
       }
       
       setSheetInfo(data.sheets);
+      setUploadToken(data.upload_token || null);
       setAnalyzingFile(false);
     } catch (err) {
       setError('Error analyzing Excel file: ' + err.message);
@@ -265,6 +274,7 @@ function Import() {
   const handleRemoveFile = () => {
     setFile(null);
     setSheetInfo(null);
+    setUploadToken(null);
     setSheetsData(null);
     setExpandedColumns({});
     setDataImported(false);
@@ -281,19 +291,66 @@ function Import() {
     fileInputRef.current.click();
   };
 
+  // Request sheet data by upload token (workbook parsed once on the server);
+  // re-upload the file if the token has expired (410)
+  const fetchSheetData = async (sheetName) => {
+    if (uploadToken) {
+      const tokenFormData = new FormData();
+      tokenFormData.append('upload_token', uploadToken);
+      tokenFormData.append('sheet_name', sheetName);
+      const response = await fetch('/api/extract-sheet-data', {
+        method: 'POST',
+        body: tokenFormData,
+      });
+      if (response.status !== 410) {
+        return response;
+      }
+    }
+
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('sheet_name', sheetName);
+    return fetch('/api/extract-sheet-data', {
+      method: 'POST',
+      body: formData,
+    });
+  };
+
+  // Request several sheets at once, with the same token / re-upload handling
+  const fetchSheetsData = async (sheetNames) => {
+    const buildFormData = (withFile) => {
+      const formData = new FormData();
+      sheetNames.forEach(sheetName => formData.append('sheet_names', sheetName));
+      if (withFile) {
+        formData.append('file', file);
+      } else {
+        formData.append('upload_token', uploadToken);
+      }
+      return formData;
+    };
+
+    if (uploadToken) {
+      const response = await fetch('/api/extract-sheets-data', {
+        method: 'POST',
+        body: buildFormData(false),
+      });
+      if (response.status !== 410) {
+        return response;
+      }
+    }
+
+    return fetch('/api/extract-sheets-data', {
+      method: 'POST',
+      body: buildFormData(true),
+    });
+  };
+
   // Function to extract data from a specific sheet
   const extractSheetData = async (sheetName) => {
     if (!file) return null;
     
     try {
-      const formData = new FormData();
-      formData.append('file', file);
-      formData.append('sheet_name', sheetName);
-      
-      const response = await fetch('/api/extract-sheet-data', {
-        method: 'POST',
-        body: formData,
-      });
+      const response = await fetchSheetData(sheetName);
       
       if (!response.ok) {
         throw new Error(`Failed to extract data from sheet ${sheetName}`);
@@ -510,6 +567,7 @@ function Import() {
         }
         
         setSheetInfo(data.sheets);
+        setUploadToken(data.upload_token || null);
         setAnalyzingFile(false);
       }
 
@@ -661,49 +719,47 @@ function Import() {
     }
 
     try {
-      // Transform the imported data into the format expected by the backend
-      const transformedData = {
-        plant_id: selectedPlant,
-        unit_id: selectedUnit,
-        building: building,
-        room: room || '',  // Send empty string instead of null for backend validation
-        lev1: level1,
-        lev2: level2,
-        pga: pga ? parseFloat(pga) : null,
-        calc_type: type,
-        set_type: 'ВИМОГИ',  // Import page always imports requirements, not characteristics
-        sheets: {}
+      // The workbook is parsed on the server: send location fields and sheet names only
+      const buildFormData = (withFile) => {
+        const formData = new FormData();
+        formData.append('plant_id', selectedPlant);
+        formData.append('unit_id', selectedUnit);
+        formData.append('building', building);
+        formData.append('room', room || '');
+        if (level1 !== null) formData.append('lev1', level1);
+        if (level2 !== null) formData.append('lev2', level2);
+        if (pga) formData.append('pga', parseFloat(pga));
+        formData.append('calc_type', type);
+        formData.append('set_type', 'ВИМОГИ');  // Import page always imports requirements, not characteristics
+        Object.keys(data).forEach(sheetName => formData.append('sheet_names', sheetName));
+        if (withFile) {
+          formData.append('file', file);
+        } else {
+          formData.append('upload_token', uploadToken);
+        }
+        return formData;
       };
 
-      // For each sheet (representing a DEMPF value)
-      Object.entries(data).forEach(([sheetName, sheetData]) => {
-        // Convert sheet name to DEMPF value (e.g., "5%" -> 5)
-        const dempf = parseFloat(sheetName.replace('%', '').replace(',', '.'));
-        
-        // Add sheet data to transformation
-        transformedData.sheets[sheetName] = {
-          dempf: dempf,
-          data: sheetData
-        };
-      });
-
-      // Log the data being sent for debugging
-      console.log('Sending data to save-accel-data:', JSON.stringify(transformedData, null, 2));
-
-      // Send data to backend
-      const response = await fetch('/api/save-accel-data', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify(transformedData),
-      });
+      // Send data to backend (re-upload the file if the upload token has expired)
+      let response = null;
+      if (uploadToken) {
+        response = await fetch('/api/import-accel-file', {
+          method: 'POST',
+          body: buildFormData(false),
+        });
+      }
+      if (!response || response.status === 410) {
+        response = await fetch('/api/import-accel-file', {
+          method: 'POST',
+          body: buildFormData(true),
+        });
+      }
 
       if (!response.ok) {
         let errorMessage = 'Failed to save data';
         try {
           const errorData = await response.json();
-          console.error('Detailed error from save-accel-data:', errorData);
+          console.error('Detailed error from import-accel-file:', errorData);
           errorMessage = errorData.detail || errorData.message || errorMessage;
           
           // If it's a validation error, try to extract more specific information
@@ -746,25 +802,22 @@ function Import() {
         throw new Error('No sheet information available for import');
       }
       
-      for (const sheet of sheetInfo) {
-        const formData = new FormData();
-        formData.append('file', file);
-        formData.append('sheet_name', sheet.name);
-        
-        const response = await fetch('/api/extract-sheet-data', {
-          method: 'POST',
-          body: formData,
-        });
-        
-        if (!response.ok) {
-          throw new Error(`Failed to extract data from sheet ${sheet.name}`);
-        }
-        
-        const sheetData = await response.json();
+      // All sheets in one request (parsed in parallel on the server)
+      const response = await fetchSheetsData(sheetInfo.map(sheet => sheet.name));
+      if (!response.ok) {
+        throw new Error('Failed to extract data from sheets');
+      }
+
+      const extracted = await response.json();
+      const failedSheets = Object.keys(extracted.errors || {});
+      if (failedSheets.length > 0) {
+        throw new Error(`Failed to extract data from sheet ${failedSheets.join(', ')}`);
+      }
+      Object.entries(extracted.sheets).forEach(([sheetName, sheetData]) => {
         if (sheetData) {
-          allData[sheet.name] = sheetData;
+          allData[sheetName] = sheetData;
         }
-      }
+      });
       
       setSheetsData(allData);
 